@@ -1,91 +1,39 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
 import sys
 import os
+import gzip
+import hashlib
+import json
 
 # Add parent directory to path to import original f1_data module
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'f1-race-replay'))
 
-from src.f1_data import get_race_telemetry, enable_cache, load_session
+from src.f1_data import FPS, get_race_telemetry, get_track_geometry, enable_cache, load_session
+from src.services.load_jobs import LoadJobQueue
+from src.services.playback import PlaybackScheduler
+from src.lib.frame_codec import encode_chunk, encode_frame
+from src.lib.memory import container_memory_limit_bytes, process_rss_bytes
+from src.lib.metrics import BYTE_BUCKETS, CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY as METRICS
+from src.lib.track_geometry import TrackGeometry
+from src.services.replay_registry import (
+    PROTOCOL_BINARY, PROTOCOL_DELTA, PROTOCOL_LOCAL, LoadedReplay, ReplayRegistry,
+)
 import fastf1
 import threading
 import time
 
+try:
+    import brotli  # optional, preferred over gzip for /api/frames when the browser accepts it
+except ImportError:
+    brotli = None
+
 # Railway configuration
 RAILWAY_ENVIRONMENT = os.getenv('RAILWAY_ENVIRONMENT')
 CACHE_DIR = os.getenv('CACHE_DIR', '/tmp/.fastf1-cache')
 PORT = int(os.getenv('PORT', 5021))
-
-# Event type constants for progress bar markers
-EVENT_DNF = "dnf"
-EVENT_YELLOW_FLAG = "yellow"
-EVENT_SAFETY_CAR = "sc"
-EVENT_RED_FLAG = "red"
-EVENT_VSC = "vsc"
-
-def extract_race_events(frames, track_statuses, total_laps):
-    """Extract race events for progress bar markers"""
-    events = []
-    if not frames:
-        return events
-    
-    n_frames = len(frames)
-    prev_drivers = set()
-    sample_rate = 25
-    
-    for i in range(0, n_frames, sample_rate):
-        frame = frames[i]
-        drivers_data = frame.get("drivers", {})
-        current_drivers = set(drivers_data.keys())
-        
-        if prev_drivers:
-            dnf_drivers = prev_drivers - current_drivers
-            for driver_code in dnf_drivers:
-                prev_frame = frames[max(0, i - sample_rate)]
-                driver_info = prev_frame.get("drivers", {}).get(driver_code, {})
-                lap = driver_info.get("lap", "?")
-                events.append({
-                    "type": EVENT_DNF,
-                    "frame": i,
-                    "label": driver_code,
-                    "lap": lap,
-                })
-        prev_drivers = current_drivers
-    
-    for status in track_statuses:
-        status_code = str(status.get("status", ""))
-        start_time = status.get("start_time", 0)
-        end_time = status.get("end_time")
-        
-        fps = 25
-        start_frame = int(start_time * fps)
-        end_frame = int(end_time * fps) if end_time else start_frame + 250
-        
-        if end_frame <= 0:
-            continue
-        if n_frames > 0:
-            end_frame = min(end_frame, n_frames)
-        
-        event_type = None
-        if status_code == "2":
-            event_type = EVENT_YELLOW_FLAG
-        elif status_code == "4":
-            event_type = EVENT_SAFETY_CAR
-        elif status_code == "5":
-            event_type = EVENT_RED_FLAG
-        elif status_code in ("6", "7"):
-            event_type = EVENT_VSC
-        
-        if event_type:
-            events.append({
-                "type": event_type,
-                "frame": start_frame,
-                "end_frame": end_frame,
-                "label": "",
-                "lap": None,
-            })
-    
-    return events
+# Concurrent race builds; each one already fans out over a process pool
+LOAD_JOB_WORKERS = int(os.getenv('LOAD_JOB_WORKERS', 1))
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'f1-race-replay-secret'
@@ -93,33 +41,84 @@ app.config['TEMPLATES_AUTO_RELOAD'] = True
 app.jinja_env.auto_reload = True
 socketio = SocketIO(app, cors_allowed_origins="*")
 
-# Global state for race replay
-current_replay = {
-    'session': None,
-    'telemetry': None,
-    'frame_index': 0,
-    'is_playing': False,
-    'speed': 1.0,
-    'total_frames': 0,
-    'last_access': time.time()
-}
+# Background race loading, the race selection pages poll /api/jobs/<id> for progress
+load_jobs = LoadJobQueue(max_workers=LOAD_JOB_WORKERS)
+
+# /api/frames chunk limits
+MAX_CHUNK_FRAMES = 2000
+MAX_CHUNK_STRIDE = 50
+
+# Frames pushed per second to streaming (non-local) clients; the viewer interpolates between them
+PLAYBACK_EMIT_HZ = float(os.getenv('PLAYBACK_EMIT_HZ', 5))
+
+# Delta clients may fall this many frames behind on acks before we stop sending them more
+DELTA_MAX_IN_FLIGHT = 8
 
 # Memory management settings
-MAX_FRAMES_IN_MEMORY = 50000  # Limit to ~50k frames (~500MB max)
-CACHE_TIMEOUT_SECONDS = 1800  # Clear cache after 30 min idle
-
-def clean_old_data():
-    """Clean up old replay data to free memory"""
-    global current_replay
-    if current_replay.get('frames'):
-        idle_time = time.time() - current_replay.get('last_access', time.time())
-        if idle_time > CACHE_TIMEOUT_SECONDS:
-            print(f"🧹 Cleaning up old data (idle {idle_time:.0f}s)")
-            current_replay['frames'] = None
-            current_replay['telemetry'] = None
-            current_replay['session'] = None
-            import gc
-            gc.collect()
+MAX_FRAMES_IN_MEMORY = 50000  # 50k frames x 20 drivers x 13 float32 fields ~= 52 MB per replay (see /api/status)
+CACHE_TIMEOUT_SECONDS = 1800  # Evict a replay nobody is watching after 30 min idle
+MAX_LOADED_REPLAYS = int(os.getenv('MAX_LOADED_REPLAYS', 3))
+REPLAY_MEMORY_BUDGET_MB = int(os.getenv('REPLAY_MEMORY_BUDGET_MB', 768))
+# Whole-process RSS above which cached replays are shed; defaults to 80% of the container limit if there is one
+PROCESS_MEMORY_BUDGET_MB = os.getenv('PROCESS_MEMORY_BUDGET_MB')
+MEMORY_CHECK_SECONDS = 30
+
+def process_budget_bytes():
+    if process_rss_bytes() is None:
+        print("⚠️ Process RSS is not measurable here (no /proc/self/statm), process memory budget disabled")
+        return None
+    if PROCESS_MEMORY_BUDGET_MB:
+        return int(PROCESS_MEMORY_BUDGET_MB) * 1024 * 1024
+    limit = container_memory_limit_bytes()
+    return int(limit * 0.8) if limit else None
+
+# Loaded races are shared read-only between viewers; each client gets its own playback cursor
+replays = ReplayRegistry(
+    max_replays=MAX_LOADED_REPLAYS,
+    memory_budget_bytes=REPLAY_MEMORY_BUDGET_MB * 1024 * 1024,
+    idle_timeout=CACHE_TIMEOUT_SECONDS,
+    process_budget_bytes=process_budget_bytes(),
+)
+
+# Metrics for /metrics (load stage timings and the driver pool are recorded by load_jobs / f1_data)
+FRAMES_EMITTED = METRICS.counter('f1_frames_emitted_total', 'Frames pushed to streaming clients', ['protocol'])
+FRAME_EMIT_SECONDS = METRICS.histogram('f1_frame_emit_seconds', 'Time to encode and emit one frame', ['protocol'])
+FRAME_BYTES = METRICS.histogram('f1_frame_bytes', 'Payload size of one pushed frame', ['protocol'], buckets=BYTE_BUCKETS)
+CHUNK_REQUESTS = METRICS.counter('f1_frame_chunk_requests_total', '/api/frames requests served', ['status'])
+CHUNK_BYTES = METRICS.counter('f1_frame_chunk_bytes_total', 'Bytes of /api/frames chunks sent', ['encoding'])
+TELEMETRY_CACHE_LOOKUPS = METRICS.counter('f1_telemetry_cache_lookups_total', 'Race telemetry cache hits and misses',
+                                          ['result'])
+TELEMETRY_BUILD_SECONDS = METRICS.histogram('f1_telemetry_build_seconds', 'Time to get race telemetry', ['cache'])
+METRICS.gauge('f1_connected_clients', 'Connected viewers').set_function(lambda: len(replays.cursors()))
+METRICS.gauge('f1_playing_clients', 'Viewers currently playing').set_function(
+    lambda: sum(1 for c in replays.cursors() if c.is_playing))
+METRICS.gauge('f1_loaded_replays', 'Replays held in memory').set_function(lambda: len(replays.stats()['replays']))
+METRICS.gauge('f1_replay_bytes', 'Telemetry bytes held per loaded replay', ['replay']).set_function(
+    lambda: {'{year}/{round}/{session_type}'.format(**r): r['bytes'] for r in replays.stats()['replays']})
+METRICS.gauge('f1_replay_memory_budget_bytes', 'Budget for loaded replay telemetry').set_function(
+    lambda: replays.memory_budget_bytes or 0)
+# No sample at all where RSS can't be measured
+METRICS.gauge('f1_process_resident_bytes', 'Resident set size of the server process').set_function(
+    lambda: process_rss_bytes() or {})
+
+def viewer_url(replay):
+    """Viewer link that joins this replay"""
+    return '/viewer?year={year}&round={round}&session_type={session_type}'.format(**replay.key_dict())
+
+def frames_url(replay):
+    """Base /api/frames URL for this replay (start/count/stride are appended by the viewer)"""
+    return '/api/frames?year={year}&round={round}&session_type={session_type}'.format(**replay.key_dict())
+
+def track_url(replay):
+    """Content-addressed track layout URL, None if the replay has no layout"""
+    return f'/api/track/{replay.track_etag}' if replay.track_etag else None
+
+def replay_key_from(args):
+    """(year, round, session_type) from request/event args, or None if incomplete"""
+    try:
+        return (int(args.get('year')), int(args.get('round')), str(args.get('session_type') or 'R'))
+    except (TypeError, ValueError):
+        return None
 
 @app.route('/')
 def index():
@@ -128,22 +127,35 @@ def index():
 
 @app.route('/api/status')
 def get_status():
-    """Get current replay status for debugging"""
-    return jsonify({
-        'has_session': current_replay.get('session') is not None,
-        'has_frames': current_replay.get('frames') is not None,
-        'total_frames': current_replay.get('total_frames', 0),
-        'current_frame': current_replay.get('frame_index', 0),
-        'is_playing': current_replay.get('is_playing', False),
-        'frame_count': len(current_replay.get('frames', []))
-    })
+    """Get loaded replays and client cursors for debugging"""
+    status = replays.stats()
+    status['cursors'] = [
+        {
+            'sid': cursor.sid,
+            'key': list(cursor.key),
+            'frame_index': cursor.frame_index,
+            'is_playing': cursor.is_playing,
+            'speed': cursor.speed,
+            'emit_latency_ms': round(cursor.emit_latency_ms, 2),
+            'achieved_fps': round(cursor.achieved_fps, 2),
+            'frames_skipped': cursor.frames_skipped,
+        }
+        for cursor in replays.cursors()
+    ]
+    return jsonify(status)
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(METRICS.render(), content_type=METRICS_CONTENT_TYPE)
 
 @app.route('/api/test_emit')
 def test_emit():
-    """Test emitting a single frame"""
+    """Test emitting the current frame to every connected viewer"""
     try:
         print("🧪 TEST: Manually emitting current frame")
-        emit_current_frame()
+        for cursor in replays.cursors():
+            emit_current_frame(cursor)
         return jsonify({'success': True, 'message': 'Frame emitted'})
     except Exception as e:
         print(f"❌ TEST FAILED: {e}")
@@ -254,73 +266,44 @@ def load_qualifying_lap():
             }
             frames.append(frame)
         
-        # Track data
-        track_data = {
-            'x': driver_telemetry['x'],
-            'y': driver_telemetry['y'],
-            'drs': driver_telemetry['drs']
-        }
-        
         quali_data = {
             'frames': frames,
             'driver_colors': get_driver_colors(session),
             'track_statuses': [],
             'total_laps': 1,
-            'track_data': track_data
         }
         
-        # Store in global state (same format as race)
-        current_replay['session'] = session
-        current_replay['telemetry'] = quali_data
-        current_replay['frames'] = quali_data.get('frames', [])
-        current_replay['frame_index'] = 0
-        current_replay['total_frames'] = len(quali_data.get('frames', []))
-        current_replay['is_playing'] = False
-        current_replay['race_events'] = []
-        
-        # Track data from the lap
-        track_data = quali_data.get('track_data')
-        if track_data:
-            import numpy as np
-            x_center = np.array(track_data['x'])
-            y_center = np.array(track_data['y'])
-            
-            dx = np.gradient(x_center)
-            dy = np.gradient(y_center)
-            norm = np.sqrt(dx**2 + dy**2)
-            norm[norm == 0] = 1.0
-            dx /= norm
-            dy /= norm
-            
-            nx = -dy
-            ny = dx
-            
-            track_width = 200
-            x_outer = x_center + nx * (track_width / 2)
-            y_outer = y_center + ny * (track_width / 2)
-            x_inner = x_center - nx * (track_width / 2)
-            y_inner = y_center - ny * (track_width / 2)
-            
-            track_data['x_inner'] = x_inner.tolist()
-            track_data['y_inner'] = y_inner.tolist()
-            track_data['x_outer'] = x_outer.tolist()
-            track_data['y_outer'] = y_outer.tolist()
-        
-        current_replay['track_data'] = track_data
-        current_replay['event_name'] = f"{session.event['EventName']} - {driver_code} {segment}"
-        current_replay['circuit_name'] = str(session.event.get('Location', ''))
-        current_replay['country'] = str(session.event.get('Country', ''))
-        current_replay['year'] = year
-        current_replay['round'] = round_number
-        current_replay['total_laps'] = 1
+        # Same cached circuit layout as races; the driver's own lap if there is none
+        geometry = get_track_geometry(year, round_number, session)
+        if geometry is None:
+            geometry = TrackGeometry.from_lap_telemetry({
+                'X': driver_telemetry['x'],
+                'Y': driver_telemetry['y'],
+                'DRS': driver_telemetry['drs'],
+            })
         
-        print(f"✅ Qualifying lap loaded: {current_replay['total_frames']} frames")
+        # Register as its own replay (same format as race)
+        replay = LoadedReplay(
+            (year, round_number, f"Q_{driver_code}_{segment}"),
+            frames,
+            quali_data['driver_colors'],
+            FPS,
+            track_geometry=geometry,
+            event_name=f"{session.event['EventName']} - {driver_code} {segment}",
+            circuit_name=str(session.event.get('Location', '')),
+            country=str(session.event.get('Country', '')),
+            total_laps=1,
+        )
+        replays.put(replay)
+        
+        print(f"✅ Qualifying lap loaded: {replay.total_frames} frames")
         
         return jsonify({
             'success': True,
-            'total_frames': current_replay['total_frames'],
+            'total_frames': replay.total_frames,
             'driver': driver_code,
-            'segment': segment
+            'segment': segment,
+            'replay': replay.key_dict()
         })
         
     except Exception as e:
@@ -331,289 +314,371 @@ def load_qualifying_lap():
 
 @app.route('/api/load_race', methods=['POST'])
 def load_race():
-    """Load race data"""
+    """Queue a race load and return its job id straight away.
+
+    The build runs in the background (see src/services/load_jobs.py); clients
+    follow it via GET /api/jobs/<job_id>.
+    A request for a race that is already loading gets the existing job.
+    """
     try:
         data = request.json
         year = int(data.get('year'))
         round_number = int(data.get('round'))
         session_type = data.get('session_type', 'R')
+    except (TypeError, ValueError, AttributeError) as e:
+        return jsonify({'error': f'Invalid race selection: {e}'}), 400
+    
+    job, created = load_jobs.submit(
+        (year, round_number, session_type),
+        lambda report: build_race(year, round_number, session_type, report),
+    )
+    if created:
+        print(f"🧵 Queued load job {job.id} for {year} Round {round_number} Session '{session_type}'")
+    else:
+        print(f"🔗 Attached to in-flight load job {job.id} for {year} Round {round_number} Session '{session_type}'")
+    
+    return jsonify(job.to_dict()), 202
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Poll a race load job"""
+    job = load_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/frames')
+def get_frames():
+    """Compressed, cacheable chunk of binary frames for client-side playback"""
+    key = replay_key_from(request.args)
+    replay = replays.get(key) if key else None
+    if replay is None:
+        return jsonify({'error': 'Race is not loaded'}), 404
+    
+    try:
+        start = max(0, int(request.args.get('start', 0)))
+        count = max(1, min(MAX_CHUNK_FRAMES, int(request.args.get('count', 250))))
+        stride = max(1, min(MAX_CHUNK_STRIDE, int(request.args.get('stride', 1))))
+    except ValueError:
+        return jsonify({'error': 'start, count and stride must be integers'}), 400
+    
+    # A loaded replay never changes, so a chunk is identified by the load and the range
+    etag = hashlib.sha1(f"{key}:{replay.loaded_at}:{start}:{count}:{stride}".encode()).hexdigest()
+    if request.if_none_match.contains(etag):
+        CHUNK_REQUESTS.inc(status='304')
+        return Response(status=304, headers={'ETag': f'"{etag}"'})
+    
+    body = encode_chunk(replay.frames, start, count, stride, replay.driver_codes, replay.total_frames,
+                        replay.frame_statuses)
+    
+    accepted = request.headers.get('Accept-Encoding', '')
+    headers = {
+        'Cache-Control': 'public, max-age=86400',
+        'ETag': f'"{etag}"',
+        'Vary': 'Accept-Encoding',
+    }
+    if brotli is not None and 'br' in accepted:
+        body = brotli.compress(body, quality=5)
+        headers['Content-Encoding'] = 'br'
+    elif 'gzip' in accepted:
+        body = gzip.compress(body, compresslevel=6)
+        headers['Content-Encoding'] = 'gzip'
+    
+    CHUNK_REQUESTS.inc(status='200')
+    CHUNK_BYTES.inc(len(body), encoding=headers.get('Content-Encoding', 'identity'))
+    return Response(body, mimetype='application/octet-stream', headers=headers)
+
+@app.route('/api/track/<etag>')
+def get_track(etag):
+    """Compact track layout (src/lib/track_codec.py); the URL names the content, so browsers cache it for good"""
+    headers = {'Cache-Control': 'public, max-age=31536000, immutable', 'ETag': f'"{etag}"'}
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+    body = replays.track(etag)
+    if body is None:
+        return jsonify({'error': 'Unknown track layout'}), 404
+    return Response(body, mimetype='application/octet-stream', headers=headers)
+
+def build_race(year, round_number, session_type, report):
+    """Load a session and publish it as the current replay (runs in a load job worker).
+
+    Returns the payload the selection page needs once the job is done.
+    """
+    print(f"Loading F1 {year} Round {round_number} Session '{session_type}'")
+    
+    # Enable FastF1 cache
+    enable_cache()
+    
+    # Loading a session is the memory peak; make room before starting rather than after
+    replays.enforce_process_budget()
+    
+    # Load session
+    report('session_load')
+    session = load_session(year, round_number, session_type)
+    
+    # Qualifying uses special results view
+    if session_type == 'Q':
+        print("📊 Qualifying mode - loading results")
+        from src.f1_data import get_qualifying_results
         
-        print(f"Loading F1 {year} Round {round_number} Session '{session_type}'")
-        
-        # Enable FastF1 cache
-        enable_cache()
-        
-        # Load session
-        session = load_session(year, round_number, session_type)
-        
-        # Qualifying uses special results view
-        if session_type == 'Q':
-            print("📊 Qualifying mode - loading results")
-            from src.f1_data import get_qualifying_results, get_driver_colors
-            
-            quali_results = get_qualifying_results(session)
-            
-            return jsonify({
-                'redirect': '/qualifying',
-                'results': quali_results,
-                'event_name': str(session.event['EventName'])
-            })
-        
-        # Get telemetry data (this is the slow part!)
-        print("⏳ Getting telemetry... this may take 30-60 seconds")
-        import time
-        start_time = time.time()
-        
-        # Use race telemetry for all session types (simplified)
-        # Qualifying will show all laps as continuous replay
-        telemetry = get_race_telemetry(session, session_type=session_type)
-        
-        elapsed = time.time() - start_time
-        print(f"✅ Telemetry loaded in {elapsed:.1f} seconds")
-        
-        # Extract frames and calculate total
-        frames = telemetry.get('frames', [])
-        total_frames = len(frames)
-        track_statuses = telemetry.get('track_statuses', [])
-        
-        print(f"📊 Total frames loaded: {total_frames:,}")
-        
-        # Memory optimization: downsample if too many frames
-        if total_frames > MAX_FRAMES_IN_MEMORY:
-            downsample_rate = int(total_frames / MAX_FRAMES_IN_MEMORY) + 1
-            print(f"⚠️ Too many frames ({total_frames:,}), downsampling by {downsample_rate}x")
-            frames = frames[::downsample_rate]
-            print(f"✂️ Reduced to {len(frames):,} frames (saves ~{(1-len(frames)/total_frames)*100:.0f}% memory)")
-            # Keep original total for progress bar
-            original_total = total_frames
-        else:
-            original_total = total_frames
-        
-        # Extract race events for progress bar
-        race_events = extract_race_events(frames, track_statuses, telemetry.get('total_laps', 0))
-        print(f"📋 Race events extracted: {len(race_events)}")
-        
-        # Store in global state
-        current_replay['session'] = session
-        current_replay['telemetry'] = telemetry
-        current_replay['frames'] = frames
-        current_replay['frame_index'] = 0
-        current_replay['total_frames'] = len(frames)  # Use downsampled count
-        current_replay['original_total'] = original_total  # Keep for display
-        current_replay['is_playing'] = False
-        current_replay['race_events'] = race_events
-        current_replay['last_access'] = time.time()  # Track access time
-        
-        # Get total laps if available
-        total_laps = telemetry.get('total_laps', 0)
-        
-        # Get track data for drawing (with inner/outer boundaries)
-        track_data = None
-        try:
-            print("📍 Loading track layout from qualifying session...")
-            quali_session = load_session(year, round_number, 'Q')
-            print(f"   Qualifying session loaded, laps: {len(quali_session.laps) if quali_session else 0}")
-            
-            if quali_session and len(quali_session.laps) > 0:
-                fastest_lap = quali_session.laps.pick_fastest()
-                print(f"   Fastest lap found: {fastest_lap is not None}")
-                
-                if fastest_lap is not None:
-                    lap_telemetry = fastest_lap.get_telemetry()
-                    print(f"   Telemetry columns: {list(lap_telemetry.columns)}")
-                    
-                    # Extract track center line
-                    x_center = lap_telemetry['X'].to_numpy()
-                    y_center = lap_telemetry['Y'].to_numpy()
-                    
-                    # Calculate track boundaries (200m width)
-                    import numpy as np
-                    dx = np.gradient(x_center)
-                    dy = np.gradient(y_center)
-                    norm = np.sqrt(dx**2 + dy**2)
-                    norm[norm == 0] = 1.0
-                    dx /= norm
-                    dy /= norm
-                    
-                    # Normal vectors (perpendicular)
-                    nx = -dy
-                    ny = dx
-                    
-                    track_width = 200  # meters
-                    x_outer = x_center + nx * (track_width / 2)
-                    y_outer = y_center + ny * (track_width / 2)
-                    x_inner = x_center - nx * (track_width / 2)
-                    y_inner = y_center - ny * (track_width / 2)
-                    
-                    track_data = {
-                        'x': x_center.tolist(),
-                        'y': y_center.tolist(),
-                        'x_inner': x_inner.tolist(),
-                        'y_inner': y_inner.tolist(),
-                        'x_outer': x_outer.tolist(),
-                        'y_outer': y_outer.tolist(),
-                        'drs': lap_telemetry['DRS'].tolist() if 'DRS' in lap_telemetry else []
-                    }
-                    print(f"✅ Loaded track layout: {len(track_data['x'])} points with boundaries")
-                else:
-                    print("⚠️ No fastest lap found")
-            else:
-                print("⚠️ No laps in qualifying session")
-        except Exception as e:
-            print(f"❌ Could not load track layout: {e}")
-            import traceback
-            traceback.print_exc()
-        
-        # Store track data and event info for later emission
-        current_replay['track_data'] = track_data
-        current_replay['event_name'] = str(session.event['EventName'])
-        current_replay['circuit_name'] = str(session.event.get('Location', session.event.get('Country', '')))
-        current_replay['country'] = str(session.event.get('Country', ''))
-        current_replay['year'] = int(year)
-        current_replay['round'] = int(round_number)
-        current_replay['total_laps'] = int(total_laps) if total_laps else 0
-        
-        print(f"✅ Race loaded and ready. Will emit to client on WebSocket connect.")
-        
-        # Get driver info from first frame
-        drivers_info = []
-        if frames and len(frames) > 0 and 'drivers' in frames[0]:
-            first_frame_drivers = frames[0]['drivers']
-            driver_colors = telemetry.get('driver_colors', {})
-            
-            for driver_code in first_frame_drivers.keys():
-                color = driver_colors.get(driver_code, (128, 128, 128))
-                # Convert RGB tuple to hex
-                hex_color = '#{:02x}{:02x}{:02x}'.format(*color)
-                drivers_info.append({
-                    'code': driver_code,
-                    'color': hex_color
-                })
-        
-        # Return race info
-        return jsonify({
-            'success': True,
-            'event_name': str(session.event['EventName']),
-            'round_number': int(session.event['RoundNumber']),
-            'total_frames': int(total_frames),
-            'drivers': drivers_info
-        })
+        quali_results = get_qualifying_results(session)
         
+        return {
+            'redirect': '/qualifying',
+            'results': quali_results,
+            'event_name': str(session.event['EventName'])
+        }
+    
+    # Get telemetry data (this is the slow part!)
+    print("⏳ Getting telemetry... this may take 30-60 seconds")
+    start_time = time.time()
+    
+    # Use race telemetry for all session types (simplified)
+    # Qualifying will show all laps as continuous replay
+    # Long sessions are sampled at a lower rate so they fit in MAX_FRAMES_IN_MEMORY.
+    # The builder only reports progress when it computes, so no stages means a cache hit.
+    build_stages = set()
+    def build_report(stage, done=0, total=1):
+        build_stages.add(stage)
+        report(stage, done, total)
+    telemetry = get_race_telemetry(session, session_type=session_type, progress=build_report,
+                                   max_frames=MAX_FRAMES_IN_MEMORY)
+    
+    elapsed = time.time() - start_time
+    cache_result = 'miss' if build_stages else 'hit'
+    TELEMETRY_CACHE_LOOKUPS.inc(result=cache_result)
+    TELEMETRY_BUILD_SECONDS.observe(elapsed, cache=cache_result)
+    print(f"✅ Telemetry loaded in {elapsed:.1f} seconds")
+    
+    # Extract frames and calculate total
+    frames = telemetry.get('frames', [])
+    total_frames = len(frames)
+    replay_fps = telemetry.get('fps', FPS)
+    
+    print(f"📊 Total frames loaded: {total_frames:,} at {replay_fps:.2f} FPS")
+    
+    # Progress bar events are extracted by the telemetry builder and cached with it
+    race_events = telemetry.get('race_events', [])
+    print(f"📋 Race events: {len(race_events)}")
+    
+    # Get total laps if available
+    total_laps = telemetry.get('total_laps', 0)
+    
+    # Get track data for drawing (with inner/outer boundaries)
+    geometry = None
+    report('track_layout')
+    try:
+        geometry = get_track_geometry(year, round_number, session)
     except Exception as e:
-        print(f"Error loading race: {e}")
-        return jsonify({'error': str(e)}), 500
+        print(f"❌ Could not load track layout: {e}")
+        import traceback
+        traceback.print_exc()
+    
+    # Register the replay; the FastF1 session itself is not kept, only what the viewer needs
+    replay = LoadedReplay(
+        (int(year), int(round_number), session_type),
+        frames,
+        telemetry.get('driver_colors', {}),
+        replay_fps,
+        race_events=race_events,
+        track_geometry=geometry,
+        event_name=str(session.event['EventName']),
+        circuit_name=str(session.event.get('Location', session.event.get('Country', ''))),
+        country=str(session.event.get('Country', '')),
+        total_laps=total_laps,
+        track_statuses=telemetry.get('track_statuses', []),
+    )
+    replays.put(replay)
+    
+    print(f"✅ Race loaded and ready. Will emit to client on WebSocket connect.")
+    
+    # Get driver info from first frame
+    drivers_info = []
+    if frames and len(frames) > 0 and 'drivers' in frames[0]:
+        first_frame_drivers = frames[0]['drivers']
+        driver_colors = telemetry.get('driver_colors', {})
+        
+        for driver_code in first_frame_drivers.keys():
+            color = driver_colors.get(driver_code, (128, 128, 128))
+            # Convert RGB tuple to hex
+            hex_color = '#{:02x}{:02x}{:02x}'.format(*color)
+            drivers_info.append({
+                'code': driver_code,
+                'color': hex_color
+            })
+    
+    # Return race info
+    return {
+        'success': True,
+        'event_name': str(session.event['EventName']),
+        'round_number': int(session.event['RoundNumber']),
+        'total_frames': int(total_frames),
+        'drivers': drivers_info,
+        'replay': replay.key_dict(),
+        'viewer_url': viewer_url(replay)
+    }
+
+def send_initial_load(replay):
+    """Send the static race data to the calling client"""
+    print(f"📤 Sending initial_load_complete: {replay.total_frames} frames, event: {replay.event_name}")
+    emit('initial_load_complete', {**replay.initial_payload(), 'frames_url': frames_url(replay),
+                                   'track_url': track_url(replay)})
+    print("✅ initial_load_complete emitted")
+
+def client_replay():
+    """Cursor and replay for the calling client, (None, None) if it hasn't joined one"""
+    cursor = replays.cursor(request.sid)
+    if cursor is None:
+        return None, None
+    replay = replays.get(cursor.key)
+    if replay is None:
+        # Evicted while this client was attached
+        replays.detach(request.sid)
+        return None, None
+    return cursor, replay
 
 @socketio.on('connect')
 def handle_connect():
-    """Handle client connection"""
+    """Handle client connection, joining the race named in the query string (or the latest one)"""
     print('🔌 Client connected via WebSocket')
-    clean_old_data()  # Clean up old data on new connection
-    current_replay['last_access'] = time.time()
+    replays.evict_idle()  # Clean up old data on new connection
     emit('status', {'message': 'Connected to F1 Race Replay server'})
     
+    key = replay_key_from(request.args)
+    replay = replays.get(key) if key else replays.latest()
+    
     # Send initial data if race is loaded
-    if current_replay.get('frames'):
-        print(f"📤 Sending initial_load_complete: {current_replay['total_frames']} frames, event: {current_replay.get('event_name')}")
-        emit('initial_load_complete', {
-            'total_frames': current_replay['total_frames'],
-            'event_name': current_replay.get('event_name', ''),
-            'circuit_name': current_replay.get('circuit_name', ''),
-            'country': current_replay.get('country', ''),
-            'year': current_replay.get('year', 0),
-            'round': current_replay.get('round', 0),
-            'total_laps': current_replay.get('total_laps', 0),
-            'track_data': current_replay.get('track_data'),
-            'race_events': current_replay.get('race_events', [])
-        })
-        print("✅ initial_load_complete emitted")
+    if replay is not None:
+        replays.attach(request.sid, replay.key, protocol=request.args.get('protocol'))
+        send_initial_load(replay)
     else:
         print("⚠️ No race data loaded yet")
 
+@socketio.on('join_replay')
+def handle_join_replay(data):
+    """Switch this client to another loaded replay (e.g. a qualifying lap loaded after connecting)"""
+    key = replay_key_from(data or {})
+    cursor = replays.attach(request.sid, key, protocol=(data or {}).get('protocol')) if key else None
+    if cursor is None:
+        emit('error', {'message': 'Race is not loaded, please load it again'})
+        return
+    send_initial_load(replays.get(key))
+
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
+    replays.detach(request.sid)
     print('Client disconnected')
 
 @socketio.on('play')
 def handle_play():
-    """Start race replay"""
+    """Start race replay for this client"""
+    cursor, replay = client_replay()
     print("=" * 50)
     print("▶️ PLAY REQUESTED")
-    print(f"   Frames loaded: {len(current_replay.get('frames', []))}")
-    print(f"   Total frames: {current_replay.get('total_frames', 0)}")
-    print(f"   Current index: {current_replay.get('frame_index', 0)}")
-    print(f"   Already playing: {current_replay.get('is_playing', False)}")
     
-    if not current_replay.get('frames'):
+    if replay is None:
         print("❌ ERROR: No frames loaded!")
-        socketio.emit('error', {'message': 'No race data loaded'})
+        emit('error', {'message': 'No race data loaded'})
         return
     
-    if current_replay.get('is_playing'):
+    print(f"   Replay: {replay.key}, total frames: {replay.total_frames}")
+    print(f"   Current index: {cursor.frame_index}")
+    print(f"   Already playing: {cursor.is_playing}")
+    
+    if cursor.is_playing:
         print("⚠️ Already playing, ignoring")
         return
     
-    current_replay['is_playing'] = True
-    print("🚀 Starting replay thread...")
-    
-    try:
-        thread = threading.Thread(target=replay_loop, daemon=True)
-        thread.start()
-        print("✅ Replay thread started successfully")
-        print("=" * 50)
-    except Exception as e:
-        print(f"❌ Failed to start thread: {e}")
-        import traceback
-        traceback.print_exc()
+    cursor.play(time.monotonic())
+    playback.ensure_running()
+    print("=" * 50)
 
 @socketio.on('pause')
 def handle_pause():
     """Pause race replay"""
-    current_replay['is_playing'] = False
+    cursor, replay = client_replay()
+    if replay is not None:
+        cursor.pause(time.monotonic(), replay.fps)
 
 @socketio.on('seek')
 def handle_seek(data):
     """Seek to specific frame"""
-    frame = data.get('frame', 0)
-    current_replay['frame_index'] = min(frame, current_replay['total_frames'] - 1)
-    emit_current_frame()
+    cursor, replay = client_replay()
+    if replay is None:
+        return
+    frame = int(data.get('frame', 0))
+    cursor.seek(max(0, min(frame, replay.total_frames - 1)), time.monotonic())
+    emit_current_frame(cursor, replay)
+    cursor.last_emitted = cursor.frame_index
 
 @socketio.on('set_speed')
 def handle_set_speed(data):
     """Set playback speed"""
-    speed = data.get('speed', 1.0)
-    current_replay['speed'] = max(0.25, min(4.0, speed))
+    cursor, replay = client_replay()
+    if replay is not None:
+        speed = float(data.get('speed', 1.0))
+        cursor.set_speed(max(0.25, min(4.0, speed)), time.monotonic(), replay.fps)
+
+def emit_current_frame(cursor, replay=None):
+    """Emit the cursor's current frame to the client that owns it"""
+    started = time.perf_counter()
+    nbytes = send_frame(cursor, replay)
+    if nbytes is not None:
+        FRAMES_EMITTED.inc(protocol=cursor.protocol)
+        FRAME_EMIT_SECONDS.observe(time.perf_counter() - started, protocol=cursor.protocol)
+        FRAME_BYTES.observe(nbytes, protocol=cursor.protocol)
 
-def emit_current_frame():
-    """Emit current frame data to all clients"""
+def send_frame(cursor, replay=None):
+    """Encode and emit one frame in the cursor's protocol. Returns the payload size, or None if nothing was sent"""
     try:
-        frames = current_replay.get('frames')
-        if not frames:
+        replay = replay or replays.get(cursor.key)
+        if replay is None or not replay.total_frames:
             print("⚠️ No frames available")
-            return
+            return None
         
-        frame_idx = current_replay['frame_index']
-        total_frames = current_replay['total_frames']
-        driver_colors = current_replay['telemetry'].get('driver_colors', {})
+        frames = replay.frames
+        frame_idx = cursor.frame_index
+        total_frames = replay.total_frames
+        driver_hex = replay.driver_hex
         
         if frame_idx >= len(frames):
             print(f"⚠️ Frame index {frame_idx} out of range")
-            return
+            return None
+        
+        # Local-playback clients fetch frames themselves from /api/frames
+        if cursor.protocol == PROTOCOL_LOCAL:
+            return None
+        
+        # Delta clients get changed fields since their last frame (keyframes periodically and after seeks)
+        if cursor.protocol == PROTOCOL_DELTA:
+            if cursor.frames_sent - cursor.frames_acked >= DELTA_MAX_IN_FLIGHT:
+                return None  # slow link: let the client catch up, the clock keeps running
+            payload = cursor.delta.encode(frames, frame_idx, replay.driver_codes, total_frames,
+                                          replay.track_status_code(frame_idx))
+            cursor.frames_sent += 1
+            seq = cursor.frames_sent
+            socketio.emit('frame_delta', payload, to=cursor.sid, callback=lambda *args: cursor.ack(seq))
+            return len(payload)
+        
+        # Binary clients get packed records; codes/colours were sent once with initial_load_complete
+        if cursor.protocol == PROTOCOL_BINARY:
+            payload = encode_frame(frames, frame_idx, replay.driver_codes, total_frames,
+                                   replay.track_status_code(frame_idx))
+            socketio.emit('frame_bin', payload, to=cursor.sid)
+            return len(payload)
         
         frame = frames[frame_idx]
     except Exception as e:
         print(f"❌ Error getting frame: {e}")
-        return
+        return None
     
     # Build driver data from frame
     drivers_list = []
     for driver_code, driver_frame_data in frame.get('drivers', {}).items():
-        color = driver_colors.get(driver_code, (128, 128, 128))
-        hex_color = '#{:02x}{:02x}{:02x}'.format(*color)
-        
         drivers_list.append({
             'code': str(driver_code),
-            'color': hex_color,
+            'color': driver_hex.get(driver_code, '#808080'),
             'x': float(driver_frame_data.get('x', 0)),
             'y': float(driver_frame_data.get('y', 0)),
             'speed': float(driver_frame_data.get('speed', 0)),
@@ -632,6 +697,7 @@ def emit_current_frame():
         'frame': int(frame_idx),
         'total_frames': int(total_frames),
         'time': float(frame.get('t', 0)),
+        'track_status': replay.track_status_at(frame_idx),
         'drivers': drivers_list
     }
     
@@ -647,66 +713,30 @@ def emit_current_frame():
         }
     
     try:
-        socketio.emit('frame_update', frame_data)
+        socketio.emit('frame_update', frame_data, to=cursor.sid)
     except Exception as e:
         print(f"❌ Error emitting frame: {e}")
+        return None
+    # Socket.IO serialises the dict itself; measure the compact JSON for the bytes-per-frame metric
+    return len(json.dumps(frame_data, separators=(',', ':')))
 
-def replay_loop():
-    """Main replay loop - runs in background thread with frame skipping"""
-    print("🎬 Replay loop started")
-    total = current_replay.get('total_frames', 0)
-    print(f"   Total frames: {total}")
-    print(f"   Starting from: {current_replay.get('frame_index', 0)}")
-    
-    # Calculate frame skip to achieve ~5 FPS effective rate
-    # Original data is 25 FPS, so skip 4 frames to get 5 FPS
-    frame_skip = 5  # 5 FPS effective - balanced speed and data
-    print(f"   Frame skip: {frame_skip} (5 FPS - every {frame_skip}th frame)")
-    
-    frame_count = 0
-    
-    while current_replay['is_playing'] and current_replay.get('frames'):
-        try:
-            # Debug: Log before emit
-            if frame_count == 0:
-                print(f"🎬 About to emit first frame (index {current_replay['frame_index']})")
-            
-            # Emit current frame
-            emit_current_frame()
-            frame_count += 1
-            
-            # Log every frame for first 5, then every 10
-            if frame_count <= 5 or frame_count % 10 == 0:
-                print(f"📊 Emitted frame #{frame_count}, index: {current_replay['frame_index']}/{total}")
-            
-            # Advance frame with skipping
-            current_replay['frame_index'] += frame_skip
-            
-            # Check if reached end
-            if current_replay['frame_index'] >= total:
-                print("🏁 Replay ended")
-                current_replay['is_playing'] = False
-                current_replay['frame_index'] = 0
-                socketio.emit('replay_ended', {})
-                break
-            
-            # Slower sleep for cloud deployment to avoid WebSocket buffer buildup
-            # Railway has higher latency than local, so we need to slow down
-            time.sleep(0.1)  # 100ms between frames = 10 FPS max, front-end limits to 5 FPS
-            
-        except Exception as e:
-            print(f"❌ Error in replay loop: {e}")
-            import traceback
-            traceback.print_exc()
-            break
-    
-    print(f"🛑 Replay loop exited after emitting {frame_count} frames")
+# One scheduler task drives every playing cursor, emitting to the owning client's room.
+# Each tick emits the frame the cursor's clock is at (replay time x speed); the viewer interpolates in between
+playback = PlaybackScheduler(
+    replays,
+    emit_frame=emit_current_frame,
+    emit_ended=lambda cursor: socketio.emit('replay_ended', {}, to=cursor.sid),
+    start_task=socketio.start_background_task,
+    sleep=socketio.sleep,
+    tick=1.0 / PLAYBACK_EMIT_HZ,
+)
 
 def memory_cleanup_task():
-    """Background task to periodically clean up old data"""
+    """Background task to periodically evict idle replays and keep the process under its memory budget"""
     while True:
-        time.sleep(300)  # Check every 5 minutes
-        clean_old_data()
+        time.sleep(MEMORY_CHECK_SECONDS)
+        replays.evict_idle()
+        replays.enforce_process_budget()
 
 if __name__ == '__main__':
     # Enable FastF1 cache on startup
@@ -716,7 +746,9 @@ if __name__ == '__main__':
     # Start memory cleanup thread
     cleanup_thread = threading.Thread(target=memory_cleanup_task, daemon=True)
     cleanup_thread.start()
-    print("🧹 Memory cleanup task started (checks every 5 min)")
+    budget = replays.process_budget_bytes
+    budget_label = f"{budget / 1e6:.0f} MB" if budget else "unlimited"
+    print(f"🧹 Memory cleanup task started (checks every {MEMORY_CHECK_SECONDS}s, process budget {budget_label})")
     
     # Railway environment detection
     if RAILWAY_ENVIRONMENT:
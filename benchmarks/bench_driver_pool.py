@@ -0,0 +1,103 @@
+"""
+Benchmark: per-driver telemetry extraction pool, pickled vs fork-shared session.
+
+Compares the old behaviour (the whole FastF1 session pickled into every
+Pool task) with the fork-inherited session used by ``_map_drivers``. Each
+mode runs in a fresh subprocess so peak RSS figures are not polluted by the
+other run.
+
+By default it runs on a 20-driver, 60-lap ``SyntheticSession`` so it works
+offline and the numbers are comparable across commits. ``--year``/``--round``
+use a real race instead (needs it in the FastF1 cache or network access):
+
+    python -m benchmarks.bench_driver_pool
+    python -m benchmarks.bench_driver_pool --year 2024 --round 1
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+MODES = ("pickled", "shared")
+
+
+def _peak_rss_mb(who):
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _load(year, round_number, session_type, seed):
+    from src import f1_data
+
+    if year is None:
+        from benchmarks.synthetic_session import SyntheticSession
+
+        return SyntheticSession(n_drivers=20, n_laps=60, seed=seed, session_type=session_type)
+    f1_data.enable_cache()
+    return f1_data.load_session(year, round_number, session_type)
+
+
+def run_single(mode, year, round_number, session_type, seed=1):
+    from src import f1_data
+
+    session = _load(year, round_number, session_type, seed)
+    driver_args = [
+        (num, session.get_driver(num)["Abbreviation"]) for num in session.drivers
+    ]
+
+    start = time.perf_counter()
+    results = f1_data._map_drivers(
+        f1_data._process_single_driver,
+        session,
+        driver_args,
+        share_session=(mode == "shared"),
+    )
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "drivers": len(driver_args),
+        "processed": sum(1 for r in results if r is not None),
+        "wall_s": round(elapsed, 2),
+        "parent_peak_rss_mb": round(_peak_rss_mb(resource.RUSAGE_SELF), 1),
+        "worker_peak_rss_mb": round(_peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--year", type=int, help="real race to load (default: synthetic session)")
+    parser.add_argument("--round", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1, help="synthetic session seed")
+    parser.add_argument("--session", default="R")
+    parser.add_argument("--mode", choices=MODES, help="run a single mode in this process")
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_single(args.mode, args.year, args.round, args.session, args.seed)))
+        return
+
+    source = ["--seed", str(args.seed)] if args.year is None else ["--year", str(args.year), "--round", str(args.round)]
+    rows = []
+    for mode in MODES:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_driver_pool", *source,
+             "--session", args.session, "--mode", mode],
+            check=True, capture_output=True, text=True,
+        )
+        rows.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    name = f"synthetic (seed {args.seed})" if args.year is None else f"{args.year} R{args.round}"
+    print(f"\n{name} {args.session} - driver extraction pool")
+    print(f"{'mode':<10}{'drivers':>9}{'wall (s)':>11}{'parent RSS (MB)':>18}{'worker RSS (MB)':>18}")
+    for row in rows:
+        print(f"{row['mode']:<10}{row['drivers']:>9}{row['wall_s']:>11}"
+              f"{row['parent_peak_rss_mb']:>18}{row['worker_peak_rss_mb']:>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Benchmark: replay pipeline hot paths on a synthetic session (no network).
+
+Runs each hot path against ``SyntheticSession`` data (20 drivers x 60 laps
+by default) and reports wall time (best and median of ``--repeat`` runs
+after one warm-up run), peak Python heap during one extra traced run, and
+throughput in frames (or laps) per second. Results can be saved as JSON and compared against a
+previous run to catch regressions in CI:
+
+    python -m benchmarks.bench_hot_paths
+    python -m benchmarks.bench_hot_paths --only race_telemetry_cold quali_telemetry --repeat 5
+    python -m benchmarks.bench_hot_paths --json baseline.json
+    python -m benchmarks.bench_hot_paths --compare baseline.json --threshold 0.15
+
+Peak memory is measured with tracemalloc in this process only; the driver
+extraction pool's worker processes are not included.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+
+from benchmarks.synthetic_session import SyntheticSession
+
+
+class Benchmark:
+    """One hot path: ``setup(args)`` builds untimed state, ``run(state)`` does the work and returns an item count."""
+
+    def __init__(self, name, unit, setup, run, before_each=None, teardown=None):
+        self.name = name
+        self.unit = unit
+        self.setup = setup
+        self.run = run
+        self.before_each = before_each
+        self.teardown = teardown
+
+
+@contextlib.contextmanager
+def _quiet():
+    # The loaders narrate every driver; keep the benchmark output readable
+    with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+        warnings.simplefilter("ignore")
+        yield
+
+
+def _race_cache_dir(session):
+    from src.lib.telemetry_cache import race_cache_path
+    return race_cache_path(str(session).replace(" ", "_"), "race")
+
+
+# ----------------------------------------------------------------------
+# Hot paths
+# ----------------------------------------------------------------------
+
+def _setup_race(args):
+    return {"session": SyntheticSession(n_drivers=args.drivers, n_laps=args.laps, seed=args.seed)}
+
+
+def _clear_race_cache(state):
+    shutil.rmtree(_race_cache_dir(state["session"]), ignore_errors=True)
+
+
+def _run_race_telemetry(state):
+    from src.f1_data import get_race_telemetry
+    state["telemetry"] = get_race_telemetry(state["session"])
+    return len(state["telemetry"]["frames"])
+
+
+def _setup_race_cached(args):
+    state = _setup_race(args)
+    _clear_race_cache(state)
+    _run_race_telemetry(state)  # populate the cache
+    return state
+
+
+def _setup_quali(args):
+    session = SyntheticSession(n_drivers=args.drivers, seed=args.seed, session_type="Q")
+    return {"session": session, "driver": session.get_driver(session.drivers[0])["Abbreviation"]}
+
+
+def _run_quali(state):
+    from src.f1_data import get_driver_quali_telemetry
+    return len(get_driver_quali_telemetry(state["session"], state["driver"], "Q3")["frames"])
+
+
+def _run_events(state):
+    from src.lib.race_events import extract_race_events
+    telemetry = state["telemetry"]
+    extract_race_events(telemetry["frames"], telemetry["track_statuses"], telemetry["total_laps"], telemetry["fps"])
+    return len(telemetry["frames"])
+
+
+def _run_tyre_fit(state):
+    from src.bayesian_tyre_model import BayesianTyreDegradationModel
+    BayesianTyreDegradationModel().fit(state["session"].laps)
+    return len(state["session"].laps)
+
+
+def _run_encode_chunks(state, chunk_frames=250):
+    from src.lib.frame_codec import driver_order, encode_chunk
+    frames = state["telemetry"]["frames"]
+    codes = driver_order(frames)
+    for start in range(0, len(frames), chunk_frames):
+        encode_chunk(frames, start, chunk_frames, 1, codes, len(frames))
+    return len(frames)
+
+
+BENCHMARKS = (
+    Benchmark("race_telemetry_cold", "frames", _setup_race, _run_race_telemetry,
+              before_each=_clear_race_cache, teardown=_clear_race_cache),
+    Benchmark("race_telemetry_cached", "frames", _setup_race_cached, _run_race_telemetry,
+              teardown=_clear_race_cache),
+    Benchmark("quali_telemetry", "frames", _setup_quali, _run_quali),
+    Benchmark("extract_race_events", "frames", _setup_race_cached, _run_events, teardown=_clear_race_cache),
+    Benchmark("tyre_model_fit", "laps", _setup_race, _run_tyre_fit),
+    Benchmark("encode_chunks", "frames", _setup_race_cached, _run_encode_chunks, teardown=_clear_race_cache),
+)
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+def measure(bench, args):
+    with _quiet():
+        state = bench.setup(args)
+    try:
+        walls = []
+        items = 0
+        for i in range(args.repeat + 1):
+            with _quiet():
+                if bench.before_each:
+                    bench.before_each(state)
+                start = time.perf_counter()
+                items = bench.run(state)
+                elapsed = time.perf_counter() - start
+            if i:  # the first run only warms up imports and caches
+                walls.append(elapsed)
+
+        # Separate traced run: tracemalloc slows allocation-heavy code down too much to time under it
+        with _quiet():
+            if bench.before_each:
+                bench.before_each(state)
+            tracemalloc.start()
+            bench.run(state)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    finally:
+        if bench.teardown:
+            bench.teardown(state)
+
+    best = min(walls)
+    return {
+        "name": bench.name,
+        "unit": bench.unit,
+        "items": items,
+        "best_s": round(best, 4),
+        "median_s": round(statistics.median(walls), 4),
+        "peak_mb": round(peak / (1024 * 1024), 1),
+        "per_s": round(items / best, 1) if best > 0 else None,
+    }
+
+
+def compare(rows, baseline, threshold):
+    """Names of benchmarks whose median wall time regressed by more than ``threshold``."""
+    previous = {row["name"]: row for row in baseline.get("results", [])}
+    regressions = []
+    for row in rows:
+        old = previous.get(row["name"])
+        if not old or not old.get("median_s"):
+            continue
+        change = row["median_s"] / old["median_s"] - 1.0
+        row["change"] = round(change, 3)
+        if change > threshold:
+            regressions.append(row["name"])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--laps", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=[b.name for b in BENCHMARKS], help="run only these")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="previous --json output; exit 1 if anything got slower than --threshold")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed median slowdown (default 10%%)")
+    args = parser.parse_args()
+
+    selected = [b for b in BENCHMARKS if not args.only or b.name in args.only]
+    rows = []
+    for bench in selected:
+        print(f"⏱️ {bench.name}...", file=sys.stderr, flush=True)
+        rows.append(measure(bench, args))
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(rows, json.load(f), args.threshold)
+
+    print(f"\nSynthetic session: {args.drivers} drivers x {args.laps} laps, seed {args.seed}, "
+          f"best/median of {args.repeat}")
+    print(f"{'benchmark':<24}{'items':>9}{'best (s)':>11}{'median (s)':>12}{'peak (MB)':>11}{'items/s':>13}"
+          + (f"{'change':>9}" if args.compare else ""))
+    for row in rows:
+        line = (f"{row['name']:<24}{row['items']:>9}{row['best_s']:>11}{row['median_s']:>12}"
+                f"{row['peak_mb']:>11}{row['per_s']:>13}")
+        if args.compare:
+            line += f"{row['change']:>+9.1%}" if "change" in row else f"{'-':>9}"
+        print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"drivers": args.drivers, "laps": args.laps, "seed": args.seed, "repeat": args.repeat,
+                       "results": rows}, f, indent=2)
+
+    if regressions:
+        print(f"\n❌ Slower than baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""
+Synthetic stand-in for a loaded FastF1 session, for offline benchmarks.
+
+``SyntheticSession`` builds real ``fastf1.core.Laps`` and ``Telemetry``
+objects (so FastF1's own slicing, merging and lap selection run exactly as
+they do on downloaded data) for a made-up Grand Prix: a closed circuit,
+20 drivers with individual pace, tyre degradation and fuel burn, one or two
+pit stops each, a couple of retirements, yellow / Safety Car / VSC periods
+and weather sampled once a minute. ``session_type="Q"`` produces a
+three-part qualifying session instead.
+
+Everything is derived from ``seed``, so two runs with the same arguments
+produce identical data and benchmark numbers are comparable across commits.
+
+    from benchmarks.synthetic_session import SyntheticSession
+    session = SyntheticSession(n_drivers=20, n_laps=60, seed=1)
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from fastf1.core import Laps, Telemetry
+
+DRIVERS = (
+    ("1", "VER", "Max Verstappen", "Red Bull Racing"),
+    ("11", "PER", "Sergio Perez", "Red Bull Racing"),
+    ("16", "LEC", "Charles Leclerc", "Ferrari"),
+    ("55", "SAI", "Carlos Sainz", "Ferrari"),
+    ("44", "HAM", "Lewis Hamilton", "Mercedes"),
+    ("63", "RUS", "George Russell", "Mercedes"),
+    ("4", "NOR", "Lando Norris", "McLaren"),
+    ("81", "PIA", "Oscar Piastri", "McLaren"),
+    ("14", "ALO", "Fernando Alonso", "Aston Martin"),
+    ("18", "STR", "Lance Stroll", "Aston Martin"),
+    ("10", "GAS", "Pierre Gasly", "Alpine"),
+    ("31", "OCO", "Esteban Ocon", "Alpine"),
+    ("23", "ALB", "Alexander Albon", "Williams"),
+    ("2", "SAR", "Logan Sargeant", "Williams"),
+    ("22", "TSU", "Yuki Tsunoda", "RB"),
+    ("3", "RIC", "Daniel Ricciardo", "RB"),
+    ("77", "BOT", "Valtteri Bottas", "Kick Sauber"),
+    ("24", "ZHO", "Zhou Guanyu", "Kick Sauber"),
+    ("20", "MAG", "Kevin Magnussen", "Haas F1 Team"),
+    ("27", "HUL", "Nico Hulkenberg", "Haas F1 Team"),
+)
+
+# Seconds per lap gained per lap of tyre age, and pace offset vs MEDIUM
+COMPOUNDS = {
+    "SOFT": (0.085, -0.6),
+    "MEDIUM": (0.055, 0.0),
+    "HARD": (0.035, 0.45),
+}
+STRATEGIES = (("MEDIUM", "HARD"), ("SOFT", "HARD"), ("SOFT", "MEDIUM", "HARD"), ("HARD", "MEDIUM"))
+
+BASE_LAP_TIME = 92.0
+SESSION_START = 3600.0  # session time of lights out, like the real timing feed's ~1 h pre-race
+SC_SLOWDOWN = 1.45
+VSC_SLOWDOWN = 1.30
+PIT_LOSS = 21.0
+
+# Straights (as lap fractions) where DRS can be open
+DRS_ZONES = ((0.02, 0.14), (0.52, 0.61))
+
+
+class SyntheticSession:
+    """Duck-typed ``fastf1.core.Session`` with generated laps, telemetry, track status and weather."""
+
+    _QUALI_LIKE_SESSIONS = ("Qualifying", "Sprint Shootout", "Sprint Qualifying")
+
+    def __init__(self, n_drivers: int = 20, n_laps: int = 60, seed: int = 0, session_type: str = "R",
+                 hz: float = 4.0, n_retirements: int = 2, rain: bool = False):
+        if not 1 <= n_drivers <= len(DRIVERS):
+            raise ValueError(f"n_drivers must be between 1 and {len(DRIVERS)}")
+        self._rng = np.random.default_rng(seed)
+        self.seed = seed
+        self.session_type = session_type
+        self.name = "Qualifying" if session_type == "Q" else "Race"
+        self.hz = hz
+        self.n_laps = n_laps
+        self.t0_date = pd.Timestamp("2024-03-02 14:00:00")
+        self.event = pd.Series({
+            "EventName": "Synthetic Grand Prix",
+            "Location": "Benchmark Park",
+            "Country": "Nowhere",
+            "RoundNumber": 0,
+        })
+        self._session_split_times = None
+        self.session_status = None
+
+        self._drivers = DRIVERS[:n_drivers]
+        self.drivers = [num for num, *_ in self._drivers]
+        self._info = {num: (code, name, team) for num, code, name, team in self._drivers}
+        self.results = pd.DataFrame({
+            "DriverNumber": self.drivers,
+            "Abbreviation": [self._info[n][0] for n in self.drivers],
+            "TeamName": [self._info[n][2] for n in self.drivers],
+        })
+
+        self._track = self._build_track()
+        self._pace = np.sort(self._rng.normal(0.0, 0.45, n_drivers)) + np.linspace(0, 1.2, n_drivers)
+
+        if session_type == "Q":
+            lap_rows = self._qualifying_laps()
+            self.track_status = pd.DataFrame({"Time": pd.to_timedelta([0.0], unit="s"), "Status": ["1"],
+                                              "Message": ["AllClear"]})
+        else:
+            lap_rows = self._race_laps(n_retirements)
+
+        self.laps = Laps(pd.DataFrame(lap_rows), session=self)
+        self.laps["IsPersonalBest"] = self._personal_bests()
+        self.car_data, self.pos_data = self._telemetry(lap_rows)
+        self.weather_data = self._weather(rain)
+
+    # ------------------------------------------------------------------
+    # Session API used by the loaders
+    # ------------------------------------------------------------------
+
+    def get_driver(self, identifier) -> pd.Series:
+        num = str(identifier)
+        if num not in self._info:
+            num = next(n for n, info in self._info.items() if info[0] == identifier)
+        code, name, team = self._info[num]
+        return pd.Series({"DriverNumber": num, "Abbreviation": code, "FullName": name, "TeamName": team,
+                          "TeamColor": "808080"})
+
+    def get_circuit_info(self):
+        return pd.Series({"rotation": 0.0})
+
+    def __str__(self) -> str:
+        return f"2024 Season Round 0: Synthetic Grand Prix - {self.name} (seed {self.seed})"
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
+
+    def _build_track(self) -> Dict[str, np.ndarray]:
+        # Closed curve of a few harmonics, ~5 km long, and a speed profile that dips in the corners
+        theta = np.linspace(0.0, 2 * np.pi, 2000, endpoint=False)
+        x = 3200 * np.cos(theta) + 650 * np.cos(3 * theta + 0.4) + 180 * np.sin(5 * theta)
+        y = 1900 * np.sin(theta) + 420 * np.sin(2 * theta + 1.1) - 150 * np.cos(4 * theta)
+        dx, dy = np.gradient(x), np.gradient(y)
+        ddx, ddy = np.gradient(dx), np.gradient(dy)
+        curvature = np.abs(dx * ddy - dy * ddx) / np.maximum((dx ** 2 + dy ** 2) ** 1.5, 1e-9)
+        speed = np.clip(340.0 / (1.0 + 350.0 * curvature), 85.0, 330.0)
+        # Smooth braking/acceleration zones
+        kernel = np.hanning(41) / np.hanning(41).sum()
+        speed = np.convolve(np.concatenate([speed[-20:], speed, speed[:20]]), kernel, mode="valid")
+        frac = theta / (2 * np.pi)
+        return {"frac": frac, "x": x, "y": y, "speed": speed}
+
+    def _race_laps(self, n_retirements: int) -> List[dict]:
+        rng = self._rng
+        n_laps = self.n_laps
+        n_drivers = len(self.drivers)
+
+        # Neutralised periods in leader laps: a yellow, a Safety Car and a VSC
+        sc_lap = int(n_laps * 0.45)
+        vsc_lap = int(n_laps * 0.75)
+        sc_laps = set(range(sc_lap, sc_lap + 4))
+        vsc_laps = {vsc_lap, vsc_lap + 1}
+
+        retired_at = {}
+        if n_retirements:
+            for j in rng.choice(np.arange(n_drivers // 2, n_drivers), size=min(n_retirements, n_drivers),
+                                replace=False):
+                retired_at[int(j)] = int(rng.integers(max(2, n_laps // 6), max(3, n_laps - 3)))
+
+        rows = []
+        lap_end_by_driver = []
+        for j, (num, code, _, team) in enumerate(self._drivers):
+            strategy = STRATEGIES[int(rng.integers(len(STRATEGIES)))]
+            stops = sorted(rng.choice(np.arange(max(2, n_laps // 5), max(3, n_laps - 5)),
+                                      size=len(strategy) - 1, replace=False)) if n_laps > 8 else []
+            t = SESSION_START + 0.25 * j  # grid slot
+            stint, compound_idx, tyre_life = 1, 0, int(rng.integers(1, 3))
+            last_lap = retired_at.get(j, n_laps)
+            ends = []
+            for lap in range(1, last_lap + 1):
+                compound = strategy[compound_idx]
+                deg, offset = COMPOUNDS[compound]
+                lap_time = (BASE_LAP_TIME + self._pace[j] + offset + deg * tyre_life
+                            - 0.055 * lap + rng.normal(0.0, 0.25))
+                if lap == 1:
+                    lap_time += 5.0 + 0.15 * j
+                if lap in sc_laps:
+                    lap_time *= SC_SLOWDOWN
+                elif lap in vsc_laps:
+                    lap_time *= VSC_SLOWDOWN
+                pit_in = lap in stops
+                pit_out = lap > 1 and (lap - 1) in stops
+                if pit_in:
+                    lap_time += PIT_LOSS * 0.4
+                if pit_out:
+                    lap_time += PIT_LOSS * 0.6
+                start = t
+                t += lap_time
+                rows.append({
+                    "Time": pd.Timedelta(seconds=t),
+                    "Driver": code,
+                    "DriverNumber": num,
+                    "LapTime": pd.Timedelta(seconds=lap_time),
+                    "LapNumber": float(lap),
+                    "Stint": float(stint),
+                    "PitOutTime": pd.Timedelta(seconds=start + 2.0) if pit_out else pd.NaT,
+                    "PitInTime": pd.Timedelta(seconds=t - 3.0) if pit_in else pd.NaT,
+                    "LapStartTime": pd.Timedelta(seconds=start),
+                    "Compound": compound,
+                    "TyreLife": float(tyre_life),
+                    "FreshTyre": tyre_life == 1,
+                    "Team": team,
+                    "TrackStatus": "4" if lap in sc_laps else ("6" if lap in vsc_laps else "1"),
+                    "IsAccurate": not (pit_in or pit_out or lap == 1),
+                    "Deleted": False,
+                })
+                ends.append(t)
+                tyre_life += 1
+                if pit_in:
+                    stint += 1
+                    compound_idx = min(compound_idx + 1, len(strategy) - 1)
+                    tyre_life = 1
+            lap_end_by_driver.append(ends)
+
+        # Positions at the end of each lap, and the track status timeline from the leader's laps
+        row_of = {(row["Driver"], int(row["LapNumber"])): row for row in rows}
+        for lap in range(1, n_laps + 1):
+            finishers = [(ends[lap - 1], j) for j, ends in enumerate(lap_end_by_driver) if len(ends) >= lap]
+            for pos, (_, j) in enumerate(sorted(finishers), start=1):
+                row_of[(self._drivers[j][1], lap)]["Position"] = float(pos)
+
+        leader_ends = lap_end_by_driver[0]
+        lap_start = [SESSION_START] + leader_ends[:-1]
+        yellow_lap = max(1, int(n_laps * 0.2))
+        statuses = [(0.0, "1")]
+        if n_laps > 4:
+            statuses += [(lap_start[yellow_lap] + 30.0, "2"), (lap_start[yellow_lap] + 48.0, "1")]
+        if sc_lap < len(lap_start) and max(sc_laps) < len(lap_start):
+            statuses += [(lap_start[sc_lap], "4"), (lap_start[max(sc_laps) + 1] if max(sc_laps) + 1 < len(lap_start)
+                                                    else leader_ends[-1], "1")]
+        if vsc_lap + 2 < len(lap_start):
+            statuses += [(lap_start[vsc_lap], "6"), (lap_start[vsc_lap + 2] - 8.0, "7"),
+                         (lap_start[vsc_lap + 2], "1")]
+        statuses.sort()
+        self.track_status = pd.DataFrame({
+            "Time": pd.to_timedelta([s[0] for s in statuses], unit="s"),
+            "Status": [s[1] for s in statuses],
+            "Message": ["" for _ in statuses],
+        })
+        return rows
+
+    def _qualifying_laps(self) -> List[dict]:
+        rng = self._rng
+        n_drivers = len(self.drivers)
+        # Q1 18 min, Q2 15 min, Q3 12 min with 7-8 min breaks; the bottom of each part is knocked out
+        segments = ((SESSION_START, 18 * 60, n_drivers), (SESSION_START + 26 * 60, 15 * 60, min(15, n_drivers)),
+                    (SESSION_START + 49 * 60, 12 * 60, min(10, n_drivers)))
+        status_times, status_values = [], []
+        rows = []
+        running = list(range(n_drivers))
+        lap_counter = {j: 0 for j in running}
+        for q, (seg_start, seg_len, n_running) in enumerate(segments):
+            status_times += [seg_start - 1.0, seg_start + seg_len + 200.0]
+            status_values += ["Started", "Finished"]
+            best = {}
+            for j in running[:n_running]:
+                num, code, _, team = self._drivers[j]
+                t = seg_start + rng.uniform(30.0, 240.0)
+                for _run in range(2):
+                    for kind in ("out", "push", "in"):
+                        lap_time = BASE_LAP_TIME - 3.0 + self._pace[j] - 0.3 * q + rng.normal(0.0, 0.15)
+                        if kind != "push":
+                            lap_time *= 1.35
+                        lap_counter[j] += 1
+                        start = t
+                        t += lap_time
+                        rows.append({
+                            "Time": pd.Timedelta(seconds=t),
+                            "Driver": code,
+                            "DriverNumber": num,
+                            "LapTime": pd.Timedelta(seconds=lap_time) if kind == "push" else pd.NaT,
+                            "LapNumber": float(lap_counter[j]),
+                            "Stint": float(q + 1),
+                            "PitOutTime": pd.Timedelta(seconds=start + 2.0) if kind == "out" else pd.NaT,
+                            "PitInTime": pd.Timedelta(seconds=t - 3.0) if kind == "in" else pd.NaT,
+                            "LapStartTime": pd.Timedelta(seconds=start),
+                            "Compound": "SOFT",
+                            "TyreLife": float(1 if kind == "out" else 2),
+                            "FreshTyre": True,
+                            "Team": team,
+                            "TrackStatus": "1",
+                            "IsAccurate": kind == "push",
+                            "Deleted": False,
+                            "Position": np.nan,
+                        })
+                        if kind == "push":
+                            best[j] = min(best.get(j, np.inf), lap_time)
+                    t += rng.uniform(180.0, 300.0)  # back in the garage
+            running = sorted(best, key=best.get)
+        self.session_status = pd.DataFrame({"Time": pd.to_timedelta(status_times, unit="s"),
+                                            "Status": status_values})
+        return rows
+
+    def _personal_bests(self) -> np.ndarray:
+        laps = self.laps
+        valid = laps["LapTime"].notna() & laps["PitInTime"].isna() & laps["PitOutTime"].isna()
+        best = laps["LapTime"].where(valid).groupby(laps["Driver"]).transform("min")
+        return (valid & (laps["LapTime"] == best)).to_numpy()
+
+    def _telemetry(self, lap_rows: List[dict]) -> Tuple[Dict[str, Telemetry], Dict[str, Telemetry]]:
+        rng = self._rng
+        track = self._track
+        by_driver: Dict[str, List[dict]] = {}
+        for row in lap_rows:
+            by_driver.setdefault(row["DriverNumber"], []).append(row)
+
+        # The timing feed sends every car in one packet, so all drivers share sample times
+        # (FastF1's driver-ahead calculation relies on that when it joins them)
+        t_first = min(r["LapStartTime"].total_seconds() for r in lap_rows) - 5.0
+        t_last = max(r["Time"].total_seconds() for r in lap_rows) + 5.0
+        clocks = {}
+        for kind, offset in (("car", 0.0), ("pos", 0.07)):
+            base = np.arange(t_first + offset, t_last, 1.0 / self.hz)
+            clocks[kind] = base + rng.uniform(-0.02, 0.02, len(base))
+
+        car_data, pos_data = {}, {}
+        for j, num in enumerate(self.drivers):
+            laps = sorted(by_driver.get(num, []), key=lambda r: r["LapStartTime"])
+            if not laps:
+                continue
+            starts = np.array([r["LapStartTime"].total_seconds() for r in laps])
+            ends = np.array([r["Time"].total_seconds() for r in laps])
+            first, last = starts[0] - 5.0, ends[-1] + 5.0
+            lateral = rng.normal(0.0, 3.0)  # each car keeps its own line
+
+            for kind, clock in clocks.items():
+                t = clock[(clock >= first) & (clock <= last)]
+                lap_idx = np.clip(np.searchsorted(starts, t, side="right") - 1, 0, len(starts) - 1)
+                frac = np.clip((t - starts[lap_idx]) / (ends[lap_idx] - starts[lap_idx]), 0.0, 1.0)
+                frac = np.where(t < starts[0], 0.0, np.where(t > ends[-1], 1.0, frac)) % 1.0
+                speed = np.interp(frac, track["frac"], track["speed"], period=1.0)
+                # Cars in the pit lane or under neutralisation run slower than the track profile
+                slow = np.array([r["PitInTime"] is not pd.NaT or r["PitOutTime"] is not pd.NaT
+                                 or r["TrackStatus"] != "1" for r in laps])[lap_idx]
+                speed = np.where(slow, np.minimum(speed, 180.0), speed) + rng.normal(0.0, 1.5, len(t))
+
+                df = pd.DataFrame({"SessionTime": pd.to_timedelta(t, unit="s")})
+                df["Time"] = df["SessionTime"] - pd.Timedelta(seconds=starts[0])
+                df["Date"] = self.t0_date + df["SessionTime"]
+                df["Source"] = kind
+                if kind == "car":
+                    gear = np.clip(np.ceil(speed / 42.0), 1, 8).astype(int)
+                    in_drs = np.zeros(len(t), dtype=bool)
+                    for lo, hi in DRS_ZONES:
+                        in_drs |= (frac >= lo) & (frac <= hi)
+                    accel = np.gradient(speed)
+                    df["Speed"] = speed
+                    df["RPM"] = 7000.0 + 5200.0 * (speed % 42.0) / 42.0
+                    df["nGear"] = gear
+                    df["Throttle"] = np.clip(np.where(accel >= 0, 100.0, 15.0 + accel * 4), 0.0, 100.0)
+                    df["Brake"] = accel < -6.0
+                    df["DRS"] = np.where(in_drs & (lap_idx > 1) & ~slow, 12, 8 if j else 0)
+                    car_data[num] = Telemetry(df, session=self, driver=num)
+                else:
+                    x = np.interp(frac, track["frac"], track["x"], period=1.0)
+                    y = np.interp(frac, track["frac"], track["y"], period=1.0)
+                    df["X"] = x + lateral
+                    df["Y"] = y - lateral
+                    df["Z"] = 0.0
+                    df["Status"] = "OnTrack"
+                    pos_data[num] = Telemetry(df, session=self, driver=num)
+        return car_data, pos_data
+
+    def _weather(self, rain: bool) -> pd.DataFrame:
+        rng = self._rng
+        end = max(r.total_seconds() for r in self.laps["Time"]) + 120.0
+        t = np.arange(0.0, end, 60.0)
+        minutes = t / 60.0
+        rainfall = np.zeros(len(t), dtype=bool)
+        if rain:
+            mid = len(t) // 2
+            rainfall[mid:mid + max(1, len(t) // 6)] = True
+        return pd.DataFrame({
+            "Time": pd.to_timedelta(t, unit="s"),
+            "AirTemp": 24.0 + 0.01 * minutes + rng.normal(0.0, 0.1, len(t)),
+            "Humidity": np.where(rainfall, 85.0, 48.0) + rng.normal(0.0, 1.0, len(t)),
+            "Pressure": 1012.0 + rng.normal(0.0, 0.2, len(t)),
+            "Rainfall": rainfall,
+            "TrackTemp": np.where(rainfall, 27.0, 38.0) - 0.02 * minutes + rng.normal(0.0, 0.2, len(t)),
+            "WindDirection": (200 + rng.normal(0.0, 10.0, len(t))).astype(int) % 360,
+            "WindSpeed": np.abs(1.5 + rng.normal(0.0, 0.4, len(t))),
+        })
+
@@ -1,7 +1,9 @@
 import os
 import pickle
 import sys
+import time
 from datetime import timedelta
+import multiprocessing
 from multiprocessing import Pool, cpu_count
 
 import fastf1
@@ -9,7 +11,18 @@ import fastf1.plotting
 import numpy as np
 import pandas as pd
 
+from src.lib.frame_store import FrameStore, rank_positions
+from src.lib.metrics import REGISTRY as METRICS
+from src.lib.race_events import extract_race_events
 from src.lib.settings import get_settings
+from src.lib.telemetry_cache import (
+    cache_fingerprint,
+    load_race_telemetry,
+    computed_data_dir,
+    race_cache_path,
+    save_race_telemetry,
+)
+from src.lib.track_geometry import TrackGeometry, geometry_fingerprint, track_geometry_path
 from src.lib.time import parse_time_string
 from src.lib.tyres import get_tyre_compound_int
 
@@ -42,10 +55,73 @@ def enable_cache():
 FPS = 25
 DT = 1 / FPS
 
+# Driver extraction pool utilisation, for the web server's /metrics
+POOL_PROCESSES = METRICS.gauge("f1_driver_pool_processes", "Processes in the running driver extraction pool")
+POOL_BUSY = METRICS.gauge("f1_driver_pool_busy_workers", "Driver extraction workers with a task in progress")
+POOL_TASKS = METRICS.counter("f1_driver_pool_tasks_total", "Per-driver extraction tasks completed")
+POOL_SECONDS = METRICS.histogram("f1_driver_pool_run_seconds", "Wall time of one driver extraction pool run")
+
+# Loaded session of the pool this worker process belongs to (see _map_drivers).
+# Only ever set inside pool workers, by _set_worker_session.
+_worker_session = None
+
+
+def _set_worker_session(session):
+    global _worker_session
+    _worker_session = session
+
+
+def _map_drivers(worker, session, driver_args, share_session=True, on_result=None):
+    """Run ``worker`` over per-driver args in a process pool.
+
+    Each task is ``(session, *args)``. When the pool uses fork(), the loaded
+    session is handed to each worker through the pool initializer and the
+    tasks carry ``None`` instead. A forked child inherits the initializer
+    arguments without pickling, so it reads the session copy-on-write rather
+    than unpickling a multi-hundred-MB copy per driver, and concurrent builds
+    never see each other's session. Without fork (or with
+    ``share_session=False``) the session is pickled into every task as before.
+
+    ``on_result(done, total)`` is called in the parent as each driver finishes.
+    Results are returned in ``driver_args`` order.
+    """
+    num_processes = max(1, min(cpu_count(), len(driver_args)))
+    use_fork = share_session and multiprocessing.get_start_method() == "fork"
+    task_session = None if use_fork else session
+    tasks = [(task_session, *args) for args in driver_args]
+    pool_args = {"initializer": _set_worker_session, "initargs": (session,)} if use_fork else {}
+
+    started = time.perf_counter()
+    POOL_PROCESSES.set(num_processes)
+    POOL_BUSY.set(min(num_processes, len(tasks)))
+    try:
+        with Pool(processes=num_processes, **pool_args) as pool:
+            if on_result is None:
+                results = pool.map(worker, tasks)
+                POOL_TASKS.inc(len(tasks))
+                return results
+            results = []
+            for result in pool.imap(worker, tasks):
+                results.append(result)
+                POOL_TASKS.inc()
+                # imap hands out tasks as workers free up, so every worker is busy until the queue drains
+                POOL_BUSY.set(min(num_processes, len(tasks) - len(results)))
+                on_result(len(results), len(tasks))
+            return results
+    finally:
+        POOL_PROCESSES.set(0)
+        POOL_BUSY.set(0)
+        POOL_SECONDS.observe(time.perf_counter() - started)
+
+
+def _worker_session_or(session):
+    return session if session is not None else _worker_session
+
 
 def _process_single_driver(args):
     """Process telemetry data for a single driver - must be top-level for multiprocessing"""
-    driver_no, session, driver_code = args
+    session, driver_no, driver_code = args
+    session = _worker_session_or(session)
 
     print(f"Getting telemetry for driver: {driver_code}")
 
@@ -55,81 +131,82 @@ def _process_single_driver(args):
 
     driver_max_lap = laps_driver.LapNumber.max() if not laps_driver.empty else 0
 
-    t_all = []
-    x_all = []
-    y_all = []
-    race_dist_all = []
-    rel_dist_all = []
-    lap_numbers = []
-    tyre_compounds = []
-    tyre_life_all = []
-    speed_all = []
-    gear_all = []
-    drs_all = []
-    throttle_all = []
-    brake_all = []
-
-    total_dist_so_far = 0.0
-
-    # iterate laps in order
-    for _, lap in laps_driver.iterlaps():
-        # get telemetry for THIS lap only
-        lap_tel = lap.get_telemetry()
-        lap_number = lap.LapNumber
-        tyre_compund_as_int = get_tyre_compound_int(lap.Compound)
-        tyre_life = lap.TyreLife if pd.notna(lap.TyreLife) else 0
-
-        if lap_tel.empty:
-            continue
-
-        t_lap = lap_tel["SessionTime"].dt.total_seconds().to_numpy()
-        x_lap = lap_tel["X"].to_numpy()
-        y_lap = lap_tel["Y"].to_numpy()
-        d_lap = lap_tel["Distance"].to_numpy()
-        rd_lap = lap_tel["RelativeDistance"].to_numpy()
-        speed_kph_lap = lap_tel["Speed"].to_numpy()
-        gear_lap = lap_tel["nGear"].to_numpy()
-        drs_lap = lap_tel["DRS"].to_numpy()
-        throttle_lap = lap_tel["Throttle"].to_numpy()
-        brake_lap = lap_tel["Brake"].to_numpy().astype(float)
-
-        # race distance = distance before this lap + distance within this lap
-        race_d_lap = total_dist_so_far + d_lap
-
-        t_all.append(t_lap)
-        x_all.append(x_lap)
-        y_all.append(y_lap)
-        race_dist_all.append(race_d_lap)
-        rel_dist_all.append(rd_lap)
-        lap_numbers.append(np.full_like(t_lap, lap_number))
-        tyre_compounds.append(np.full_like(t_lap, tyre_compund_as_int))
-        tyre_life_all.append(np.full_like(t_lap, tyre_life))
-        speed_all.append(speed_kph_lap)
-        gear_all.append(gear_lap)
-        drs_all.append(drs_lap)
-        throttle_all.append(throttle_lap)
-        brake_all.append(brake_lap)
-
-    if not t_all:
+    # Lap table in time order (laps without start/end times carry no telemetry)
+    laps = laps_driver.loc[laps_driver["LapStartTime"].notna() & laps_driver["Time"].notna()]
+    laps = laps.sort_values("LapStartTime")
+    if laps.empty:
         return None
 
-    # Concatenate all arrays at once for better performance
-    all_arrays = [t_all, x_all, y_all, race_dist_all, rel_dist_all, 
-                  lap_numbers, tyre_compounds, tyre_life_all, speed_all, gear_all, drs_all]
-    
-    t_all, x_all, y_all, race_dist_all, rel_dist_all, lap_numbers, \
-    tyre_compounds, tyre_life_all, speed_all, gear_all, drs_all = [np.concatenate(arr) for arr in all_arrays]
-
-    # Sort all arrays by time in one operation
-    order = np.argsort(t_all)
-    all_data = [t_all, x_all, y_all, race_dist_all, rel_dist_all, 
-                lap_numbers, tyre_compounds, tyre_life_all, speed_all, gear_all, drs_all]
-    
-    t_all, x_all, y_all, race_dist_all, rel_dist_all, lap_numbers, \
-    tyre_compounds, tyre_life_all, speed_all, gear_all, drs_all = [arr[order] for arr in all_data]
+    lap_start = laps["LapStartTime"].dt.total_seconds().to_numpy()
+    lap_end = laps["Time"].dt.total_seconds().to_numpy()
+    lap_number = laps["LapNumber"].to_numpy(dtype=float)
+    lap_tyre = np.array(
+        [get_tyre_compound_int(c if isinstance(c, str) else "") for c in laps["Compound"]],
+        dtype=float,
+    )
+    lap_tyre_life = laps["TyreLife"].fillna(0).to_numpy(dtype=float)
+
+    # Fetch the driver's car + position data once for the whole race and merge it in
+    # one pass, instead of repeating FastF1's slice/merge work in lap.get_telemetry()
+    race_start = laps["LapStartTime"].min()
+    race_end = laps["Time"].max()
+    car_data = session.car_data[driver_no].slice_by_time(race_start, race_end, pad=1, pad_side="both")
+    pos_data = session.pos_data[driver_no].slice_by_time(race_start, race_end, pad=1, pad_side="both")
+    if car_data.empty or pos_data.empty:
+        return None
 
-    throttle_all = np.concatenate(throttle_all)[order]
-    brake_all = np.concatenate(brake_all)[order]
+    tel = pos_data.merge_channels(car_data)
+    t_tel = tel["SessionTime"].dt.total_seconds().to_numpy()
+    speed_tel = tel["Speed"].to_numpy(dtype=float)
+
+    # Samples inside a lap, plus an interpolated sample on every lap edge
+    # (what slice_by_lap(interpolate_edges=True) used to add per lap)
+    tel_lap = np.searchsorted(lap_start, t_tel, side="right") - 1
+    inside = (tel_lap >= 0) & (t_tel <= lap_end[np.clip(tel_lap, 0, None)])
+
+    lap_ids = np.arange(len(lap_start))
+    t_all = np.concatenate([lap_start, t_tel[inside], lap_end])
+    lap_idx = np.concatenate([lap_ids, tel_lap[inside], lap_ids])
+
+    # Order by time; at a shared edge the previous lap's end comes before the next lap's start
+    order = np.lexsort((lap_idx, t_all))
+    t_all = t_all[order]
+    lap_idx = lap_idx[order]
+
+    def _continuous(column):
+        return np.interp(t_all, t_tel, tel[column].to_numpy(dtype=float))
+
+    # Discrete channels hold the last known value, like FastF1's forward fill
+    prev_sample = np.clip(np.searchsorted(t_tel, t_all, side="right") - 1, 0, len(t_tel) - 1)
+
+    def _discrete(column):
+        return tel[column].to_numpy(dtype=float)[prev_sample]
+
+    # Distance within each lap: integrate speed once over the whole race, then
+    # subtract the value at each lap start
+    cum_dist = np.concatenate(([0.0], np.cumsum(speed_tel[1:] / 3.6 * np.diff(t_tel))))
+    cum_all = np.interp(t_all, t_tel, cum_dist)
+    cum_lap_start = np.interp(lap_start, t_tel, cum_dist)
+    lap_length = np.interp(lap_end, t_tel, cum_dist) - cum_lap_start
+    lap_length[lap_length <= 0] = 1.0
+
+    d_lap = cum_all - cum_lap_start[lap_idx]
+    rel_dist_all = d_lap / lap_length[lap_idx]
+
+    # "dist" has always been the distance within the lap (the per-lap loop never advanced its
+    # running race-distance offset); positions rank on (lap, dist)
+    race_dist_all = d_lap
+
+    x_all = _continuous("X")
+    y_all = _continuous("Y")
+    lap_numbers = lap_number[lap_idx]
+    tyre_compounds = lap_tyre[lap_idx]
+    tyre_life_all = lap_tyre_life[lap_idx]
+    speed_all = _continuous("Speed")
+    gear_all = _discrete("nGear")
+    drs_all = _discrete("DRS")
+    throttle_all = _continuous("Throttle")
+    brake_all = _discrete("Brake")
 
     print(f"Completed telemetry for driver: {driver_code}")
 
@@ -210,25 +287,103 @@ def get_circuit_rotation(session):
     return circuit.rotation
 
 
-def get_race_telemetry(session, session_type="R"):
-    event_name = str(session).replace(" ", "_")
-    cache_suffix = "sprint" if session_type == "S" else "race"
+def get_track_geometry(year, round_number, session=None):
+    """Track geometry for a round's circuit, from the disk cache or the fastest qualifying lap.
 
-    # Check if this data has already been computed
+    Cached per circuit and year, so only the first load of a circuit pays for
+    the qualifying session. ``session`` is an already loaded session of the
+    same weekend: used directly when it is the qualifying session, and as a
+    fallback reference when qualifying has no laps. Returns None if no lap
+    with position data can be found.
+    """
+    if session is not None:
+        circuit = session.event.get('Location', session.event.get('Country', ''))
+    else:
+        circuit = fastf1.get_event(year, round_number)['Location']
+    path = track_geometry_path(computed_data_dir(), year, circuit)
+    fingerprint = geometry_fingerprint(fastf1.__version__)
+
+    geometry = TrackGeometry.load(path, fingerprint)
+    if geometry is not None:
+        print(f"📍 Track geometry for {circuit} {year} loaded from cache")
+        return geometry
+
+    candidates = []
+    if session is not None and session.name in ("Qualifying", "Sprint Shootout", "Sprint Qualifying"):
+        candidates.append(session)
+    else:
+        print("📍 Loading track layout from qualifying session...")
+        try:
+            candidates.append(load_session(year, round_number, 'Q'))
+        except Exception as e:
+            print(f"⚠️ Could not load qualifying session: {e}")
+        if session is not None:
+            candidates.append(session)
 
-    # Use /tmp for computed data cache on Railway
-    computed_data_dir = '/tmp/computed_data' if os.path.exists('/tmp') else 'computed_data'
-    cache_file = f"{computed_data_dir}/{event_name}_{cache_suffix}_telemetry.pkl"
-    
-    try:
-        with open(cache_file, "rb") as f:
-            frames = pickle.load(f)
-            print(f"✅ Loaded from cache: {cache_file}")
-            print("The replay should begin in a new window shortly!")
-            return frames
-    except FileNotFoundError:
-        print(f"⚠️ No cache found, computing from scratch...")
-        pass  # Need to compute from scratch
+    for reference in candidates:
+        if reference is None or len(reference.laps) == 0:
+            continue
+        fastest_lap = reference.laps.pick_fastest()
+        if fastest_lap is None:
+            continue
+        geometry = TrackGeometry.from_lap_telemetry(fastest_lap.get_telemetry())
+        try:
+            geometry.save(path, fingerprint)
+        except OSError as e:
+            print(f"⚠️ Could not cache track geometry: {e}")
+        print(f"✅ Built track geometry for {circuit} {year}: {len(geometry.x)} points")
+        return geometry
+
+    print(f"⚠️ No reference lap for the {circuit} {year} track layout")
+    return None
+
+
+def replay_timeline(t_min, t_max, max_frames=None):
+    """Common replay timeline (seconds from ``t_min``) and its frame rate.
+
+    Sessions that would need more than ``max_frames`` frames at ``FPS`` get a
+    coarser step instead, so the timeline is built at the reduced rate
+    directly rather than at full rate and thinned out afterwards.
+    """
+    dt = DT
+    if max_frames and (t_max - t_min) / DT > max_frames:
+        dt = (t_max - t_min) / max_frames
+    timeline = np.arange(t_min, t_max, dt)[:max_frames] - t_min
+    return timeline, 1.0 / dt
+
+
+def get_race_telemetry(session, session_type="R", progress=None, max_frames=None):
+    """Build (or load from cache) the replay frames for a race or sprint.
+
+    ``progress(stage, done, total)`` is called as the build moves through the
+    driver_extraction, resample, frame_build and cache_write stages so that
+    callers can report load progress; it is never called on a cache hit.
+
+    With ``max_frames`` the timeline is capped at that many frames (see
+    ``replay_timeline``); the frame rate actually used is returned as ``fps``.
+    """
+    def _report(stage, done=0, total=1):
+        if progress is not None:
+            progress(stage, done, total)
+
+    event_name = str(session).replace(" ", "_")
+    cache_suffix = "sprint" if session_type == "S" else "race"
+    if max_frames:
+        cache_suffix += f"_{max_frames}f"
+
+    # Check if this data has already been computed (and is still valid for this code/FastF1 version)
+    cache_path = race_cache_path(event_name, cache_suffix)
+    fingerprint = cache_fingerprint(f"{event_name}_{cache_suffix}", FPS, fastf1.__version__)
+
+    cached = load_race_telemetry(cache_path, fingerprint)
+    if cached is not None:
+        print(f"✅ Loaded from cache: {cache_path}")
+        if cached["race_events"] is None:  # cached before events were stored with the telemetry
+            cached["race_events"] = extract_race_events(cached["frames"], cached["track_statuses"],
+                                                        cached["total_laps"], cached["fps"])
+        print("The replay should begin in a new window shortly!")
+        return cached
+    print(f"⚠️ No cache found, computing from scratch...")
 
     drivers = session.drivers
 
@@ -244,14 +399,15 @@ def get_race_telemetry(session, session_type="R"):
     # 1. Get all of the drivers telemetry data using multiprocessing
     # Prepare arguments for parallel processing
     print(f"Processing {len(drivers)} drivers in parallel...")
-    driver_args = [
-        (driver_no, session, driver_codes[driver_no]) for driver_no in drivers
-    ]
-
-    num_processes = min(cpu_count(), len(drivers))
-
-    with Pool(processes=num_processes) as pool:
-        results = pool.map(_process_single_driver, driver_args)
+    driver_args = [(driver_no, driver_codes[driver_no]) for driver_no in drivers]
+
+    _report("driver_extraction", 0, len(driver_args))
+    results = _map_drivers(
+        _process_single_driver,
+        session,
+        driver_args,
+        on_result=lambda done, total: _report("driver_extraction", done, total),
+    )
 
     # Process results
     for result in results:
@@ -272,18 +428,22 @@ def get_race_telemetry(session, session_type="R"):
     if global_t_min is None or global_t_max is None:
         raise ValueError("No valid telemetry data found for any driver")
 
-    # 2. Create a timeline (start from zero)
-    timeline = np.arange(global_t_min, global_t_max, DT) - global_t_min
+    # 2. Create a timeline (start from zero), at a lower rate if the session is too long for the frame budget
+    timeline, fps = replay_timeline(global_t_min, global_t_max, max_frames)
+    if fps < FPS:
+        print(f"⚠️ Session exceeds {max_frames:,} frames at {FPS} FPS, sampling at {fps:.2f} FPS instead")
 
     # 3. Resample each driver's telemetry (x, y, gap) onto the common timeline
+    _report("resample")
     resampled_data = {}
     max_tyre_life_map = {}
 
     for code, data in driver_data.items():
         t = data["t"] - global_t_min  # Shift
 
-        # ensure sorted by time
-        order = np.argsort(t)
+        # ensure sorted by time; stable, so a lap's end sample stays ahead of the next lap's start
+        # sample at the same instant and lap/dist step at the boundary instead of ramping across it
+        order = np.argsort(t, kind="stable")
         t_sorted = t[order]
 
         # Vectorize all resampling in one operation for speed
@@ -310,7 +470,7 @@ def get_race_telemetry(session, session_type="R"):
             "t": timeline,
             "x": x_resampled,
             "y": y_resampled,
-            "dist": dist_resampled,  # race distance (metres since Lap 1 start)
+            "dist": dist_resampled,  # distance into the current lap (metres)
             "rel_dist": rel_dist_resampled,
             "lap": lap_resampled,
             "tyre": tyre_resampled,
@@ -400,138 +560,45 @@ def get_race_telemetry(session, session_type="R"):
         except Exception as e:
             print(f"Weather data could not be processed: {e}")
 
-    # 5. Build the frames + LIVE LEADERBOARD
-    frames = []
-    num_frames = len(timeline)
-
-    # Pre-extract data references for faster access
+    # 5. Build the columnar frame store + LIVE LEADERBOARD
+    _report("frame_build")
     driver_codes = list(resampled_data.keys())
-    driver_arrays = {code: resampled_data[code] for code in driver_codes}
 
-    for i in range(num_frames):
-        t = timeline[i]
-        snapshot = []
-        for code in driver_codes:
-            d = driver_arrays[code]
-            snapshot.append({
-                "code": code,
-                "dist": float(d["dist"][i]),
-                "x": float(d["x"][i]),
-                "y": float(d["y"][i]),
-                "lap": int(round(d["lap"][i])),
-                "rel_dist": float(d["rel_dist"][i]),
-                "tyre": float(d["tyre"][i]),
-                "tyre_life": float(d["tyre_life"][i]),
-                "speed": float(d['speed'][i]),
-                "gear": int(d['gear'][i]),
-                "drs": int(d['drs'][i]),
-                "throttle": float(d['throttle'][i]),
-                "brake": float(d['brake'][i]),
-            })
-
-        # If for some reason we have no drivers at this instant
-        if not snapshot:
-            continue
-
-        # 5b. Sort by race distance to get POSITIONS (1–20)
-        # Leader = largest race distance covered
-        snapshot.sort(key=lambda r: (r.get("lap", 0), r["dist"]), reverse=True)
+    lap_matrix = np.column_stack([resampled_data[code]["lap"] for code in driver_codes])
+    dist_matrix = np.column_stack([resampled_data[code]["dist"] for code in driver_codes])
 
-        leader = snapshot[0]
-        leader_lap = leader["lap"]
+    # 5b. Sort by lap and in-lap distance to get POSITIONS (1–20) for the whole timeline at once
+    # Leader = highest lap, then furthest into it
+    position_matrix = rank_positions(lap_matrix, dist_matrix)
 
-        # TODO: This 5c. step seems futile currently as we are not using gaps anywhere, and it doesn't even comput the gaps. I think I left this in when removing the "gaps" feature that was half-finished during the initial development.
+    for j, code in enumerate(driver_codes):
+        resampled_data[code]["position"] = position_matrix[:, j]
 
-        # 5c. Compute gap to car in front in SECONDS
-        frame_data = {}
+    frames = FrameStore.from_arrays(timeline, resampled_data, weather=weather_resampled)
 
-        for idx, car in enumerate(snapshot):
-            code = car["code"]
-            position = idx + 1
-
-            # include speed, gear, drs_active in frame driver dict
-            frame_data[code] = {
-                "x": car["x"],
-                "y": car["y"],
-                "dist": car["dist"],
-                "lap": car["lap"],
-                "rel_dist": round(car["rel_dist"], 4),
-                "tyre": car["tyre"],
-                "tyre_life": car["tyre_life"],
-                "position": position,
-                "speed": car["speed"],
-                "gear": car["gear"],
-                "drs": car["drs"],
-                "throttle": car["throttle"],
-                "brake": car["brake"],
-            }
-
-        weather_snapshot = {}
-        if weather_resampled:
-            try:
-                wt = weather_resampled
-                rain_val = wt["rainfall"][i] if wt.get("rainfall") is not None else 0.0
-                weather_snapshot = {
-                    "track_temp": float(wt["track_temp"][i])
-                    if wt.get("track_temp") is not None
-                    else None,
-                    "air_temp": float(wt["air_temp"][i])
-                    if wt.get("air_temp") is not None
-                    else None,
-                    "humidity": float(wt["humidity"][i])
-                    if wt.get("humidity") is not None
-                    else None,
-                    "wind_speed": float(wt["wind_speed"][i])
-                    if wt.get("wind_speed") is not None
-                    else None,
-                    "wind_direction": float(wt["wind_direction"][i])
-                    if wt.get("wind_direction") is not None
-                    else None,
-                    "rain_state": "RAINING" if rain_val and rain_val >= 0.5 else "DRY",
-                }
-            except Exception as e:
-                print(f"Failed to attach weather data to frame {i}: {e}")
-
-        frame_payload = {
-            "t": round(t, 3),
-            "lap": leader_lap,  # leader's lap at this time
-            "drivers": frame_data,
-        }
-        if weather_snapshot:
-            frame_payload["weather"] = weather_snapshot
-
-        frames.append(frame_payload)
     print("completed telemetry extraction...")
-    print("Saving to cache file...")
-    
-    # Use /tmp for computed data cache on Railway
-    computed_data_dir = '/tmp/computed_data' if os.path.exists('/tmp') else 'computed_data'
-    if not os.path.exists(computed_data_dir):
-        os.makedirs(computed_data_dir)
-    
-    cache_file = f"{computed_data_dir}/{event_name}_{cache_suffix}_telemetry.pkl"
-    print(f"💾 Caching to: {cache_file}")
-
-    # Save using pickle (10-100x faster than JSON)
-    with open(cache_file, "wb") as f:
-        pickle.dump({
-            "frames": frames,
-            "driver_colors": get_driver_colors(session),
-            "track_statuses": formatted_track_statuses,
-            "total_laps": int(max_lap_number),
-            "max_tyre_life": max_tyre_life_map,
-        }, f, protocol=pickle.HIGHEST_PROTOCOL)
-
-    print("Saved Successfully!")
-    print("The replay should begin in a new window shortly")
-    return {
+
+    telemetry = {
         "frames": frames,
+        "fps": fps,
         "driver_colors": get_driver_colors(session),
         "track_statuses": formatted_track_statuses,
         "total_laps": int(max_lap_number),
         "max_tyre_life": max_tyre_life_map,
+        "race_events": extract_race_events(frames, formatted_track_statuses, int(max_lap_number), fps),
     }
 
+    print(f"💾 Caching to: {cache_path}")
+    _report("cache_write")
+    try:
+        save_race_telemetry(cache_path, fingerprint, telemetry)
+        print("Saved Successfully!")
+    except OSError as e:
+        print(f"⚠️ Could not write telemetry cache: {e}")
+
+    print("The replay should begin in a new window shortly")
+    return telemetry
+
 
 def get_qualifying_results(session):
     # Extract the qualifying results and return a list of the drivers, their positions and their lap times in each qualifying segment
@@ -871,6 +938,7 @@ def get_driver_quali_telemetry(session, driver_code: str, quali_segment: str):
 def _process_quali_driver(args):
     """Process qualifying telemetry data for a single driver - must be top-level for multiprocessing"""
     session, driver_code = args
+    session = _worker_session_or(session)
     print(f"Getting qualifying telemetry for driver: {driver_code}")
 
     driver_telemetry_data = {}
@@ -951,14 +1019,11 @@ def get_quali_telemetry(session, session_type="Q"):
 
     telemetry_data = {}
 
-    driver_args = [(session, driver_codes[driver_no]) for driver_no in session.drivers]
+    driver_args = [(driver_codes[driver_no],) for driver_no in session.drivers]
 
     print(f"Processing {len(session.drivers)} drivers in parallel...")
 
-    num_processes = min(cpu_count(), len(session.drivers))
-
-    with Pool(processes=num_processes) as pool:
-        results = pool.map(_process_quali_driver, driver_args)
+    results = _map_drivers(_process_quali_driver, session, driver_args)
     for result in results:
         driver_code = result["driver_code"]
         telemetry_data[driver_code] = {
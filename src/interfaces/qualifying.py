@@ -3,7 +3,6 @@ import threading
 import time
 import numpy as np
 from src.ui_components import (
-    build_track_from_example_lap,
     LapTimeLeaderboardComponent,
     QualifyingSegmentSelectorComponent,
     RaceControlsComponent,
@@ -12,7 +11,7 @@ from src.ui_components import (
     ControlsPopupComponent,
     QualifyingLapTimeComponent,
 )
-from src.f1_data import get_driver_quali_telemetry
+from src.f1_data import get_driver_quali_telemetry, get_track_geometry
 from src.f1_data import FPS
 from src.lib.time import format_time
 
@@ -103,39 +102,23 @@ class QualifyingReplay(arcade.Window):
         self.controls_popup_comp.set_size(340, 250)
         self.controls_popup_comp.set_font_sizes(header_font_size=16, body_font_size=13)
 
-        # Build the track layout from an example lap
-
-        example_lap = None
-        for res in self.data['results']:
-            if res['Q3'] is not None:
-                example_lap = self.session.laps.pick_drivers(res['code']).pick_fastest()
-                break
-            elif res['Q2'] is not None:
-                example_lap = self.session.laps.pick_drivers(res['code']).pick_fastest()
-                break
-            elif res['Q1'] is not None:
-                example_lap = self.session.laps.pick_drivers(res['code']).pick_fastest()
-                break
-
         self.world_scale = 1.0
         self.tx = 0
         self.ty = 0
 
-        (self.plot_x_ref, self.plot_y_ref,
-         self.x_inner, self.y_inner,
-         self.x_outer, self.y_outer,
-         self.x_min, self.x_max,
-         self.y_min, self.y_max, self.drs_zones_xy) = build_track_from_example_lap(example_lap.get_telemetry())
-         
-        ref_points = self._interpolate_points(self.plot_x_ref, self.plot_y_ref, interp_points=4000)
-        self._ref_xs = np.array([p[0] for p in ref_points])
-        self._ref_ys = np.array([p[1] for p in ref_points])
-
-        # cumulative distances along the reference polyline (metres)
-        diffs = np.sqrt(np.diff(self._ref_xs)**2 + np.diff(self._ref_ys)**2)
-        self._ref_seg_len = diffs
-        self._ref_cumdist = np.concatenate(([0.0], np.cumsum(diffs)))
-        self._ref_total_length = float(self._ref_cumdist[-1]) if len(self._ref_cumdist) > 0 else 0.0
+        # Track layout of this circuit (cached on disk, built from this session's fastest lap the first time)
+        event = self.session.event
+        self.track_geometry = get_track_geometry(event.year, int(event['RoundNumber']), self.session)
+        geometry = self.track_geometry
+        self.plot_x_ref, self.plot_y_ref = geometry.x, geometry.y
+        self.x_inner, self.y_inner = geometry.x_inner, geometry.y_inner
+        self.x_outer, self.y_outer = geometry.x_outer, geometry.y_outer
+        self.x_min, self.x_max, self.y_min, self.y_max = geometry.bounds
+        self.drs_zones_xy = geometry.drs_zones
+
+        self._ref_xs, self._ref_ys = geometry.ref_x, geometry.ref_y
+        self._ref_cumdist = geometry.ref_cumdist
+        self._ref_total_length = geometry.total_length
 
         # Pre-calculate interpolated world points ONCE (optimization)
         self.world_inner_points = self._interpolate_points(self.x_inner, self.y_inner)
@@ -1,8 +1,13 @@
 import os
 import arcade
 import numpy as np
-from scipy.spatial import cKDTree
+from arcade.shape_list import ShapeElementList, create_line, create_line_strip
 from src.f1_data import FPS
+from src.lib.frame_store import FrameStore
+from src.lib.race_events import extract_race_events
+from src.lib.race_progress import RaceProgress
+from src.lib.track_status import STATUS_GREEN, TrackStatusTimeline, frame_timeline
+from src.lib.track_geometry import TrackGeometry
 from src.ui_components import (
     LeaderboardComponent, 
     WeatherComponent, 
@@ -12,9 +17,7 @@ from src.ui_components import (
     RaceControlsComponent,
     ControlsPopupComponent,
     SessionInfoComponent,
-    extract_race_events,
-    build_track_from_example_lap,
-    draw_finish_line
+    finish_line_segments
 )
 from src.tyre_degradation_integration import TyreDegradationIntegrator
 from src.services.stream import TelemetryStreamServer
@@ -23,13 +26,25 @@ from src.services.stream import TelemetryStreamServer
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 SCREEN_TITLE = "F1 Race Replay"
+# Track boundary colour per track status code (grey when green)
+TRACK_STATUS_COLORS = {
+    "2": (220, 180,   0),   # yellow / caution
+    "4": (180, 100,  30),   # safety car (darker brown)
+    "5": (200,  30,  30),   # red flag
+    "6": (200, 130,  50),   # virtual safety car / amber-brown
+    "7": (200, 130,  50),   # VSC ending
+}
+TRACK_COLOR = (150, 150, 150)
+DRS_COLOR = (0, 255, 0)  # Bright green for DRS zones
+CAR_RADIUS = 6
 PLAYBACK_SPEEDS = [0.1, 0.2, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0, 256.0]
 
 class F1RaceReplayWindow(arcade.Window):
     def __init__(self, frames, track_statuses, example_lap, drivers, title,
                  playback_speed=1.0, driver_colors=None, circuit_rotation=0.0,
                  left_ui_margin=340, right_ui_margin=260, total_laps=None, visible_hud=True,
-                 session_info=None, session=None, enable_telemetry=False):
+                 session_info=None, session=None, enable_telemetry=False, track_geometry=None,
+                 race_events=None, fps=FPS):
         # Set resizable to True so the user can adjust mid-sim
         super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, title, resizable=True)
         self.maximize()
@@ -51,13 +66,21 @@ class F1RaceReplayWindow(arcade.Window):
         self.frames = frames
         self.track_statuses = track_statuses
         self.n_frames = len(frames)
+        self.fps = fps  # frames per second of replay time (below FPS for frame-budgeted sessions)
+        # Track status of every frame, looked up once here instead of scanning the periods on every draw
+        self.track_status_timeline = TrackStatusTimeline(track_statuses)
+        timeline = frame_timeline(frames)
+        self.frame_statuses = self.track_status_timeline.frame_statuses(timeline) if timeline is not None else None
         self.drivers = list(drivers)
         self.playback_speed = PLAYBACK_SPEEDS[PLAYBACK_SPEEDS.index(playback_speed)] if playback_speed in PLAYBACK_SPEEDS else 1.0
         self.driver_colors = driver_colors or {}
         self.frame_index = 0.0  # use float for fractional-frame accumulation
         self.paused = False
         self.total_laps = total_laps
-        self.has_weather = any("weather" in frame for frame in frames) if frames else False
+        if isinstance(frames, FrameStore):
+            self.has_weather = frames.has_weather
+        else:
+            self.has_weather = any("weather" in frame for frame in frames) if frames else False
         self.visible_hud = visible_hud # If it displays HUD or not (leaderboard, controls, weather, etc)
 
         # Rotation (degrees) to apply to the whole circuit around its centre
@@ -136,60 +159,63 @@ class F1RaceReplayWindow(arcade.Window):
         self.is_forwarding = False
         self.was_paused_before_hold = False
         
-        # Extract race events for the progress bar
-        race_events = extract_race_events(frames, track_statuses, total_laps or 0)
+        # Race events for the progress bar: get_race_telemetry already built (and cached) them,
+        # only extract them here for callers that don't pass them in
+        if race_events is None:
+            race_events = extract_race_events(frames, track_statuses, total_laps or 0, self.fps)
         self.progress_bar_comp.set_race_data(
             total_frames=len(frames),
             total_laps=total_laps or 0,
             events=race_events
         )
 
-        # Build track geometry (Raw World Coordinates)
-        (self.plot_x_ref, self.plot_y_ref,
-         self.x_inner, self.y_inner,
-         self.x_outer, self.y_outer,
-         self.x_min, self.x_max,
-         self.y_min, self.y_max, self.drs_zones) = build_track_from_example_lap(example_lap)
-
-        # Build a dense reference polyline (used for projecting car (x,y) -> along-track distance)
-        ref_points = self._interpolate_points(self.plot_x_ref, self.plot_y_ref, interp_points=4000)
-        # store as numpy arrays for vectorized ops
-        self._ref_xs = np.array([p[0] for p in ref_points])
-        self._ref_ys = np.array([p[1] for p in ref_points])
-
-        # Calculate normals for the reference line
-        dx = np.gradient(self._ref_xs)
-        dy = np.gradient(self._ref_ys)
-        norm = np.sqrt(dx**2 + dy**2)
-        norm[norm == 0] = 1.0
-        self._ref_nx = -dy / norm
-        self._ref_ny = dx / norm
-
-        # Build KD-Tree for fast closest-point lookup
-        self.track_tree = cKDTree(np.column_stack((self._ref_xs, self._ref_ys)))
-
-        # Determine track winding using the shoelace formula to ensure normals point outwards.
-        # A positive area indicates counter-clockwise winding (normals point Left=Inside, so we flip).
-        # A negative area indicates clockwise winding (normals point Left=Outside, so we keep).
-        signed_area = np.sum(self._ref_xs[:-1] * self._ref_ys[1:] - self._ref_xs[1:] * self._ref_ys[:-1])
-        signed_area += (self._ref_xs[-1] * self._ref_ys[0] - self._ref_xs[0] * self._ref_ys[-1])
-        if signed_area > 0:
-            self._ref_nx = -self._ref_nx
-            self._ref_ny = -self._ref_ny
-
-        # cumulative distances along the reference polyline (metres)
-        diffs = np.sqrt(np.diff(self._ref_xs)**2 + np.diff(self._ref_ys)**2)
-        self._ref_seg_len = diffs
-        self._ref_cumdist = np.concatenate(([0.0], np.cumsum(diffs)))
-        self._ref_total_length = float(self._ref_cumdist[-1]) if len(self._ref_cumdist) > 0 else 0.0
+        # Track geometry (raw world coordinates): the circuit's cached one if the caller has it,
+        # otherwise computed from the example lap
+        self.track_geometry = track_geometry or TrackGeometry.from_lap_telemetry(example_lap)
+        geometry = self.track_geometry
+        self.plot_x_ref, self.plot_y_ref = geometry.x, geometry.y
+        self.x_inner, self.y_inner = geometry.x_inner, geometry.y_inner
+        self.x_outer, self.y_outer = geometry.x_outer, geometry.y_outer
+        self.x_min, self.x_max, self.y_min, self.y_max = geometry.bounds
+        self.drs_zones = geometry.drs_zones
+
+        # Dense reference polyline (used for projecting car (x,y) -> along-track distance),
+        # its outward normals, cumulative distances (metres) and KD-Tree for closest-point lookup
+        self._ref_xs, self._ref_ys = geometry.ref_x, geometry.ref_y
+        self._ref_nx, self._ref_ny = geometry.ref_nx, geometry.ref_ny
+        self._ref_cumdist = geometry.ref_cumdist
+        self._ref_total_length = geometry.total_length
+        # Projection of every car for one frame index, shared by on_draw and the telemetry broadcast
+        self._projection_frame = None
+        self._projection = {}
+        # Progress and running order per frame, filled a block of frames at a time (legacy frame lists
+        # are projected frame by frame instead)
+        self.race_progress = RaceProgress(frames, geometry) if isinstance(frames, FrameStore) else None
+        self._leaderboard_frame = None
 
         # Pre-calculate interpolated world points ONCE (optimization)
         self.world_inner_points = self._interpolate_points(self.x_inner, self.y_inner)
         self.world_outer_points = self._interpolate_points(self.x_outer, self.y_outer)
+        # DRS zones as (xs, ys) slices of the outer boundary, projected to the screen with it in update_scaling
+        self.world_drs_points = [
+            (self.x_outer[zone["start"]["index"]:zone["end"]["index"] + 1],
+             self.y_outer[zone["start"]["index"]:zone["end"]["index"] + 1])
+            for zone in self.drs_zones or []
+        ]
 
         # These will hold the actual screen coordinates to draw
         self.screen_inner_points = []
         self.screen_outer_points = []
+        self.screen_drs_points = []
+
+        # Retained-mode render layer: track, DRS zones and finish line are uploaded to the GPU once per
+        # resize (see update_scaling); cars are sprites moved in place every frame
+        self._track_shapes = {}  # boundary colour -> ShapeElementList, built on first use per track status
+        self._drs_shapes = None
+        self._finish_line_shapes = None
+        self.car_sprites = arcade.SpriteList()
+        self._car_sprites = {}  # driver code -> sprite in car_sprites
+        self._label_texts = {}  # driver code -> reusable arcade.Text
         
         # Scaling parameters (initialized to 0, calculated in update_scaling)
         self.world_scale = 1.0
@@ -224,29 +250,19 @@ class F1RaceReplayWindow(arcade.Window):
         if not hasattr(self, 'telemetry_stream') or not self.telemetry_stream:
             return
             
-        current_frame = self.frames[min(int(self.frame_index), len(self.frames) - 1)] if self.frames else None
+        frame_idx = min(int(self.frame_index), len(self.frames) - 1)
+        current_frame = self.frames[frame_idx] if self.frames else None
         
         # Get current track status
-        current_track_status = "GREEN"
-        if current_frame:
-            current_time = current_frame["t"]
-            for status in self.track_statuses:
-                if (current_time >= status["start_time"] and 
-                    (status["end_time"] is None or current_time <= status["end_time"])):
-                    current_track_status = status["status"]
-                    
+        current_track_status = self._track_status_at(frame_idx) if current_frame else STATUS_GREEN
+
         # Calculate leader info
         leader_code = ""
         leader_lap = 1
         if current_frame and "drivers" in current_frame:
-            driver_progress = {}
-            for code, pos in current_frame["drivers"].items():
-                x, y = pos["x"], pos["y"]
-                progress_m = self._project_to_reference(x, y)
-                driver_progress[code] = progress_m
-                
+            driver_progress = self._driver_progress(frame_idx, current_frame)
             if driver_progress:
-                leader_code = max(driver_progress.keys(), key=lambda k: driver_progress[k])
+                leader_code = next(iter(driver_progress))
                 leader_lap = current_frame["drivers"].get(leader_code, {}).get("lap", 1)
         
         # Format time
@@ -276,34 +292,51 @@ class F1RaceReplayWindow(arcade.Window):
         t_new = np.linspace(0, 1, interp_points)
         xs_i = np.interp(t_new, t_old, xs)
         ys_i = np.interp(t_new, t_old, ys)
-        return list(zip(xs_i, ys_i))
-
-    def _project_to_reference(self, x, y):
-        if self._ref_total_length == 0.0:
-            return 0.0
-
-        # Vectorized nearest-point lookup using KD-Tree (O(log N))
-        _, idx = self.track_tree.query([x, y])
-        idx = int(idx)
-
-        # For a slightly better estimate, optionally project onto the adjacent segment
-        if idx < len(self._ref_xs) - 1:
-
-            x1, y1 = self._ref_xs[idx], self._ref_ys[idx]
-            x2, y2 = self._ref_xs[idx+1], self._ref_ys[idx+1]
-            vx, vy = x2 - x1, y2 - y1
-            seg_len2 = vx*vx + vy*vy
-            if seg_len2 > 0:
-                t = ((x - x1) * vx + (y - y1) * vy) / seg_len2
-                t_clamped = max(0.0, min(1.0, t))
-                proj_x = x1 + t_clamped * vx
-                proj_y = y1 + t_clamped * vy
-                # distance along segment from x1,y1
-                seg_dist = np.sqrt((proj_x - x1)**2 + (proj_y - y1)**2)
-                return float(self._ref_cumdist[idx] + seg_dist)
-
-        # Fallback: return the cumulative distance at the closest dense sample
-        return float(self._ref_cumdist[idx])
+        return xs_i, ys_i
+
+    def _project_frame(self, idx, frame):
+        """Per driver (progress in metres since race start, normal x, normal y) for frame ``idx``.
+
+        All cars are projected with one batched KD-tree query; the result is
+        cached until the frame index changes.
+        """
+        if self._projection_frame == idx:
+            return self._projection
+        drivers = frame.get("drivers", {}) if frame else {}
+        codes = list(drivers)
+        xs = np.fromiter((drivers[c].get("x", 0.0) for c in codes), dtype=float, count=len(codes))
+        ys = np.fromiter((drivers[c].get("y", 0.0) for c in codes), dtype=float, count=len(codes))
+        laps = np.fromiter((self._lap_number(drivers[c].get("lap", 1)) for c in codes), dtype=float, count=len(codes))
+        projected_m, nx, ny = self.track_geometry.project_many(xs, ys)
+        # progress in metres since race start: (lap-1) * lap_length + projected_m
+        progress_m = (np.maximum(laps, 1) - 1) * self._ref_total_length + projected_m
+        self._projection = {
+            code: (float(progress_m[k]), float(nx[k]), float(ny[k])) for k, code in enumerate(codes)
+        }
+        self._projection_frame = idx
+        return self._projection
+
+    def _track_status_at(self, idx):
+        """FastF1 track status code ("1" green, "2" yellow, ...) at frame ``idx``."""
+        return str(self.frame_statuses[idx])
+
+    def _driver_progress(self, idx, frame):
+        """Progress in metres per driver at frame ``idx``, ordered leader first."""
+        if self.race_progress is not None:
+            progress = self.race_progress.progress(idx)
+            codes = self.race_progress.codes
+            return {codes[j]: float(progress[j]) for j in self.race_progress.order(idx)}
+        projection = self._project_frame(idx, frame)
+        ordered = sorted(projection.items(), key=lambda item: item[1][0], reverse=True)
+        return {code: progress_m for code, (progress_m, _, _) in ordered}
+
+    @staticmethod
+    def _lap_number(lap_raw):
+        # parse lap defensively
+        try:
+            return int(lap_raw)
+        except Exception:
+            return 1
 
     def update_scaling(self, screen_w, screen_h):
         """
@@ -315,27 +348,16 @@ class F1RaceReplayWindow(arcade.Window):
         world_cx = (self.x_min + self.x_max) / 2
         world_cy = (self.y_min + self.y_max) / 2
 
-        def _rotate_about_center(x, y):
-            # Translate to centre, rotate, translate back
-            tx = x - world_cx
-            ty = y - world_cy
-            rx = tx * self._cos_rot - ty * self._sin_rot
-            ry = tx * self._sin_rot + ty * self._cos_rot
-            return rx + world_cx, ry + world_cy
-
         # Build rotated extents from inner/outer world points
-        rotated_points = []
-        for x, y in self.world_inner_points:
-            rotated_points.append(_rotate_about_center(x, y))
-        for x, y in self.world_outer_points:
-            rotated_points.append(_rotate_about_center(x, y))
-
-        xs = [p[0] for p in rotated_points]
-        ys = [p[1] for p in rotated_points]
-        world_x_min = min(xs) if xs else self.x_min
-        world_x_max = max(xs) if xs else self.x_max
-        world_y_min = min(ys) if ys else self.y_min
-        world_y_max = max(ys) if ys else self.y_max
+        rotated_xs, rotated_ys = self._rotate_about_center(
+            np.concatenate((self.world_inner_points[0], self.world_outer_points[0])),
+            np.concatenate((self.world_inner_points[1], self.world_outer_points[1])),
+        )
+        if len(rotated_xs):
+            world_x_min, world_x_max = float(rotated_xs.min()), float(rotated_xs.max())
+            world_y_min, world_y_max = float(rotated_ys.min()), float(rotated_ys.max())
+        else:
+            world_x_min, world_x_max, world_y_min, world_y_max = self.x_min, self.x_max, self.y_min, self.y_max
 
         world_w = max(1.0, world_x_max - world_x_min)
         world_h = max(1.0, world_y_max - world_y_min)
@@ -360,9 +382,70 @@ class F1RaceReplayWindow(arcade.Window):
         self.tx = screen_cx - self.world_scale * world_cx
         self.ty = screen_cy - self.world_scale * world_cy
 
-        # Update the polyline screen coordinates based on new scale
-        self.screen_inner_points = [self.world_to_screen(x, y) for x, y in self.world_inner_points]
-        self.screen_outer_points = [self.world_to_screen(x, y) for x, y in self.world_outer_points]
+        # Update the polyline screen coordinates based on new scale (whole arrays at once)
+        self.screen_inner_points = self._polyline_to_screen(*self.world_inner_points)
+        self.screen_outer_points = self._polyline_to_screen(*self.world_outer_points)
+        self.screen_drs_points = [self._polyline_to_screen(xs, ys) for xs, ys in self.world_drs_points]
+        self._build_static_shapes()
+
+    def _rotate_about_center(self, xs, ys):
+        """Rotate world coordinate arrays by the circuit rotation around the track centre."""
+        if not self._rot_rad:
+            return xs, ys
+        world_cx = (self.x_min + self.x_max) / 2
+        world_cy = (self.y_min + self.y_max) / 2
+        tx = xs - world_cx
+        ty = ys - world_cy
+        return (tx * self._cos_rot - ty * self._sin_rot + world_cx,
+                tx * self._sin_rot + ty * self._cos_rot + world_cy)
+
+    def _polyline_to_screen(self, xs, ys):
+        """Vectorised world_to_screen for a polyline, as the list of (x, y) tuples arcade draws."""
+        rx, ry = self._rotate_about_center(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+        sx = self.world_scale * rx + self.tx
+        sy = self.world_scale * ry + self.ty
+        return list(zip(sx.tolist(), sy.tolist()))
+
+    def _build_static_shapes(self):
+        """Rebuild the GPU shape lists of everything that only moves when the window is resized."""
+        self._track_shapes = {}
+
+        # DRS Zones (green segments on outer track edge)
+        self._drs_shapes = ShapeElementList()
+        for drs_outer_points in self.screen_drs_points:
+            if len(drs_outer_points) > 1:
+                self._drs_shapes.append(create_line_strip(drs_outer_points, DRS_COLOR, 6))
+
+        # Checkered finish line across the start of the boundaries
+        self._finish_line_shapes = ShapeElementList()
+        if self.screen_inner_points and self.screen_outer_points:
+            for x1, y1, x2, y2, color in finish_line_segments(self.screen_inner_points[0], self.screen_outer_points[0]):
+                self._finish_line_shapes.append(create_line(x1, y1, x2, y2, color, 6))
+
+    def _track_shape_list(self, color):
+        shapes = self._track_shapes.get(color)
+        if shapes is None:
+            shapes = ShapeElementList()
+            for points in (self.screen_inner_points, self.screen_outer_points):
+                if len(points) > 1:
+                    shapes.append(create_line_strip(points, color, 4))
+            self._track_shapes[color] = shapes
+        return shapes
+
+    def _car_sprite(self, code, color):
+        sprite = self._car_sprites.get(code)
+        if sprite is None:
+            sprite = arcade.SpriteCircle(CAR_RADIUS, color)
+            self._car_sprites[code] = sprite
+            self.car_sprites.append(sprite)
+        return sprite
+
+    def _label_text(self, code, color):
+        text = self._label_texts.get(code)
+        if text is None:
+            text = arcade.Text(code, 0, 0, color, 10, anchor_y="center", bold=True)
+            self._label_texts[code] = text
+        return text
 
     def on_resize(self, width, height):
         """Called automatically by Arcade when window is resized."""
@@ -422,58 +505,14 @@ class F1RaceReplayWindow(arcade.Window):
         # 2. Draw Track (using pre-calculated screen points)
         idx = min(int(self.frame_index), self.n_frames - 1)
         frame = self.frames[idx]
-        current_time = frame["t"]
-        current_track_status = "GREEN"
-        for status in self.track_statuses:
-            if status['start_time'] <= current_time and (status['end_time'] is None or current_time < status['end_time']):
-                current_track_status = status['status']
-                break
-
-        # Map track status -> colour (R,G,B)
-        STATUS_COLORS = {
-            "GREEN": (150, 150, 150),    # normal grey
-            "YELLOW": (220, 180,   0),   # caution
-            "RED": (200,  30,  30),      # red-flag
-            "VSC": (200, 130,  50),      # virtual safety car / amber-brown
-            "SC": (180, 100,  30),       # safety car (darker brown)
-        }
-        track_color = STATUS_COLORS.get("GREEN", (150, 150, 150))
-
-        if current_track_status == "2":
-            track_color = STATUS_COLORS.get("YELLOW")
-        elif current_track_status == "4":
-            track_color = STATUS_COLORS.get("SC")
-        elif current_track_status == "5":
-            track_color = STATUS_COLORS.get("RED")
-        elif current_track_status == "6" or current_track_status == "7":
-            track_color = STATUS_COLORS.get("VSC")
-            
-        if len(self.screen_inner_points) > 1:
-            arcade.draw_line_strip(self.screen_inner_points, track_color, 4)
-        if len(self.screen_outer_points) > 1:
-            arcade.draw_line_strip(self.screen_outer_points, track_color, 4)
-        
-        # 2.5 Draw DRS Zones (green segments on outer track edge)
-        if hasattr(self, 'drs_zones') and self.drs_zones and self.toggle_drs_zones:
-            drs_color = (0, 255, 0)  # Bright green for DRS zones
-            
-            for _, zone in enumerate(self.drs_zones):
-                start_idx = zone["start"]["index"]
-                end_idx = zone["end"]["index"]
-                
-                # Extract the outer track points for this DRS zone segment
-                drs_outer_points = []
-                for i in range(start_idx, min(end_idx + 1, len(self.x_outer))):
-                    x = self.x_outer.iloc[i]
-                    y = self.y_outer.iloc[i]
-                    sx, sy = self.world_to_screen(x, y)
-                    drs_outer_points.append((sx, sy))
-                
-                # Draw the DRS zone segment
-                if len(drs_outer_points) > 1:
-                    arcade.draw_line_strip(drs_outer_points, drs_color, 6)
+        current_track_status = self._track_status_at(idx)
+
+        # Boundaries in the track status colour, then DRS zones and the finish line (prebuilt shape lists)
+        self._track_shape_list(TRACK_STATUS_COLORS.get(current_track_status, TRACK_COLOR)).draw()
+        if self.toggle_drs_zones:
+            self._drs_shapes.draw()
+        self._finish_line_shapes.draw()
 
-        draw_finish_line(self)
         # 3. Draw Cars
         frame = self.frames[idx]
         
@@ -482,21 +521,22 @@ class F1RaceReplayWindow(arcade.Window):
         if not selected_drivers and getattr(self, "selected_driver", None):
             selected_drivers = [self.selected_driver]
 
+        # Move every car sprite, hide cars missing from this frame (legacy frame lists only)
+        for sprite in self._car_sprites.values():
+            sprite.visible = False
+
         for i, (code, pos) in enumerate(frame["drivers"].items()):
             sx, sy = self.world_to_screen(pos["x"], pos["y"])
             color = self.driver_colors.get(code, arcade.color.WHITE)
+            sprite = self._car_sprite(code, color)
+            sprite.position = (sx, sy)
+            sprite.visible = True
             
             is_selected = code in selected_drivers
             
             if self.show_driver_labels or is_selected:
-                # Find closest point index on reference track (Optimized KD-Tree)
-                _, idx = self.track_tree.query([pos["x"], pos["y"]])
-                idx = int(idx)
-                
-                # Get normal vector in world space
-                nx = self._ref_nx[idx]
-
-                ny = self._ref_ny[idx]
+                # Normal vector in world space at the closest point on the reference track
+                _, nx, ny = self._project_frame(idx, frame)[code]
                 
                 # Rotate normal to screen space
                 if self._rot_rad:
@@ -512,36 +552,23 @@ class F1RaceReplayWindow(arcade.Window):
                 
                 arcade.draw_line(sx, sy, lx, ly, color, 1)
                 
-                anchor_x = "left" if snx >= 0 else "right"
+                label = self._label_text(code, color)
+                label.anchor_x = "left" if snx >= 0 else "right"
                 text_padding = 3 if snx >= 0 else -3
-                arcade.draw_text(code, lx + text_padding, ly, color, 10, anchor_x=anchor_x, anchor_y="center", bold=True)
+                label.position = (lx + text_padding, ly)
+                label.draw()
 
-            arcade.draw_circle_filled(sx, sy, 6, color)
+        self.car_sprites.draw()
         
         # --- UI ELEMENTS (Dynamic Positioning) ---
         
         # Determine Leader info using projected along-track distance (more robust than dist)
         # Use the progress metric in metres for each driver and use that to order the leaderboard.
-        driver_progress = {}
-        for code, pos in frame["drivers"].items():
-            # parse lap defensively
-            lap_raw = pos.get("lap", 1)
-            try:
-                lap = int(lap_raw)
-            except Exception:
-                lap = 1
-
-            # Project (x,y) to reference and combine with lap count
-            projected_m = self._project_to_reference(pos.get("x", 0.0), pos.get("y", 0.0))
+        driver_progress = self._driver_progress(idx, frame)
 
-            # progress in metres since race start: (lap-1) * lap_length + projected_m
-            progress_m = float((max(lap, 1) - 1) * self._ref_total_length + projected_m)
-
-            driver_progress[code] = progress_m
-
-        # Leader is the one with greatest progress_m
+        # Leader is the one with greatest progress_m (first in order)
         if driver_progress:
-            leader_code = max(driver_progress, key=lambda c: driver_progress[c])
+            leader_code = next(iter(driver_progress))
             leader_lap = frame["drivers"][leader_code].get("lap", 1)
         else:
             leader_code = None
@@ -591,16 +618,15 @@ class F1RaceReplayWindow(arcade.Window):
         # optionally expose weather_bottom for driver info layout
         self.weather_bottom = self.height - 170 - 130 if (weather_info or self.has_weather) else None
 
-        # Draw leaderboard via component
-        driver_list = []
-        for code, pos in frame["drivers"].items():
-            color = self.driver_colors.get(code, arcade.color.WHITE)
-            progress_m = driver_progress.get(code, float(pos.get("dist", 0.0)))
-            driver_list.append((code, color, pos, progress_m))
-        driver_list.sort(key=lambda x: x[3], reverse=True)
-
-        self.last_leaderboard_order = [c for c, _, _, _ in driver_list]
-        self.leaderboard_comp.set_entries(driver_list)
+        # Draw leaderboard via component (entries only change with the frame, not while paused)
+        if self._leaderboard_frame != idx:
+            driver_list = [
+                (code, self.driver_colors.get(code, arcade.color.WHITE), frame["drivers"][code], progress_m)
+                for code, progress_m in driver_progress.items() if code in frame["drivers"]
+            ]
+            self.last_leaderboard_order = [c for c, _, _, _ in driver_list]
+            self.leaderboard_comp.set_entries(driver_list)
+            self._leaderboard_frame = idx
         self.leaderboard_comp.draw(self)
         # expose rects for existing hit test compatibility if needed
         self.leaderboard_rects = self.leaderboard_comp.rects
@@ -631,16 +657,16 @@ class F1RaceReplayWindow(arcade.Window):
         
         seek_speed = 3.0 * max(1.0, self.playback_speed) # Multiplier for seeking speed, scales with current playback speed
         if self.is_rewinding:
-            self.frame_index = max(0.0, self.frame_index - delta_time * FPS * seek_speed)
+            self.frame_index = max(0.0, self.frame_index - delta_time * self.fps * seek_speed)
             self.race_controls_comp.flash_button('rewind')
         elif self.is_forwarding:
-            self.frame_index = min(self.n_frames - 1, self.frame_index + delta_time * FPS * seek_speed)
+            self.frame_index = min(self.n_frames - 1, self.frame_index + delta_time * self.fps * seek_speed)
             self.race_controls_comp.flash_button('forward')
 
         if self.paused:
             return
 
-        self.frame_index += delta_time * FPS * self.playback_speed
+        self.frame_index += delta_time * self.fps * self.playback_speed
         
         if self.frame_index >= self.n_frames:
             self.frame_index = float(self.n_frames - 1)
@@ -0,0 +1,368 @@
+"""
+Compact binary encoding of replay frames for the web viewer.
+
+The JSON ``frame_update`` repeats every key name and driver colour in every
+frame (~3-4 KB for a 20-car grid). Clients that opt in get ``frame_bin``
+instead: static per-session metadata (driver order, codes, colours) is sent
+once in ``initial_load_complete`` and each frame is a fixed little-endian
+layout that ``static/viewer.js`` reads with a ``DataView``:
+
+    header   16 bytes  uint32 frame, uint32 total_frames, float32 time,
+                       uint8 n_drivers, uint8 flags, uint8 version,
+                       uint8 track_status (FastF1 code, 0 = not known)
+    drivers  24 bytes  per driver, in the static driver order (DRIVER_RECORD)
+    weather  20 bytes  only if flags & FLAG_WEATHER: float32 track_temp,
+                       air_temp, humidity, wind_speed (NaN = unknown),
+                       uint8 rain_state (1 = raining), 3 bytes padding
+
+Rows for FrameStore-backed replays are packed straight from the frame block
+with NumPy, without building the per-frame dicts.
+"""
+
+import struct
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.lib.frame_store import FrameStore
+
+PROTOCOL_VERSION = 2
+
+HEADER = struct.Struct("<IIfBBBB")
+WEATHER = struct.Struct("<ffffB3x")
+
+FLAG_WEATHER = 0x01
+
+# Per-driver record flags
+DRIVER_OUT = 0x01
+DRIVER_ABSENT = 0x02  # driver has no data in this frame (legacy frame lists only)
+
+TYRE_UNKNOWN = 255
+
+DRIVER_RECORD = np.dtype([
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("speed", "<f4"),
+    ("tyre_life", "<f4"),
+    ("throttle", "u1"),  # percent
+    ("brake", "u1"),  # 0-1 scaled to 0-100
+    ("gear", "u1"),
+    ("drs", "u1"),
+    ("position", "u1"),
+    ("tyre", "u1"),  # compound, TYRE_UNKNOWN if f1_data didn't know it (-1)
+    ("lap", "u1"),
+    ("flags", "u1"),
+])
+
+assert DRIVER_RECORD.itemsize == 24 and HEADER.size == 16 and WEATHER.size == 20
+
+def driver_order(frames) -> List[str]:
+    """Static driver order used for the records of every frame."""
+    if isinstance(frames, FrameStore):
+        return list(frames.codes)
+    return list(frames[0].get("drivers", {}).keys()) if len(frames) else []
+
+
+def hex_color(rgb: Sequence[int]) -> str:
+    return '#{:02x}{:02x}{:02x}'.format(*rgb)
+
+
+def driver_metadata(codes: Sequence[str], driver_colors: dict) -> List[dict]:
+    """``[{code, color}]`` in record order, sent once with initial_load_complete."""
+    return [
+        {"code": code, "color": hex_color(driver_colors.get(code, (128, 128, 128)))}
+        for code in codes
+    ]
+
+
+# Record columns by storage type; brake is stored 0-1 and sent as 0-100
+_F32_FIELDS = ("x", "y", "speed", "tyre_life")
+_U8_FIELDS = ("throttle", "brake", "gear", "drs", "position", "tyre", "lap")
+_U8_SCALE = np.array([1, 100, 1, 1, 1, 1, 1], dtype=np.float32)
+
+
+def _u8(values) -> np.ndarray:
+    return np.clip(np.rint(np.nan_to_num(values)), 0, 255)
+
+
+def _tyre_u8(values) -> np.ndarray:
+    # Negative compounds would clip to 0 (SOFT), keep them distinguishable instead
+    values = np.asarray(values)
+    return np.where(values < 0, TYRE_UNKNOWN, _u8(values))
+
+
+@lru_cache(maxsize=None)
+def _column_indices(fields: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    index = {name: k for k, name in enumerate(fields)}
+    return (np.array([index[n] for n in _F32_FIELDS]), np.array([index[n] for n in _U8_FIELDS]))
+
+
+def _pack_records(block: np.ndarray, fields: Tuple[str, ...]) -> np.ndarray:
+    """Pack a (..., drivers, fields) slice of a frame block into (..., drivers) DRIVER_RECORDs."""
+    # Gather each storage type in one fancy-index and write it straight into the packed 24-byte rows
+    f32_idx, u8_idx = _column_indices(fields)
+    words = np.empty(block.shape[:-1] + (DRIVER_RECORD.itemsize // 4,), dtype="<f4")
+    words[..., :4] = block[..., f32_idx]
+    raw = words.view(np.uint8)
+    u8 = block[..., u8_idx] * _U8_SCALE
+    raw[..., 16:23] = _u8(u8)
+    raw[..., 21] = _tyre_u8(u8[..., _U8_FIELDS.index("tyre")])
+    raw[..., 23] = 0
+    return raw.view(DRIVER_RECORD)[..., 0]
+
+
+def _records_from_store(frames: FrameStore, i: int) -> np.ndarray:
+    return _pack_records(frames.data[i], frames.fields)
+
+
+def _records_from_dict(frame: dict, codes: Sequence[str]) -> np.ndarray:
+    drivers = frame.get("drivers", {})
+    rec = np.zeros(len(codes), dtype=DRIVER_RECORD)
+    for j, code in enumerate(codes):
+        d = drivers.get(code)
+        if d is None:
+            rec[j]["flags"] = DRIVER_ABSENT
+            continue
+        rec[j] = (
+            d.get("x", 0), d.get("y", 0), d.get("speed", 0), d.get("tyre_life", 0),
+            _u8(d.get("throttle", 0)), _u8(d.get("brake", 0) * 100),
+            _u8(d.get("gear", 0)), _u8(d.get("drs", 0)),
+            _u8(d.get("pos", d.get("position", 0))), _tyre_u8(d.get("tyre", 0)), _u8(d.get("lap", 1)),
+            DRIVER_OUT if d.get("is_out") else 0,
+        )
+    return rec
+
+
+def _weather_block(weather: Optional[dict]) -> bytes:
+    if not weather:
+        return b""
+
+    def _f(name):
+        value = weather.get(name)
+        return float(value) if value is not None else float("nan")
+
+    rain = 1 if weather.get("rain_state") == "RAINING" else 0
+    return WEATHER.pack(_f("track_temp"), _f("air_temp"), _f("humidity"), _f("wind_speed"), rain)
+
+
+def encode_frame(frames, i: int, codes: Sequence[str], total_frames: Optional[int] = None,
+                 track_status: int = 0) -> bytes:
+    """Encode frame ``i`` of a FrameStore (or legacy list of frame dicts)."""
+    if isinstance(frames, FrameStore):
+        rec = _records_from_store(frames, i)
+        t = float(frames.t[i])
+        weather = frames.weather_at(i)
+    else:
+        frame = frames[i]
+        rec = _records_from_dict(frame, codes)
+        t = float(frame.get("t", 0))
+        weather = frame.get("weather")
+
+    weather_bytes = _weather_block(weather)
+    flags = FLAG_WEATHER if weather_bytes else 0
+    total = len(frames) if total_frames is None else total_frames
+    header = HEADER.pack(i, total, t, len(codes), flags, PROTOCOL_VERSION, track_status)
+    return header + rec.tobytes() + weather_bytes
+
+
+
+# ----------------------------------------------------------------------
+# Frame-range chunks (/api/frames)
+# ----------------------------------------------------------------------
+#
+# A chunk is a 16-byte CHUNK_HEADER (uint32 start, count, stride,
+# frame_size) followed by ``count`` frames of ``frame_size`` bytes, each
+# byte-for-byte what ``encode_frame`` produces for that frame index.
+
+CHUNK_HEADER = struct.Struct("<IIII")
+
+HEADER_DTYPE = np.dtype([
+    ("frame", "<u4"), ("total_frames", "<u4"), ("time", "<f4"),
+    ("n_drivers", "u1"), ("flags", "u1"), ("version", "u1"), ("track_status", "u1"),
+])
+WEATHER_DTYPE = np.dtype([
+    ("track_temp", "<f4"), ("air_temp", "<f4"), ("humidity", "<f4"), ("wind_speed", "<f4"),
+    ("rain_state", "u1"), ("pad", "V3"),
+])
+
+assert HEADER_DTYPE.itemsize == HEADER.size and WEATHER_DTYPE.itemsize == WEATHER.size
+
+
+def chunk_indices(n_frames: int, start: int, count: int, stride: int) -> np.ndarray:
+    start = max(0, min(start, n_frames))
+    return np.arange(start, min(n_frames, start + count * stride), stride)
+
+
+def encode_chunk(frames, start: int, count: int, stride: int, codes: Sequence[str],
+                 total_frames: Optional[int] = None, track_statuses: Optional[np.ndarray] = None) -> bytes:
+    """Encode ``count`` frames from ``start`` every ``stride`` frames into one chunk.
+
+    ``track_statuses`` is the per-frame uint8 status code array (see
+    ``TrackStatusTimeline.frame_statuses``), 0 in every header if omitted.
+    """
+    total = len(frames) if total_frames is None else total_frames
+    idx = chunk_indices(len(frames), start, count, stride)
+
+    if not isinstance(frames, FrameStore):
+        encoded = [
+            encode_frame(frames, int(i), codes, total, int(track_statuses[i]) if track_statuses is not None else 0)
+            for i in idx
+        ]
+        frame_size = max((len(e) for e in encoded), default=0)
+        body = b"".join(e.ljust(frame_size, b"\0") for e in encoded)
+        return CHUNK_HEADER.pack(int(idx[0]) if len(idx) else start, len(idx), stride, frame_size) + body
+
+    k, n_drivers = len(idx), frames.n_drivers
+    weather = frames.weather
+    layout = [("header", HEADER_DTYPE), ("drivers", DRIVER_RECORD, (n_drivers,))]
+    if weather:
+        layout.append(("weather", WEATHER_DTYPE))
+    out = np.zeros(k, dtype=np.dtype(layout))
+
+    header = out["header"]
+    header["frame"] = idx
+    header["total_frames"] = total
+    header["time"] = frames.t[idx]
+    header["n_drivers"] = n_drivers
+    header["flags"] = FLAG_WEATHER if weather else 0
+    header["version"] = PROTOCOL_VERSION
+    if track_statuses is not None:
+        header["track_status"] = track_statuses[idx]
+
+    out["drivers"] = _pack_records(frames.data[idx], frames.fields)
+
+    if weather:
+        block = out["weather"]
+        for name in ("track_temp", "air_temp", "humidity", "wind_speed"):
+            block[name] = weather[name][idx] if name in weather else np.nan
+        if "rainfall" in weather:
+            block["rain_state"] = weather["rainfall"][idx] >= 0.5
+
+    return CHUNK_HEADER.pack(int(idx[0]) if k else start, k, stride, out.dtype.itemsize) + out.tobytes()
+
+# ----------------------------------------------------------------------
+# Delta streaming
+# ----------------------------------------------------------------------
+#
+# ``frame_delta`` messages use the same 16-byte header (so every message
+# carries the current track status). A keyframe
+# (FLAG_KEYFRAME) carries full driver records exactly like ``frame_bin``.
+# Other frames carry, per driver in static order, a uint16 mask of changed
+# fields followed by just those fields in DELTA_FIELDS order; x/y travel as
+# int16 deltas in XY_QUANTUM metres. The encoder mirrors the client's
+# reconstructed state, so quantisation error never accumulates. Weather is
+# only included when it changed.
+
+FLAG_KEYFRAME = 0x02
+
+XY_QUANTUM = 0.1  # metres per x/y delta step
+DELTA_KEYFRAME_INTERVAL = 50  # emitted frames between keyframes
+
+# (mask bit, record field(s), struct format of the value(s) on the wire)
+DELTA_FIELDS = (
+    (0x0001, ("x", "y"), "<hh"),
+    (0x0002, ("speed",), "<f"),
+    (0x0004, ("tyre_life",), "<f"),
+    (0x0008, ("throttle",), "<B"),
+    (0x0010, ("brake",), "<B"),
+    (0x0020, ("gear",), "<B"),
+    (0x0040, ("drs",), "<B"),
+    (0x0080, ("position",), "<B"),
+    (0x0100, ("tyre",), "<B"),
+    (0x0200, ("lap",), "<B"),
+    (0x0400, ("flags",), "<B"),
+)
+_DELTA_STRUCTS = tuple((bit, names, struct.Struct(fmt)) for bit, names, fmt in DELTA_FIELDS)
+_MASK = struct.Struct("<H")
+_INT16_MAX = 32767
+
+
+class DeltaEncoder:
+    """Per-client delta state for the ``frame_delta`` stream."""
+
+    def __init__(self, keyframe_interval: int = DELTA_KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = 0
+        self.deltas = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Force the next frame to be a keyframe (new client, seek, ...)."""
+        self._records = None
+        self._xy = None  # client's reconstructed x/y (float64, same arithmetic as viewer.js)
+        self._weather = None
+        self._since_keyframe = 0
+
+    def encode(self, frames, i: int, codes: Sequence[str], total_frames: Optional[int] = None,
+               track_status: int = 0) -> bytes:
+        if isinstance(frames, FrameStore):
+            rec = _records_from_store(frames, i)
+            t = float(frames.t[i])
+            weather = frames.weather_at(i)
+        else:
+            frame = frames[i]
+            rec = _records_from_dict(frame, codes)
+            t = float(frame.get("t", 0))
+            weather = frame.get("weather")
+
+        weather_bytes = _weather_block(weather)
+        total = len(frames) if total_frames is None else total_frames
+
+        body = None
+        if (self._records is not None and len(rec) == len(self._records)
+                and self._since_keyframe < self.keyframe_interval):
+            body = self._delta_body(rec)
+
+        if body is None:
+            self._records = rec.copy()
+            self._xy = np.stack([rec["x"], rec["y"]], axis=1).astype(np.float64)
+            self._since_keyframe = 0
+            self.keyframes += 1
+            flags = FLAG_KEYFRAME | (FLAG_WEATHER if weather_bytes else 0)
+            body = rec.tobytes() + weather_bytes
+        else:
+            self._since_keyframe += 1
+            self.deltas += 1
+            flags = 0
+            if weather_bytes and weather_bytes != self._weather:
+                flags |= FLAG_WEATHER
+                body += weather_bytes
+
+        self._weather = weather_bytes
+        header = HEADER.pack(i, total, t, len(codes), flags, PROTOCOL_VERSION, track_status)
+        return header + body
+
+    def _delta_body(self, rec: np.ndarray) -> Optional[bytes]:
+        """Changed-field body, or None if an x/y jump doesn't fit the int16 deltas."""
+        target = np.stack([rec["x"], rec["y"]], axis=1).astype(np.float64)
+        steps = np.rint((target - self._xy) / XY_QUANTUM)
+        if np.isnan(steps).any() or np.abs(steps).max(initial=0) > _INT16_MAX:
+            return None
+        steps = steps.astype(np.int16)
+
+        prev = self._records
+        changed = {
+            names: (rec[names[0]] != prev[names[0]])
+            for _, names, _ in DELTA_FIELDS[1:]
+        }
+        moved = steps.any(axis=1)
+
+        parts = []
+        for j in range(len(rec)):
+            mask = 0
+            values = []
+            if moved[j]:
+                mask |= 0x0001
+                values.append(_DELTA_STRUCTS[0][2].pack(int(steps[j, 0]), int(steps[j, 1])))
+            for bit, names, packer in _DELTA_STRUCTS[1:]:
+                if changed[names][j]:
+                    mask |= bit
+                    values.append(packer.pack(rec[names[0]][j].item()))
+            parts.append(_MASK.pack(mask))
+            parts.extend(values)
+
+        # Mirror the viewer: x += dx * XY_QUANTUM in float64
+        self._xy += steps * XY_QUANTUM
+        self._records = rec.copy()
+        return b"".join(parts)
@@ -0,0 +1,249 @@
+"""
+Columnar storage for race replay frames.
+
+The race telemetry builder used to expand every resampled array into one
+Python dict per frame per driver. FrameStore keeps the same data as a single
+contiguous (frames x drivers x fields) NumPy block and only builds the
+familiar frame dicts on demand, so existing consumers keep working while the
+memory footprint stays proportional to the raw arrays.
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+# Per-driver channels stored in the block, in column order
+FRAME_FIELDS = (
+    "x",
+    "y",
+    "dist",
+    "rel_dist",
+    "lap",
+    "tyre",
+    "tyre_life",
+    "speed",
+    "gear",
+    "drs",
+    "throttle",
+    "brake",
+    "position",
+)
+
+# Session-wide channels resampled onto the same timeline
+WEATHER_FIELDS = (
+    "track_temp",
+    "air_temp",
+    "humidity",
+    "wind_speed",
+    "wind_direction",
+    "rainfall",
+)
+
+
+def rank_positions(lap: np.ndarray, dist: np.ndarray) -> np.ndarray:
+    """Compute race positions for every frame in one batched pass.
+
+    Drivers are ranked by (rounded lap, distance into that lap), highest first. The
+    sort is stable, so ties keep driver column order exactly like the old
+    per-frame ``list.sort(reverse=True)``.
+
+    Args:
+        lap: (frames x drivers) array of (interpolated) lap numbers.
+        dist: (frames x drivers) array of distance into the current lap.
+
+    Returns:
+        (frames x drivers) int array of 1-based positions.
+    """
+    lap = np.round(np.asarray(lap, dtype=np.float64))
+    dist = np.asarray(dist, dtype=np.float64)
+    # lexsort uses the last key as the primary one; negate for descending order
+    order = np.lexsort((-dist, -lap), axis=-1)
+
+    positions = np.empty(order.shape, dtype=np.int16)
+    ranks = np.broadcast_to(np.arange(1, order.shape[1] + 1, dtype=np.int16), order.shape)
+    np.put_along_axis(positions, order, ranks, axis=-1)
+    return positions
+
+
+class FrameStore:
+    """Columnar (frames x drivers x fields) store for race replay telemetry.
+
+    Behaves like the list of frame dicts it replaces: ``len(store)``,
+    ``store[i]``, iteration and slicing (``store[::5]``) all work, and
+    ``store[i]`` returns the same ``{"t", "lap", "drivers", "weather"}``
+    dict the old builder produced. New code should prefer the array
+    accessors (``column``, ``driver_slice``) which never allocate per-frame
+    objects.
+    """
+
+    def __init__(self, t: np.ndarray, data: np.ndarray, codes: Sequence[str],
+                 weather: Optional[Dict[str, Optional[np.ndarray]]] = None,
+                 fields: Sequence[str] = FRAME_FIELDS):
+        if data.ndim != 3:
+            raise ValueError("data must be a (frames x drivers x fields) array")
+        if data.shape[0] != len(t):
+            raise ValueError("data and timeline have a different number of frames")
+        if data.shape[1] != len(codes):
+            raise ValueError("data and driver codes have a different number of drivers")
+        if data.shape[2] != len(fields):
+            raise ValueError("data and field names have a different number of fields")
+
+        self.t = t
+        self.data = data
+        self.codes = list(codes)
+        self.fields = tuple(fields)
+        self.weather = {k: v for k, v in (weather or {}).items() if v is not None} or None
+
+        self._code_index = {code: j for j, code in enumerate(self.codes)}
+        self._field_index = {name: k for k, name in enumerate(self.fields)}
+
+    @classmethod
+    def from_arrays(cls, timeline: np.ndarray, resampled_data: Dict[str, Dict[str, np.ndarray]],
+                    weather: Optional[Dict[str, Optional[np.ndarray]]] = None,
+                    dtype=np.float32) -> "FrameStore":
+        """Pack per-driver resampled arrays into one contiguous block.
+
+        Args:
+            timeline: Common timeline (seconds from session start) shared by all drivers.
+            resampled_data: ``{code: {field: array}}`` as produced by the resampling step.
+            weather: Optional ``{field: array}`` of weather channels on the same timeline.
+            dtype: Storage dtype for the block (float32 halves memory vs float64).
+        """
+        codes = list(resampled_data.keys())
+        block = np.zeros((len(timeline), len(codes), len(FRAME_FIELDS)), dtype=dtype)
+        for j, code in enumerate(codes):
+            arrays = resampled_data[code]
+            for k, name in enumerate(FRAME_FIELDS):
+                if name in arrays:
+                    block[:, j, k] = arrays[name]
+        return cls(np.asarray(timeline, dtype=np.float64), block, codes, weather=weather)
+
+    # ------------------------------------------------------------------
+    # Array accessors
+    # ------------------------------------------------------------------
+
+    @property
+    def n_frames(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def n_drivers(self) -> int:
+        return self.data.shape[1]
+
+    @property
+    def has_weather(self) -> bool:
+        return bool(self.weather)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the timeline, frame block and weather arrays."""
+        total = self.t.nbytes + self.data.nbytes
+        if self.weather:
+            total += sum(arr.nbytes for arr in self.weather.values())
+        return int(total)
+
+    def column(self, field: str) -> np.ndarray:
+        """Return a (frames x drivers) view of one field for all drivers."""
+        return self.data[:, :, self._field_index[field]]
+
+    def driver_slice(self, code: str, i0: int = 0, i1: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Return ``{field: array}`` views of one driver's data for frames [i0, i1)."""
+        j = self._code_index[code]
+        rows = slice(i0, i1)
+        out = {"t": self.t[rows]}
+        for k, name in enumerate(self.fields):
+            out[name] = self.data[rows, j, k]
+        return out
+
+    def leader_lap(self, i: int) -> int:
+        """Lap of the race leader (position 1) at frame ``i``."""
+        positions = self.data[i, :, self._field_index["position"]]
+        leader = int(np.argmin(positions))
+        return int(round(float(self.data[i, leader, self._field_index["lap"]])))
+
+    # ------------------------------------------------------------------
+    # Dict-compatible view
+    # ------------------------------------------------------------------
+
+    def frame(self, i: int) -> dict:
+        """Build the legacy frame dict for frame ``i``.
+
+        Drivers are ordered by race position, matching the old builder.
+        """
+        if i < 0:
+            i += self.n_frames
+        if not 0 <= i < self.n_frames:
+            raise IndexError("frame index out of range")
+
+        fi = self._field_index
+        row = self.data[i]
+        order = np.argsort(row[:, fi["position"]], kind="stable")
+
+        drivers = {}
+        for j in order:
+            values = row[j]
+            drivers[self.codes[j]] = {
+                "x": float(values[fi["x"]]),
+                "y": float(values[fi["y"]]),
+                "dist": float(values[fi["dist"]]),
+                "lap": int(round(float(values[fi["lap"]]))),
+                "rel_dist": round(float(values[fi["rel_dist"]]), 4),
+                "tyre": float(values[fi["tyre"]]),
+                "tyre_life": float(values[fi["tyre_life"]]),
+                "position": int(values[fi["position"]]),
+                "speed": float(values[fi["speed"]]),
+                "gear": int(values[fi["gear"]]),
+                "drs": int(values[fi["drs"]]),
+                "throttle": float(values[fi["throttle"]]),
+                "brake": float(values[fi["brake"]]),
+            }
+
+        leader_lap = next(iter(drivers.values()))["lap"] if drivers else 1
+        payload = {
+            "t": round(float(self.t[i]), 3),
+            "lap": leader_lap,
+            "drivers": drivers,
+        }
+        weather = self.weather_at(i)
+        if weather:
+            payload["weather"] = weather
+        return payload
+
+    def weather_at(self, i: int) -> dict:
+        """Weather snapshot dict for frame ``i`` (empty if no weather data)."""
+        if not self.weather:
+            return {}
+        wt = self.weather
+
+        def _value(name):
+            return float(wt[name][i]) if name in wt else None
+
+        rain_val = _value("rainfall") or 0.0
+        return {
+            "track_temp": _value("track_temp"),
+            "air_temp": _value("air_temp"),
+            "humidity": _value("humidity"),
+            "wind_speed": _value("wind_speed"),
+            "wind_direction": _value("wind_direction"),
+            "rain_state": "RAINING" if rain_val >= 0.5 else "DRY",
+        }
+
+    def __len__(self) -> int:
+        return self.n_frames
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(self.n_frames):
+            yield self.frame(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            weather = None
+            if self.weather:
+                weather = {name: arr[key] for name, arr in self.weather.items()}
+            return FrameStore(self.t[key], self.data[key], self.codes,
+                              weather=weather, fields=self.fields)
+        return self.frame(int(key))
+
+    def to_list(self) -> List[dict]:
+        """Materialise every frame as a dict (only for small stores / debugging)."""
+        return [self.frame(i) for i in range(self.n_frames)]
@@ -0,0 +1,51 @@
+"""
+Process memory accounting for the web server.
+
+The replay registry knows how many bytes of telemetry it holds, but the
+container's OOM killer only looks at the process as a whole (interpreter,
+FastF1 sessions being loaded, pandas temporaries, Socket.IO buffers...).
+These helpers read the real resident set size and the container memory
+limit so the server can shed cached replays before it gets killed.
+"""
+
+import os
+from typing import Optional
+
+# cgroup v2, then v1; "max" / huge values mean no limit
+_CGROUP_LIMIT_FILES = (
+    "/sys/fs/cgroup/memory.max",
+    "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+)
+_NO_LIMIT = 1 << 60
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Current resident set size of this process in bytes, or None where /proc isn't available.
+
+    There is deliberately no getrusage fallback: ru_maxrss is the peak RSS and
+    never goes down, so a budget checked against it would evict everything.
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def container_memory_limit_bytes() -> Optional[int]:
+    """Memory limit of the container we run in, or None if there isn't one."""
+    for path in _CGROUP_LIMIT_FILES:
+        try:
+            with open(path, "r", encoding="ascii") as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value == "max":
+            return None
+        try:
+            limit = int(value)
+        except ValueError:
+            continue
+        return limit if limit < _NO_LIMIT else None
+    return None
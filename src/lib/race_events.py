@@ -0,0 +1,214 @@
+"""
+Race events for the progress bar markers, extracted from the frame block.
+
+The web server and the desktop window used to walk the frames in Python
+(once per second of race time, building a set of driver codes per sample)
+and could only ever find flags: replays built as a ``FrameStore`` keep
+every driver in every frame, so "driver disappeared" never fired. This
+module works on the (frames x drivers) columns directly and, at full frame
+resolution, finds:
+
+- DNFs: a driver whose in-lap distance (``dist``) stops changing before
+  the leader starts the final lap
+- leader changes: a new P1 that holds the lead for at least a few seconds
+- pit stops: tyre compound changes or tyre life resets
+- fastest laps: each time a new fastest lap of the session is completed,
+  with lap times taken from the lap counter crossings
+- flag periods (yellow, SC, VSC, red) from the track status timeline
+
+Events are plain dicts ``{type, frame, label, lap}`` (flags also carry
+``end_frame``) so they can be cached in the telemetry manifest and sent to
+the viewer as JSON.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.lib.frame_store import FrameStore
+from src.lib import track_status
+
+EVENT_DNF = "dnf"
+EVENT_LEADER = "leader"
+EVENT_PIT = "pit"
+EVENT_FASTEST_LAP = "fastest_lap"
+EVENT_YELLOW_FLAG = "yellow"
+EVENT_SAFETY_CAR = "sc"
+EVENT_RED_FLAG = "red"
+EVENT_VSC = "vsc"
+
+FLAG_EVENTS = {
+    track_status.STATUS_YELLOW: EVENT_YELLOW_FLAG,
+    track_status.STATUS_SAFETY_CAR: EVENT_SAFETY_CAR,
+    track_status.STATUS_RED: EVENT_RED_FLAG,
+    track_status.STATUS_VSC: EVENT_VSC,
+    track_status.STATUS_VSC_ENDING: EVENT_VSC,
+}
+
+DEFAULT_FLAG_SECONDS = 10.0  # duration of a flag whose end time is unknown
+LEADER_HOLD_SECONDS = 3.0  # lead swaps shorter than this are timing noise at the line
+PIT_LIFE_DROP = 1.5  # laps of tyre life lost within a second that mean new tyres
+PIT_MERGE_SECONDS = 30.0  # compound change and tyre life reset of one stop arrive a few frames apart
+
+
+def _event(event_type: str, frame: int, label: str = "", lap: Optional[int] = None, **extra) -> Dict:
+    return {"type": event_type, "frame": int(frame), "label": label, "lap": lap, **extra}
+
+
+def _laps_at(lap: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    return np.round(lap[rows, cols]).astype(int)
+
+
+def _stop_frames(frames: FrameStore) -> np.ndarray:
+    """Last frame at which each driver's in-lap distance still changed (-1 if it never did)."""
+    moved = np.diff(frames.column("dist"), axis=0) != 0
+    last_move = frames.n_frames - 1 - np.argmax(moved[::-1], axis=0)
+    return np.where(moved.any(axis=0), last_move, -1)
+
+
+def _final_lap_frame(frames: FrameStore, total_laps: int) -> int:
+    """First frame with the leader on the last lap (the last frame if total_laps is unknown)."""
+    if total_laps:
+        on_last_lap = np.flatnonzero(frames.column("lap").max(axis=1) >= total_laps)
+        if len(on_last_lap):
+            return int(on_last_lap[0])
+    return frames.n_frames - 1
+
+
+def _dnf_events(frames: FrameStore, stops: np.ndarray, final_lap_frame: int) -> List[dict]:
+    # Cars still running when the leader starts the last lap are classified, whatever happens next
+    retired = np.flatnonzero((stops >= 0) & (stops < final_lap_frame))
+    stop_frames = stops[retired]
+    laps = _laps_at(frames.column("lap"), stop_frames, retired)
+    return [_event(EVENT_DNF, f, frames.codes[j], int(l)) for f, j, l in zip(stop_frames, retired, laps)]
+
+
+def _leader_events(frames: FrameStore, fps: float, finish_frame: int) -> List[dict]:
+    # Once the winner has stopped, the order of cars still finishing their last lap isn't a lead change
+    leader = np.argmin(frames.column("position")[:finish_frame + 1], axis=1)
+
+    # Runs of one leader; drop runs too short to be a real change and merge their neighbours
+    starts = np.flatnonzero(np.concatenate(([True], leader[1:] != leader[:-1])))
+    lengths = np.diff(np.append(starts, len(leader)))
+    held = lengths >= max(1, int(LEADER_HOLD_SECONDS * fps))
+    run_starts, run_leaders = starts[held], leader[starts[held]]
+    if len(run_starts) < 2:
+        return []
+    change = np.flatnonzero(run_leaders[1:] != run_leaders[:-1]) + 1
+    change_frames, new_leaders = run_starts[change], run_leaders[change]
+    laps = _laps_at(frames.column("lap"), change_frames, new_leaders)
+    return [_event(EVENT_LEADER, f, frames.codes[j], int(l))
+            for f, j, l in zip(change_frames, new_leaders, laps)]
+
+
+def _pit_events(frames: FrameStore, fps: float) -> List[dict]:
+    tyre = np.round(frames.column("tyre"))
+    life = frames.column("tyre_life")
+    # Tyre life is compared a second apart: samples around lap boundaries jitter by a fraction of a lap,
+    # a reset to fresh tyres drops it by more than that however the resampling spreads the drop
+    lag = max(1, int(round(fps)))
+    if frames.n_frames <= lag:
+        return []
+    new_tyres = np.zeros(life.shape, dtype=bool)
+    new_tyres[1:] = np.diff(tyre, axis=0) != 0
+    new_tyres[lag:] |= life[lag:] - life[:-lag] < -PIT_LIFE_DROP
+    rows, cols = np.nonzero(new_tyres)
+    if len(rows) == 0:
+        return []
+
+    # One event per stop: the first change of each driver's cluster
+    order = np.lexsort((rows, cols))
+    rows, cols = rows[order], cols[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = (cols[1:] != cols[:-1]) | (rows[1:] - rows[:-1] > PIT_MERGE_SECONDS * fps)
+    rows, cols = rows[first], cols[first]
+
+    laps = _laps_at(frames.column("lap"), rows, cols)
+    fitted = tyre[np.minimum(rows + lag, frames.n_frames - 1), cols]
+    order = np.argsort(rows, kind="stable")
+    return [_event(EVENT_PIT, rows[k], frames.codes[cols[k]], int(laps[k]), tyre=int(fitted[k]))
+            for k in order]
+
+
+def _fastest_lap_events(frames: FrameStore) -> List[dict]:
+    lap = frames.column("lap")
+    t = frames.t
+    # Frames at which a driver's lap counter ticks over, i.e. a lap was completed. Samples around the line
+    # jitter between the two laps, so the counter is made monotonic first
+    lap_no = np.maximum.accumulate(np.floor(lap + 0.5), axis=0)
+    rows, cols = np.nonzero(np.diff(lap_no, axis=0) > 0)
+    rows = rows + 1
+    order = np.lexsort((rows, cols))
+    rows, cols = rows[order], cols[order]
+
+    # Lap time = time between consecutive crossings of the same driver (lap 1's start is not a crossing)
+    same_driver = cols[1:] == cols[:-1]
+    done_rows, done_cols = rows[1:][same_driver], cols[1:][same_driver]
+    lap_times = t[done_rows] - t[rows[:-1][same_driver]]
+    if len(lap_times) == 0:
+        return []
+
+    by_time = np.argsort(done_rows, kind="stable")
+    done_rows, done_cols, lap_times = done_rows[by_time], done_cols[by_time], lap_times[by_time]
+    best_before = np.concatenate(([np.inf], np.minimum.accumulate(lap_times)[:-1]))
+    record = np.flatnonzero(lap_times < best_before)
+    completed = lap_no[done_rows - 1, done_cols].astype(int)
+    return [_event(EVENT_FASTEST_LAP, done_rows[k], frames.codes[done_cols[k]], int(completed[k]),
+                   lap_time=round(float(lap_times[k]), 3))
+            for k in record]
+
+
+def flag_events(track_statuses: Sequence[dict], n_frames: int, fps: float,
+                timeline: Optional[np.ndarray] = None) -> List[dict]:
+    """Flag periods as events spanning ``frame`` to ``end_frame``.
+
+    Frames are found on ``timeline`` (seconds per frame) when given, else
+    computed as ``time * fps``.
+    """
+    def to_frame(seconds):
+        if timeline is not None:
+            return int(np.searchsorted(timeline, seconds))
+        return int(seconds * fps)
+
+    # Same periods and boundaries as the per-frame status the viewers colour the track with
+    periods = track_status.TrackStatusTimeline(track_statuses)
+    events = []
+    for status, start_time, end_time in zip(periods.statuses, periods.starts, periods.ends):
+        event_type = FLAG_EVENTS.get(status)
+        if event_type is None:
+            continue
+        start_frame = to_frame(start_time)
+        end_frame = to_frame(end_time) if np.isfinite(end_time) else start_frame + int(DEFAULT_FLAG_SECONDS * fps)
+        if end_frame <= 0 or start_frame >= n_frames:
+            continue
+        # Short flags still get a visible marker at low frame rates
+        end_frame = min(max(end_frame, start_frame + 1), n_frames)
+        events.append(_event(event_type, start_frame, end_frame=end_frame))
+    return events
+
+
+def extract_race_events(frames, track_statuses: Sequence[dict], total_laps: int, fps: float) -> List[dict]:
+    """All progress bar events of a replay, sorted by frame.
+
+    ``frames`` is a ``FrameStore``; legacy frame lists (single qualifying
+    laps) have no per-driver columns and only get flag events.
+    """
+    if frames is None or len(frames) == 0:
+        return []
+    if not isinstance(frames, FrameStore):
+        return flag_events(track_statuses, len(frames), fps)
+
+    events = flag_events(track_statuses, frames.n_frames, fps, timeline=frames.t)
+    if frames.n_frames < 2:
+        return events
+    stops = _stop_frames(frames)
+    final_lap_frame = _final_lap_frame(frames, int(total_laps or 0))
+    # The winner is whoever leads onto the last lap; the race is over when they stop
+    winner = int(np.argmin(frames.column("position")[final_lap_frame]))
+    finish_frame = int(stops[winner]) if stops[winner] > final_lap_frame else frames.n_frames - 1
+    events += _dnf_events(frames, stops, final_lap_frame)
+    events += _leader_events(frames, fps, finish_frame)
+    events += _pit_events(frames, fps)
+    events += _fastest_lap_events(frames)
+    events.sort(key=lambda e: e["frame"])
+    return events
@@ -0,0 +1,61 @@
+"""
+Along-track progress and running order of every driver, per frame.
+
+The desktop window orders its leaderboard by progress in metres since the
+race start, ``(lap - 1) * lap_length + distance along the reference line``.
+Computing that in ``on_draw`` meant projecting every car and re-sorting on
+every redraw, even while paused. ``RaceProgress`` computes it for blocks
+of frames at once (one batched projection per block) and keeps the
+(frames x drivers) progress and order arrays, so drawing a frame is just
+two row lookups.
+
+Blocks are filled the first time playback reaches them rather than all at
+window init: projecting a whole race takes seconds, a block of
+``BLOCK_FRAMES`` takes a few milliseconds.
+"""
+
+import numpy as np
+
+from src.lib.frame_store import FrameStore
+from src.lib.track_geometry import TrackGeometry
+
+BLOCK_FRAMES = 250
+
+
+class RaceProgress:
+    """Per-frame progress (metres) and order (driver indices, leader first) of a ``FrameStore``."""
+
+    def __init__(self, frames: FrameStore, geometry: TrackGeometry, block_frames: int = BLOCK_FRAMES):
+        self.frames = frames
+        self.geometry = geometry
+        self.codes = frames.codes
+        self.block_frames = max(1, int(block_frames))
+        shape = (frames.n_frames, frames.n_drivers)
+        self._progress = np.zeros(shape, dtype=np.float32)
+        self._order = np.zeros(shape, dtype=np.int16)
+        n_blocks = -(-frames.n_frames // self.block_frames)
+        self._filled = np.zeros(n_blocks, dtype=bool)
+
+    def progress(self, i: int) -> np.ndarray:
+        """Progress in metres since the race start of each driver (in ``codes`` order) at frame ``i``."""
+        self._fill(i)
+        return self._progress[i]
+
+    def order(self, i: int) -> np.ndarray:
+        """Driver indices into ``codes`` at frame ``i``, most progress first."""
+        self._fill(i)
+        return self._order[i]
+
+    def _fill(self, i: int) -> None:
+        block = i // self.block_frames
+        if self._filled[block]:
+            return
+        rows = slice(block * self.block_frames, min((block + 1) * self.block_frames, self.frames.n_frames))
+        xs = self.frames.column("x")[rows]
+        ys = self.frames.column("y")[rows]
+        laps = np.maximum(np.round(self.frames.column("lap")[rows]), 1)
+        projected_m, _, _ = self.geometry.project_many(xs.ravel(), ys.ravel())
+        progress = (laps - 1) * self.geometry.total_length + projected_m.reshape(xs.shape)
+        self._progress[rows] = progress
+        self._order[rows] = np.argsort(-progress, axis=1, kind="stable")
+        self._filled[block] = True
@@ -0,0 +1,151 @@
+"""
+On-disk cache for computed race telemetry.
+
+Each cached session is a directory holding one ``.npy`` file per array plus a
+small ``manifest.json``. Arrays are opened with ``np.load(mmap_mode='r')`` so
+a cached race opens in milliseconds and only the pages touched by playback
+are ever read from disk. The manifest records the schema version, FastF1
+version, FPS and source session key; any mismatch marks the cache as stale
+and it is rebuilt from scratch. It also records the frame rate the timeline
+was actually sampled at, which is lower than FPS for frame-budgeted builds,
+and the progress bar events extracted from the frames.
+"""
+
+import json
+import os
+import shutil
+from typing import Optional
+
+import numpy as np
+
+from src.lib.frame_store import FrameStore
+
+# Bump whenever the layout or meaning of the cached arrays changes
+CACHE_SCHEMA_VERSION = 3
+
+MANIFEST_FILE = "manifest.json"
+TIMELINE_FILE = "t.npy"
+FRAMES_FILE = "frames.npy"
+
+
+def computed_data_dir() -> str:
+    """Directory holding computed telemetry (``/tmp`` on Railway)."""
+    return '/tmp/computed_data' if os.path.exists('/tmp') else 'computed_data'
+
+
+def race_cache_path(event_name: str, cache_suffix: str) -> str:
+    return os.path.join(computed_data_dir(), f"{event_name}_{cache_suffix}_telemetry")
+
+
+def cache_fingerprint(session_key: str, fps: int, fastf1_version: str) -> dict:
+    """Values that must match for a cache entry to be reused."""
+    return {
+        "schema_version": CACHE_SCHEMA_VERSION,
+        "fastf1_version": str(fastf1_version),
+        "fps": fps,
+        "session_key": session_key,
+    }
+
+
+def _read_manifest(path: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"⚠️ Unreadable cache manifest in {path}: {e}")
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def load_race_telemetry(path: str, fingerprint: dict, mmap_mode: Optional[str] = 'r') -> Optional[dict]:
+    """Open a cached race, or return None if it is missing or stale.
+
+    Stale entries (different schema, FastF1 version, FPS or session) and
+    entries with missing/corrupt arrays are deleted so they get rebuilt.
+    """
+    if not os.path.isdir(path):
+        return None
+
+    manifest = _read_manifest(path)
+    mismatched = [
+        key for key, value in fingerprint.items()
+        if manifest is None or manifest.get(key) != value
+    ]
+    if mismatched:
+        print(f"♻️ Stale telemetry cache ({', '.join(mismatched)} changed), rebuilding: {path}")
+        shutil.rmtree(path, ignore_errors=True)
+        return None
+
+    try:
+        t = np.load(os.path.join(path, TIMELINE_FILE), mmap_mode=mmap_mode)
+        data = np.load(os.path.join(path, FRAMES_FILE), mmap_mode=mmap_mode)
+        weather = {
+            name: np.load(os.path.join(path, f"weather_{name}.npy"), mmap_mode=mmap_mode)
+            for name in manifest.get("weather_fields", [])
+        }
+        frames = FrameStore(t, data, manifest["codes"], weather=weather, fields=manifest["fields"])
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Corrupt telemetry cache, rebuilding: {path} ({e})")
+        shutil.rmtree(path, ignore_errors=True)
+        return None
+
+    return {
+        "frames": frames,
+        "fps": float(manifest.get("frame_fps", manifest["fps"])),
+        "driver_colors": {code: tuple(rgb) for code, rgb in manifest.get("driver_colors", {}).items()},
+        "track_statuses": manifest.get("track_statuses", []),
+        "total_laps": int(manifest.get("total_laps", 0)),
+        "max_tyre_life": {int(k): v for k, v in manifest.get("max_tyre_life", {}).items()},
+        "race_events": manifest.get("race_events"),
+    }
+
+
+def save_race_telemetry(path: str, fingerprint: dict, telemetry: dict) -> None:
+    """Write a race to ``path`` atomically (temp directory + rename)."""
+    frames: FrameStore = telemetry["frames"]
+    parent = os.path.dirname(path) or "."
+    os.makedirs(parent, exist_ok=True)
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    try:
+        np.save(os.path.join(tmp_path, TIMELINE_FILE), np.ascontiguousarray(frames.t))
+        np.save(os.path.join(tmp_path, FRAMES_FILE), np.ascontiguousarray(frames.data))
+        weather_fields = []
+        for name, arr in (frames.weather or {}).items():
+            np.save(os.path.join(tmp_path, f"weather_{name}.npy"), np.ascontiguousarray(arr))
+            weather_fields.append(name)
+
+        manifest = dict(fingerprint)
+        manifest.update({
+            "codes": frames.codes,
+            "fields": list(frames.fields),
+            "n_frames": frames.n_frames,
+            "frame_fps": float(telemetry.get("fps", fingerprint["fps"])),
+            "weather_fields": weather_fields,
+            "driver_colors": {code: list(rgb) for code, rgb in telemetry.get("driver_colors", {}).items()},
+            "track_statuses": [
+                {
+                    "status": str(s["status"]),
+                    "start_time": float(s["start_time"]),
+                    "end_time": float(s["end_time"]) if s.get("end_time") is not None else None,
+                }
+                for s in telemetry.get("track_statuses", [])
+            ],
+            "total_laps": int(telemetry.get("total_laps", 0)),
+            "max_tyre_life": {str(k): int(v) for k, v in telemetry.get("max_tyre_life", {}).items()},
+            "race_events": telemetry.get("race_events"),
+        })
+        # Manifest last: a directory without one is never treated as valid
+        with open(os.path.join(tmp_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+    except Exception:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
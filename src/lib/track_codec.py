@@ -0,0 +1,115 @@
+"""
+Compact binary encoding of a circuit layout for the web viewer.
+
+``initial_load_complete`` used to carry the centreline and both boundaries
+as six JSON lists of doubles (several hundred KB). Instead the viewer
+fetches the layout once from ``/api/track/<etag>``:
+
+    header   24 bytes  uint16 version, uint16 n_points, uint16 n_zones,
+                       2 bytes padding, float32 centre_x, centre_y, scale,
+                       track_width
+    points   4 bytes   per point: int16 x[n_points], then int16 y[n_points];
+                       world = centre + value * scale
+    zones    4 bytes   per DRS zone: uint16 start, end (point indices)
+
+The centreline is simplified with Douglas-Peucker to a fraction of a pixel
+at the largest size the viewer draws it, then quantized to int16 relative
+to its bounds. The viewer derives the inner/outer boundaries itself from
+the centreline normals, the same way ``TrackGeometry`` does. The payload
+depends only on the geometry, so its hash is a stable per-circuit ETag.
+"""
+
+import hashlib
+import struct
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from src.lib.track_geometry import TrackGeometry
+
+TRACK_CODEC_VERSION = 1
+
+TRACK_HEADER = struct.Struct("<HHH2xffff")
+
+# Simplify to PIXEL_TOLERANCE px with the whole track RENDER_PIXELS px across (a 4K canvas)
+RENDER_PIXELS = 4096
+PIXEL_TOLERANCE = 0.5
+
+_INT16_MAX = 32767
+
+assert TRACK_HEADER.size == 24
+
+
+def simplify_polyline(x: np.ndarray, y: np.ndarray, tolerance: float, keep: Iterable[int] = ()) -> np.ndarray:
+    """Indices of the points Douglas-Peucker keeps at ``tolerance`` (world units).
+
+    The first and last points and any index in ``keep`` always survive.
+    Distances are measured to the segment rather than the infinite line, so
+    a closed lap whose ends nearly coincide is handled too.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= 2:
+        return np.arange(n)
+
+    kept = np.zeros(n, dtype=bool)
+    kept[[0, n - 1]] = True
+    kept[[i for i in keep if 0 <= i < n]] = True
+
+    anchors = np.flatnonzero(kept)
+    stack = list(zip(anchors[:-1], anchors[1:]))
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        px, py = x[a + 1:b] - x[a], y[a + 1:b] - y[a]
+        vx, vy = x[b] - x[a], y[b] - y[a]
+        seg_len2 = vx * vx + vy * vy
+        t = np.clip((px * vx + py * vy) / seg_len2, 0.0, 1.0) if seg_len2 > 0 else 0.0
+        dist = np.hypot(px - t * vx, py - t * vy)
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = a + 1 + i
+            kept[mid] = True
+            stack.append((a, mid))
+            stack.append((mid, b))
+    return np.flatnonzero(kept)
+
+
+def encode_track(geometry: TrackGeometry, pixel_tolerance: float = PIXEL_TOLERANCE,
+                 render_pixels: int = RENDER_PIXELS) -> bytes:
+    """Simplified, int16-quantized centreline and DRS zones of ``geometry``."""
+    x, y = geometry.x, geometry.y
+    if len(x) == 0:
+        return TRACK_HEADER.pack(TRACK_CODEC_VERSION, 0, 0, 0.0, 0.0, 1.0, geometry.track_width)
+
+    x_min, x_max, y_min, y_max = float(x.min()), float(x.max()), float(y.min()), float(y.max())
+    extent = max(x_max - x_min, y_max - y_min, 1.0)
+    zones = geometry.drs_zone_index
+    keep = simplify_polyline(x, y, extent * pixel_tolerance / render_pixels, keep=zones.ravel())
+
+    centre_x, centre_y = (x_min + x_max) / 2, (y_min + y_max) / 2
+    scale = extent / 2 / _INT16_MAX
+    qx = np.round((x[keep] - centre_x) / scale).clip(-_INT16_MAX, _INT16_MAX).astype("<i2")
+    qy = np.round((y[keep] - centre_y) / scale).clip(-_INT16_MAX, _INT16_MAX).astype("<i2")
+    # Zone ends are always kept, so they map exactly onto simplified indices
+    zone_index = np.searchsorted(keep, zones).astype("<u2")
+
+    header = TRACK_HEADER.pack(TRACK_CODEC_VERSION, len(keep), len(zone_index),
+                               centre_x, centre_y, scale, geometry.track_width)
+    return header + qx.tobytes() + qy.tobytes() + zone_index.tobytes()
+
+
+def decode_track(payload: bytes) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+    """(x, y, zones, track_width) back from ``encode_track`` output, mirroring the viewer's decoder."""
+    _, n_points, n_zones, centre_x, centre_y, scale, track_width = TRACK_HEADER.unpack_from(payload)
+    offset = TRACK_HEADER.size
+    qx = np.frombuffer(payload, dtype="<i2", count=n_points, offset=offset)
+    qy = np.frombuffer(payload, dtype="<i2", count=n_points, offset=offset + 2 * n_points)
+    zones = np.frombuffer(payload, dtype="<u2", count=2 * n_zones, offset=offset + 4 * n_points).reshape(-1, 2)
+    return centre_x + qx * scale, centre_y + qy * scale, zones, track_width
+
+
+def track_etag(payload: bytes) -> str:
+    return hashlib.sha1(payload).hexdigest()
@@ -0,0 +1,206 @@
+"""
+Circuit geometry derived from one reference lap, computed once per circuit.
+
+Every consumer needs the same things from a lap's X/Y telemetry: the
+centreline, inner/outer boundaries offset along the normals, DRS zones, a
+dense reference polyline with cumulative distance (to turn a car's position
+into distance along the lap) and a KD-tree over it. ``TrackGeometry``
+computes all of it in one place and can be saved to / loaded from the
+computed data directory, so the web server doesn't have to load a second
+FastF1 session (the qualifying one, often 10-20 s) for every race load.
+
+The KD-tree is built lazily from the reference polyline on first use: it
+takes well under a millisecond and scipy is only needed by the desktop
+viewer.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Bump whenever the stored arrays or their meaning change
+GEOMETRY_SCHEMA_VERSION = 1
+
+TRACK_WIDTH = 200  # metres drawn between the boundaries
+REFERENCE_POINTS = 4000
+DRS_OPEN_VALUES = (10, 12, 14)
+
+_ARRAYS = ("x", "y", "drs", "x_inner", "y_inner", "x_outer", "y_outer",
+           "ref_x", "ref_y", "ref_nx", "ref_ny", "ref_cumdist", "drs_zone_index")
+
+
+def _boundaries(x: np.ndarray, y: np.ndarray, track_width: float) -> Tuple[np.ndarray, ...]:
+    dx = np.gradient(x)
+    dy = np.gradient(y)
+    norm = np.sqrt(dx**2 + dy**2)
+    norm[norm == 0] = 1.0
+    nx = -dy / norm
+    ny = dx / norm
+    half = track_width / 2
+    return x - nx * half, y - ny * half, x + nx * half, y + ny * half
+
+
+def _resample(xs: np.ndarray, ys: np.ndarray, n_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    t_old = np.linspace(0, 1, len(xs))
+    t_new = np.linspace(0, 1, n_points)
+    return np.interp(t_new, t_old, xs), np.interp(t_new, t_old, ys)
+
+
+def _drs_zone_index(drs: np.ndarray) -> np.ndarray:
+    """(start, end) sample indices of each run of open-DRS samples."""
+    is_open = np.isin(drs, DRS_OPEN_VALUES).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], is_open, [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return np.column_stack((starts, ends)).astype(np.int64).reshape(-1, 2)
+
+
+class TrackGeometry:
+    """Centreline, boundaries, DRS zones and reference polyline of one circuit."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], track_width: float = TRACK_WIDTH):
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+        self.track_width = track_width
+        self.total_length = float(self.ref_cumdist[-1]) if len(self.ref_cumdist) else 0.0
+        self._tree = None
+
+    @classmethod
+    def from_lap_telemetry(cls, telemetry, track_width: float = TRACK_WIDTH,
+                           reference_points: int = REFERENCE_POINTS) -> "TrackGeometry":
+        """Build from a lap's telemetry (a FastF1 ``Telemetry`` or any frame with X, Y and DRS columns)."""
+        x = np.asarray(telemetry["X"], dtype=float)
+        y = np.asarray(telemetry["Y"], dtype=float)
+        drs = np.asarray(telemetry["DRS"], dtype=np.int64) if "DRS" in telemetry else np.zeros(0, dtype=np.int64)
+        x_inner, y_inner, x_outer, y_outer = _boundaries(x, y, track_width)
+
+        ref_x, ref_y = _resample(x, y, reference_points)
+        dx = np.gradient(ref_x)
+        dy = np.gradient(ref_y)
+        norm = np.sqrt(dx**2 + dy**2)
+        norm[norm == 0] = 1.0
+        ref_nx = -dy / norm
+        ref_ny = dx / norm
+        # Shoelace formula: counter-clockwise tracks have their left normals pointing inside, flip them outwards
+        signed_area = np.sum(ref_x[:-1] * ref_y[1:] - ref_x[1:] * ref_y[:-1])
+        signed_area += ref_x[-1] * ref_y[0] - ref_x[0] * ref_y[-1]
+        if signed_area > 0:
+            ref_nx, ref_ny = -ref_nx, -ref_ny
+
+        seg_len = np.sqrt(np.diff(ref_x)**2 + np.diff(ref_y)**2)
+        ref_cumdist = np.concatenate(([0.0], np.cumsum(seg_len)))
+
+        return cls({
+            "x": x, "y": y, "drs": drs,
+            "x_inner": x_inner, "y_inner": y_inner, "x_outer": x_outer, "y_outer": y_outer,
+            "ref_x": ref_x, "ref_y": ref_y, "ref_nx": ref_nx, "ref_ny": ref_ny, "ref_cumdist": ref_cumdist,
+            "drs_zone_index": _drs_zone_index(drs),
+        }, track_width=track_width)
+
+    # ------------------------------------------------------------------
+    # Derived values
+    # ------------------------------------------------------------------
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """World extents (x_min, x_max, y_min, y_max) including the boundaries."""
+        xs = (self.x, self.x_inner, self.x_outer)
+        ys = (self.y, self.y_inner, self.y_outer)
+        return (float(min(a.min() for a in xs)), float(max(a.max() for a in xs)),
+                float(min(a.min() for a in ys)), float(max(a.max() for a in ys)))
+
+    @property
+    def drs_zones(self) -> List[dict]:
+        """DRS zones as start/end points on the centreline, in the format the viewers draw."""
+        return [
+            {
+                "start": {"x": float(self.x[start]), "y": float(self.y[start]), "index": int(start)},
+                "end": {"x": float(self.x[end]), "y": float(self.y[end]), "index": int(end)},
+            }
+            for start, end in self.drs_zone_index
+        ]
+
+    @property
+    def tree(self):
+        """KD-tree over the reference polyline (needs scipy)."""
+        if self._tree is None:
+            from scipy.spatial import cKDTree
+            self._tree = cKDTree(np.column_stack((self.ref_x, self.ref_y)))
+        return self._tree
+
+    def project(self, x: float, y: float) -> float:
+        """Distance along the lap (metres) of the point on the reference line closest to (x, y)."""
+        distance, _, _ = self.project_many([x], [y])
+        return float(distance[0])
+
+    def project_many(self, xs, ys) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Project many points at once: (distance along the lap, normal x, normal y) per point.
+
+        One KD-tree query for all points, then each is refined onto the
+        segment after its closest dense sample. The normals are the
+        outward reference normals at that sample.
+        """
+        points = np.column_stack((np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)))
+        n = len(points)
+        if self.total_length == 0.0 or n == 0:
+            return np.zeros(n), np.zeros(n), np.zeros(n)
+        _, idx = self.tree.query(points)
+        idx = np.asarray(idx, dtype=np.int64)
+
+        # Segment after each closest sample (the last sample has none: t is forced to 0 there)
+        nxt = np.minimum(idx + 1, len(self.ref_x) - 1)
+        x1, y1 = self.ref_x[idx], self.ref_y[idx]
+        vx, vy = self.ref_x[nxt] - x1, self.ref_y[nxt] - y1
+        seg_len2 = vx * vx + vy * vy
+        safe_len2 = np.where(seg_len2 > 0, seg_len2, 1.0)
+        t = np.clip(((points[:, 0] - x1) * vx + (points[:, 1] - y1) * vy) / safe_len2, 0.0, 1.0)
+        t[seg_len2 == 0] = 0.0
+        distance = self.ref_cumdist[idx] + t * np.sqrt(seg_len2)
+        return distance, self.ref_nx[idx], self.ref_ny[idx]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str, fingerprint: dict) -> None:
+        """Write to ``path`` (an ``.npz``) atomically, tagged with ``fingerprint``."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}.npz"
+        try:
+            np.savez(tmp_path, meta=np.array(json.dumps({**fingerprint, "track_width": self.track_width})),
+                     **{name: getattr(self, name) for name in _ARRAYS})
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str, fingerprint: dict) -> Optional["TrackGeometry"]:
+        """Read a saved geometry, or None if missing, unreadable or saved under another fingerprint."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                meta = json.loads(str(stored["meta"]))
+                if any(meta.get(key) != value for key, value in fingerprint.items()):
+                    print(f"♻️ Stale track geometry, rebuilding: {path}")
+                    return None
+                arrays = {name: stored[name] for name in _ARRAYS}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Corrupt track geometry, rebuilding: {path} ({e})")
+            return None
+        return cls(arrays, track_width=meta.get("track_width", TRACK_WIDTH))
+
+
+def geometry_fingerprint(fastf1_version: str) -> dict:
+    """Values that must match for a saved geometry to be reused."""
+    return {"schema_version": GEOMETRY_SCHEMA_VERSION, "fastf1_version": str(fastf1_version)}
+
+
+def track_geometry_path(cache_dir: str, year: int, circuit: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", str(circuit)).strip("_") or "unknown"
+    return os.path.join(cache_dir, "track_geometry", f"{int(year)}_{slug}.npz")
@@ -0,0 +1,72 @@
+"""
+Track status (green, yellow, SC, red, VSC) at any point of a replay.
+
+The telemetry builder stores the session's track status changes as
+``{"status", "start_time", "end_time"}`` dicts, each period ending where
+the next one starts (the last one has ``end_time`` None). Finding the
+status for the current frame used to be a linear scan in every consumer,
+with slightly different boundary rules each time. ``TrackStatusTimeline``
+answers it with a bisect over the sorted start times, and precomputes the
+status of every frame of a timeline for the playback loops. A period
+covers ``start_time <= t < end_time``.
+"""
+
+from bisect import bisect_right
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# FastF1 track status codes
+STATUS_GREEN = "1"
+STATUS_YELLOW = "2"
+STATUS_SAFETY_CAR = "4"
+STATUS_RED = "5"
+STATUS_VSC = "6"
+STATUS_VSC_ENDING = "7"
+
+
+class TrackStatusTimeline:
+    """Sorted track status periods with O(log n) lookups."""
+
+    def __init__(self, track_statuses: Sequence[dict]):
+        periods = sorted(track_statuses or [], key=lambda s: float(s.get("start_time", 0) or 0))
+        self.statuses: List[str] = [str(s.get("status", STATUS_GREEN)) for s in periods]
+        self.starts = np.array([float(s.get("start_time", 0) or 0) for s in periods], dtype=np.float64)
+        # Open-ended periods last until the next one starts (or forever)
+        self.ends = np.array(
+            [float(s["end_time"]) if s.get("end_time") is not None else np.inf for s in periods],
+            dtype=np.float64,
+        )
+        self._starts_list = self.starts.tolist()
+        self._codes = np.array([int(s) if s.isdigit() else 0 for s in self.statuses], dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    def status_at(self, t: float) -> str:
+        """Status code in effect at ``t`` seconds (green before the first period and in gaps)."""
+        k = bisect_right(self._starts_list, t) - 1
+        if k < 0 or t >= self.ends[k]:
+            return STATUS_GREEN
+        return self.statuses[k]
+
+    def frame_statuses(self, timeline: np.ndarray) -> np.ndarray:
+        """Status of every frame of ``timeline`` (seconds) as uint8 codes, e.g. ``4`` for the safety car."""
+        t = np.asarray(timeline, dtype=np.float64)
+        k = np.searchsorted(self.starts, t, side="right") - 1
+        out = np.full(len(t), int(STATUS_GREEN), dtype=np.uint8)
+        if len(self):
+            safe_k = np.maximum(k, 0)
+            active = (k >= 0) & (t < self.ends[safe_k])
+            out[active] = self._codes[safe_k[active]]
+        return out
+
+
+def frame_timeline(frames) -> Optional[np.ndarray]:
+    """Frame times of a ``FrameStore`` or legacy list of frame dicts (None if there are no frames)."""
+    if frames is None or len(frames) == 0:
+        return None
+    t = getattr(frames, "t", None)
+    if t is not None:
+        return np.asarray(t, dtype=np.float64)
+    return np.array([float(frame.get("t", 0)) for frame in frames], dtype=np.float64)
@@ -4,12 +4,14 @@ import sys
 import threading
 import time
 import arcade
+from src.f1_data import FPS
 from src.interfaces.race_replay import F1RaceReplayWindow
 from src.gui.telemetry_stream_viewer import main as telemetry_viewer_main
 
 def run_arcade_replay(frames, track_statuses, example_lap, drivers, title,
                       playback_speed=1.0, driver_colors=None, circuit_rotation=0.0, total_laps=None,
-                      visible_hud=True, ready_file=None, session_info=None, session=None, enable_telemetry=False):
+                      visible_hud=True, ready_file=None, session_info=None, session=None, enable_telemetry=False,
+                      track_geometry=None, race_events=None, fps=FPS):
     window = F1RaceReplayWindow(
         frames=frames,
         track_statuses=track_statuses,
@@ -23,7 +25,10 @@ def run_arcade_replay(frames, track_statuses, example_lap, drivers, title,
         visible_hud=visible_hud,
         session_info=session_info,
         session=session,
-        enable_telemetry=enable_telemetry
+        enable_telemetry=enable_telemetry,
+        track_geometry=track_geometry,
+        race_events=race_events,
+        fps=fps
     )
     # Signal readiness to parent process (if requested) after window created
     if ready_file:
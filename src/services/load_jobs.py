@@ -0,0 +1,167 @@
+# Background race-loading jobs. Building race telemetry takes 30-60 s on a cold cache, which is longer than
+# our reverse proxy lets an HTTP request live. /api/load_race therefore only queues a LoadJob and returns its id;
+# the work runs in a small bounded thread pool and reports stage progress that the web server exposes at
+# /api/jobs/<id> for the race selection pages to poll. A second request for a race that is already loading attaches to the
+# in-flight job instead of starting another build.
+
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from src.lib.metrics import REGISTRY as METRICS
+
+# (stage, share of the overall progress bar) in the order a cold load runs through them
+LOAD_STAGES = (
+  ("session_load", 0.15),
+  ("driver_extraction", 0.45),
+  ("resample", 0.10),
+  ("frame_build", 0.10),
+  ("cache_write", 0.05),
+  ("track_layout", 0.15),
+)
+
+STAGE_LABELS = {
+  "queued": "Waiting for a free loader...",
+  "session_load": "Loading session from the F1 API...",
+  "driver_extraction": "Extracting driver telemetry...",
+  "resample": "Resampling onto the replay timeline...",
+  "frame_build": "Building race frames...",
+  "cache_write": "Writing telemetry cache...",
+  "track_layout": "Loading track layout...",
+  "done": "Ready",
+  "error": "Failed",
+}
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_ERROR = "error"
+
+STAGE_SECONDS = METRICS.histogram("f1_load_stage_seconds", "Time load jobs spend in each stage", ["stage"])
+JOBS_FINISHED = METRICS.counter("f1_load_jobs_total", "Finished load jobs", ["status"])
+JOBS_ACTIVE = METRICS.gauge("f1_load_jobs_active", "Queued or running load jobs")
+
+
+class LoadJob:
+
+  def __init__(self, key):
+    self.id = uuid.uuid4().hex
+    self.key = key
+    self.status = JOB_QUEUED
+    self.stage = "queued"
+    self.progress = 0.0
+    self.message = STAGE_LABELS["queued"]
+    self.result = None
+    self.error = None
+    self.created_at = time.time()
+    self.updated_at = self.created_at
+    self.stage_started = time.monotonic()
+
+  @property
+  def finished(self):
+    return self.status in (JOB_DONE, JOB_ERROR)
+
+  def to_dict(self):
+    return {
+      "job_id": self.id,
+      "key": list(self.key),
+      "status": self.status,
+      "stage": self.stage,
+      "progress": round(self.progress, 3),
+      "message": self.message,
+      "result": self.result,
+      "error": self.error,
+      "elapsed": round(self.updated_at - self.created_at, 1),
+    }
+
+
+class LoadJobQueue:
+
+  # Runs load functions in a bounded pool; callers poll get(job_id) for progress.
+
+  def __init__(self, max_workers=1, job_ttl=3600):
+    self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="race-loader")
+    self._lock = threading.Lock()
+    self._jobs = {}
+    self._active = {}  # key -> job id of the queued/running job for that key
+    self._job_ttl = job_ttl
+
+  def submit(self, key, fn):
+    """Queue fn(report) for key, or return the in-flight job for the same key.
+
+    fn receives a report(stage, done=0, total=1) callable and returns the job result.
+    Returns (job, created).
+    """
+    with self._lock:
+      self._prune()
+      active_id = self._active.get(key)
+      if active_id is not None:
+        return self._jobs[active_id], False
+
+      job = LoadJob(key)
+      self._jobs[job.id] = job
+      self._active[key] = job.id
+    JOBS_ACTIVE.inc()
+
+    self._executor.submit(self._run, job, fn)
+    return job, True
+
+  def get(self, job_id):
+    with self._lock:
+      return self._jobs.get(job_id)
+
+  def _run(self, job, fn):
+    job.status = JOB_RUNNING
+    self._report(job, LOAD_STAGES[0][0])
+    try:
+      job.result = fn(lambda stage, done=0, total=1: self._report(job, stage, done, total))
+      self._end_stage(job)
+      job.status = JOB_DONE
+      job.stage = "done"
+      job.progress = 1.0
+      job.message = STAGE_LABELS["done"]
+    except Exception as e:
+      print(f"❌ Load job {job.id} failed: {e}")
+      traceback.print_exc()
+      self._end_stage(job)
+      job.status = JOB_ERROR
+      job.stage = "error"
+      job.error = str(e)
+      job.message = STAGE_LABELS["error"]
+    finally:
+      job.updated_at = time.time()
+      JOBS_FINISHED.inc(status=job.status)
+      JOBS_ACTIVE.dec()
+      with self._lock:
+        if self._active.get(job.key) == job.id:
+          del self._active[job.key]
+
+  def _report(self, job, stage, done=0, total=1):
+    progress = 0.0
+    for name, weight in LOAD_STAGES:
+      if name == stage:
+        progress += weight * (min(done, total) / total if total else 1.0)
+        break
+      progress += weight
+    # Stages can be skipped (e.g. cache hits), never move the bar backwards
+    job.progress = max(job.progress, min(progress, 0.99))
+    if stage != job.stage:
+      self._end_stage(job)
+    job.stage = stage
+    label = STAGE_LABELS.get(stage, stage)
+    job.message = f"{label} ({done}/{total})" if total > 1 else label
+    job.updated_at = time.time()
+
+  def _end_stage(self, job):
+    # Time spent in the stage the job is leaving (including "queued", the wait for a free worker)
+    now = time.monotonic()
+    STAGE_SECONDS.observe(now - job.stage_started, stage=job.stage)
+    job.stage_started = now
+
+  def _prune(self):
+    # Called with the lock held: forget finished jobs older than the TTL
+    cutoff = time.time() - self._job_ttl
+    for job_id in [j.id for j in self._jobs.values() if j.finished and j.updated_at < cutoff]:
+      del self._jobs[job_id]
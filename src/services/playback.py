@@ -0,0 +1,118 @@
+# Playback scheduling for the web viewer. Rather than one OS thread per playing client, a single background task
+# (an eventlet green thread under the production server) wakes up every tick and, for each playing cursor, emits
+# the frame that cursor's clock says should be on screen now to that cursor's own room.
+#
+# The frame is computed from a monotonic clock (elapsed wall time x speed x replay fps, see PlaybackCursor), not
+# by adding a fixed step per tick, so 1x/2x/4x stay accurate however long emits take: a late tick simply jumps
+# ahead and the frames in between are skipped.
+
+import math
+import time
+import traceback
+
+STATS_WINDOW_SECONDS = 5.0
+STATS_LOG_SECONDS = 30.0
+LATENCY_SMOOTHING = 0.2  # EWMA weight of the newest emit latency sample
+
+
+class PlaybackScheduler:
+
+  def __init__(self, registry, emit_frame, emit_ended, start_task, sleep, tick=0.1):
+    # emit_frame(cursor, replay) / emit_ended(cursor) do the socket work; start_task/sleep come from the
+    # Socket.IO server so the loop runs as a green thread when the server is eventlet based
+    self.registry = registry
+    self.emit_frame = emit_frame
+    self.emit_ended = emit_ended
+    self.start_task = start_task
+    self.sleep = sleep
+    self.tick = tick
+    self.overruns = 0  # ticks whose work took longer than the tick itself
+    self._running = False
+    self._window = {}  # sid -> (window start, emits in window)
+    self._last_log = time.monotonic()
+
+  def ensure_running(self):
+    if self._running:
+      return
+    self._running = True
+    self.start_task(self._run)
+    print(f"🎬 Playback scheduler started (tick {self.tick * 1000:.0f} ms)")
+
+  def _run(self):
+    next_tick = time.monotonic()
+    while True:
+      try:
+        # Cursors of clients playing back locally just keep their clock, there's nothing to emit
+        playing = [c for c in self.registry.cursors() if c.is_playing and c.streams]
+        for cursor in playing:
+          self._advance(cursor)
+        self._log_stats(playing)
+      except Exception as e:
+        print(f"❌ Error in playback scheduler: {e}")
+        traceback.print_exc()
+
+      # Sleep to the next tick boundary; if we're already past it, don't try to catch up tick by tick
+      next_tick += self.tick
+      delay = next_tick - time.monotonic()
+      if delay < 0:
+        self.overruns += 1
+        next_tick = time.monotonic()
+        delay = 0.0
+      self.sleep(delay)
+
+  def _advance(self, cursor):
+    replay = self.registry.get(cursor.key)
+    if replay is None:
+      print(f"⚠️ Replay {cursor.key} was evicted, stopping playback for {cursor.sid}")
+      cursor.is_playing = False
+      return
+
+    now = time.monotonic()
+    target = int(cursor.clock_frame(now, replay.fps))
+
+    if target >= replay.total_frames:
+      print(f"🏁 Replay ended for {cursor.sid}")
+      cursor.is_playing = False
+      cursor.frame_index = 0
+      cursor.last_emitted = None
+      self.emit_ended(cursor)
+      return
+
+    if target == cursor.last_emitted:
+      return  # slow playback: the clock hasn't reached the next frame yet
+
+    if cursor.last_emitted is not None:
+      step = math.ceil(cursor.speed * replay.fps * self.tick)
+      cursor.frames_skipped += max(0, target - cursor.last_emitted - step)
+
+    cursor.frame_index = target
+    started = time.monotonic()
+    self.emit_frame(cursor, replay)
+    latency_ms = (time.monotonic() - started) * 1000
+    cursor.emit_latency_ms += LATENCY_SMOOTHING * (latency_ms - cursor.emit_latency_ms)
+    cursor.last_emitted = target
+    self._count_emit(cursor, started)
+
+  def _count_emit(self, cursor, now):
+    window_start, emits = self._window.get(cursor.sid, (now, 0))
+    emits += 1
+    elapsed = now - window_start
+    if elapsed >= STATS_WINDOW_SECONDS:
+      cursor.achieved_fps = emits / elapsed
+      window_start, emits = now, 0
+    self._window[cursor.sid] = (window_start, emits)
+
+  def _log_stats(self, playing):
+    now = time.monotonic()
+    if now - self._last_log < STATS_LOG_SECONDS:
+      return
+    self._last_log = now
+    # Forget windows of cursors that stopped playing
+    active = {c.sid for c in playing}
+    self._window = {sid: w for sid, w in self._window.items() if sid in active}
+    if not playing:
+      return
+    avg_latency = sum(c.emit_latency_ms for c in playing) / len(playing)
+    avg_fps = sum(c.achieved_fps for c in playing) / len(playing)
+    print(f"📈 Playback: {len(playing)} playing, emit latency {avg_latency:.1f} ms, "
+          f"{avg_fps:.1f} emits/s per client, {self.overruns} overrun ticks")
@@ -0,0 +1,352 @@
+# Registry of loaded replays for the web server. Each loaded race is held once, read-only, and shared by every
+# viewer watching it; what a viewer is doing with it (frame index, play state, speed) lives in a PlaybackCursor
+# keyed by their Socket.IO sid. Replays are evicted least-recently-used first when there are too many of them,
+# when they exceed the memory budget, when the whole process's RSS goes over its budget, or when nobody has
+# touched them for a while. Evicted races stay in the on-disk telemetry cache, so reloading one is a cache hit.
+
+import gc
+import threading
+import time
+from collections import OrderedDict
+
+from src.lib.frame_codec import DeltaEncoder, driver_metadata, driver_order
+from src.lib.memory import process_rss_bytes
+from src.lib.metrics import REGISTRY as METRICS
+from src.lib.track_codec import encode_track, track_etag
+from src.lib.track_status import STATUS_GREEN, TrackStatusTimeline, frame_timeline
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary"
+PROTOCOL_DELTA = "delta"
+PROTOCOL_LOCAL = "local"  # client plays back from /api/frames chunks, the server only tracks its cursor
+PROTOCOLS = (PROTOCOL_JSON, PROTOCOL_BINARY, PROTOCOL_DELTA, PROTOCOL_LOCAL)
+
+REPLAY_EVICTIONS = METRICS.counter("f1_replay_evictions_total", "Replays evicted from memory", ["reason"])
+
+
+def replay_nbytes(frames):
+  # FrameStores know their size; legacy frame lists (qualifying laps) get a rough per-frame estimate
+  nbytes = getattr(frames, "nbytes", None)
+  if nbytes is not None:
+    return int(nbytes)
+  return len(frames) * 600 if frames else 0
+
+
+class LoadedReplay:
+
+  # Everything the web viewer needs for one loaded session. Treat as read-only once registered.
+
+  def __init__(self, key, frames, driver_colors, fps, race_events=None, track_geometry=None, event_name="",
+               circuit_name="", country="", total_laps=0, track_statuses=None):
+    self.key = key
+    self.fps = fps  # frames per second of replay time (below FPS for frame-budgeted sessions)
+    self.year, self.round, self.session_type = key
+    self.frames = frames
+    self.driver_colors = driver_colors or {}
+    # Static per-session driver metadata; binary frames carry drivers in this order
+    self.driver_codes = driver_order(frames)
+    self.drivers_meta = driver_metadata(self.driver_codes, self.driver_colors)
+    self.driver_hex = {d["code"]: d["color"] for d in self.drivers_meta}
+    self.total_frames = len(frames)
+    self.race_events = race_events or []
+    # Track status code of every frame (uint8), so frame_update doesn't scan the status periods per emit
+    timeline = frame_timeline(frames)
+    self.frame_statuses = TrackStatusTimeline(track_statuses).frame_statuses(timeline) if timeline is not None else None
+    # Layout is served separately from /api/track/<etag>; the ETag only depends on the circuit's geometry
+    self.track_bin = encode_track(track_geometry) if track_geometry is not None else None
+    self.track_etag = track_etag(self.track_bin) if self.track_bin is not None else None
+    self.event_name = event_name
+    self.circuit_name = circuit_name
+    self.country = country
+    self.total_laps = int(total_laps) if total_laps else 0
+    self.nbytes = replay_nbytes(frames)
+    self.loaded_at = time.time()
+    self.last_access = self.loaded_at
+
+  def touch(self):
+    self.last_access = time.time()
+
+  def track_status_at(self, frame_idx):
+    if self.frame_statuses is None:
+      return STATUS_GREEN
+    return str(self.frame_statuses[frame_idx])
+
+  def track_status_code(self, frame_idx):
+    """Status of a frame as the uint8 code binary frame headers carry"""
+    if self.frame_statuses is None:
+      return int(STATUS_GREEN)
+    return int(self.frame_statuses[frame_idx])
+
+  def key_dict(self):
+    return {"year": self.year, "round": self.round, "session_type": self.session_type}
+
+  def initial_payload(self):
+    return {
+      "total_frames": self.total_frames,
+      "fps": self.fps,
+      "event_name": self.event_name,
+      "circuit_name": self.circuit_name,
+      "country": self.country,
+      "year": self.year,
+      "round": self.round,
+      "total_laps": self.total_laps,
+      "track_etag": self.track_etag,
+      "race_events": self.race_events,
+      "drivers": self.drivers_meta,
+    }
+
+
+class PlaybackCursor:
+
+  # One viewer's position in a replay. sid doubles as the Socket.IO room frames are emitted to.
+  # While playing, the position is derived from a monotonic clock anchored at the last play/seek/speed change:
+  # frame = anchor_frame + (now - anchor_time) * speed * fps, so slow emits never make playback drift.
+
+  def __init__(self, sid, key, protocol=PROTOCOL_JSON):
+    self.sid = sid
+    self.key = key
+    self.protocol = protocol  # frame encoding the client opted into
+    self.delta = DeltaEncoder() if protocol == PROTOCOL_DELTA else None
+    # Delta frames sent / acknowledged by the client, for backpressure
+    self.frames_sent = 0
+    self.frames_acked = 0
+    self.frame_index = 0
+    self.is_playing = False
+    self.speed = 1.0
+    self.last_emitted = None
+    self._anchor_time = 0.0
+    self._anchor_frame = 0.0
+    # Measured by the playback scheduler
+    self.emit_latency_ms = 0.0
+    self.achieved_fps = 0.0
+    self.frames_skipped = 0
+
+  @property
+  def streams(self):
+    return self.protocol != PROTOCOL_LOCAL
+
+  def clock_frame(self, now, fps):
+    if not self.is_playing:
+      return float(self.frame_index)
+    return self._anchor_frame + (now - self._anchor_time) * self.speed * fps
+
+  def play(self, now):
+    self.is_playing = True
+    self.last_emitted = None
+    self._rebase(self.frame_index, now)
+
+  def pause(self, now, fps):
+    self.frame_index = int(self.clock_frame(now, fps))
+    self.is_playing = False
+
+  def seek(self, frame_index, now):
+    self.frame_index = frame_index
+    self.last_emitted = None
+    if self.delta is not None:
+      self.delta.reset()  # next frame is a keyframe
+      self.frames_acked = self.frames_sent  # and it goes out even if older frames are unacknowledged
+    self._rebase(frame_index, now)
+
+  def set_speed(self, speed, now, fps):
+    self._rebase(self.clock_frame(now, fps), now)
+    self.speed = speed
+
+  def ack(self, seq):
+    self.frames_acked = max(self.frames_acked, seq)
+
+  def _rebase(self, frame, now):
+    self._anchor_frame = float(frame)
+    self._anchor_time = now
+
+
+class ReplayRegistry:
+
+  def __init__(self, max_replays=3, memory_budget_bytes=None, idle_timeout=1800, process_budget_bytes=None,
+               rss=process_rss_bytes):
+    # memory_budget_bytes caps the telemetry we hold; process_budget_bytes caps the process RSS as measured by rss()
+    self.max_replays = max_replays
+    self.memory_budget_bytes = memory_budget_bytes
+    self.idle_timeout = idle_timeout
+    self.process_budget_bytes = process_budget_bytes
+    self.rss = rss
+    self.evictions = 0
+    self._replays = OrderedDict()  # key -> LoadedReplay, least recently used first
+    self._cursors = {}  # sid -> PlaybackCursor
+    self._latest_key = None
+    self._released = None  # (telemetry bytes evicted for the process budget, RSS when we evicted them)
+    self._lock = threading.RLock()
+
+  def put(self, replay):
+    """Register a freshly loaded replay (replacing any older copy) and enforce the limits."""
+    with self._lock:
+      self._replays[replay.key] = replay
+      self._replays.move_to_end(replay.key)
+      self._latest_key = replay.key
+      self._enforce_limits(protect=replay.key)
+    self.enforce_process_budget(protect=replay.key)
+
+  def get(self, key):
+    with self._lock:
+      replay = self._replays.get(key)
+      if replay is not None:
+        replay.touch()
+        self._replays.move_to_end(key)
+      return replay
+
+  def latest(self):
+    # Most recently loaded replay, for viewers that connect without naming one
+    with self._lock:
+      if self._latest_key in self._replays:
+        return self.get(self._latest_key)
+      return self.get(next(reversed(self._replays))) if self._replays else None
+
+  def attach(self, sid, key, protocol=None):
+    """Point sid's cursor at key (starting from frame 0). Returns the cursor, or None if key isn't loaded.
+
+    protocol defaults to the client's previous choice (or JSON for a new client).
+    """
+    with self._lock:
+      if self.get(key) is None:
+        return None
+      cursor = self._cursors.get(sid)
+      if cursor is not None:
+        cursor.is_playing = False
+        protocol = protocol or cursor.protocol
+      cursor = PlaybackCursor(sid, key, protocol if protocol in PROTOCOLS else PROTOCOL_JSON)
+      self._cursors[sid] = cursor
+      return cursor
+
+  def track(self, etag):
+    # Encoded track layout by ETag; replays of the same circuit share one
+    with self._lock:
+      return next((r.track_bin for r in self._replays.values() if r.track_etag == etag), None)
+
+  def cursor(self, sid):
+    with self._lock:
+      return self._cursors.get(sid)
+
+  def detach(self, sid):
+    with self._lock:
+      cursor = self._cursors.pop(sid, None)
+      if cursor is not None:
+        cursor.is_playing = False
+      return cursor
+
+  def cursors(self):
+    with self._lock:
+      return list(self._cursors.values())
+
+  def viewers(self, key):
+    with self._lock:
+      return [c for c in self._cursors.values() if c.key == key]
+
+  def total_bytes(self):
+    with self._lock:
+      return sum(r.nbytes for r in self._replays.values())
+
+  def evict_idle(self):
+    """Drop replays nobody is watching that have been idle longer than idle_timeout."""
+    now = time.time()
+    with self._lock:
+      idle = [
+        key for key, replay in self._replays.items()
+        if now - replay.last_access > self.idle_timeout and not self.viewers(key)
+      ]
+      for key in idle:
+        print(f"🧹 Evicting idle replay {key} (idle {now - self._replays[key].last_access:.0f}s)")
+        self._evict(key, "idle")
+    if idle:
+      gc.collect()
+    return idle
+
+  def enforce_process_budget(self, protect=None):
+    """Evict LRU replays (unwatched first) until their telemetry covers the process RSS overage.
+
+    The allocator often keeps the pages of freed pandas/numpy blocks, so RSS need not drop when a replay goes.
+    RSS is therefore read once per call, and eviction stops as soon as the evicted replays' nbytes cover the
+    overage. Bytes evicted earlier that RSS doesn't reflect yet count as freed too, so later checks don't shed
+    the remaining replays for memory we have already given up. Returns the evicted keys. The replay named by
+    protect (default: the most recently loaded one) is never evicted.
+    """
+    if self.process_budget_bytes is None:
+      return []
+    rss = self.rss()
+    if rss is None or rss <= self.process_budget_bytes:
+      self._released = None
+      return []
+    freed = 0
+    if self._released is not None:
+      released, rss_then = self._released
+      freed = max(0, released - max(0, rss_then - rss))
+    protect = protect or self._latest_key
+    overage = rss - self.process_budget_bytes
+    evicted = []
+    with self._lock:
+      while freed < overage:
+        candidates = [key for key in self._replays if key != protect]
+        unwatched = [key for key in candidates if not self.viewers(key)]
+        victim = (unwatched or candidates or [None])[0]
+        if victim is None:
+          break
+        nbytes = self._replays[victim].nbytes
+        self._evict(victim, "process_budget")
+        evicted.append(victim)
+        freed += nbytes
+        print(f"🧹 Evicting replay {victim} ({nbytes / 1e6:.0f} MB): process RSS {rss / 1e6:.0f} MB is over the "
+              f"{self.process_budget_bytes / 1e6:.0f} MB budget")
+    if evicted:
+      self._released = (freed, rss)
+      gc.collect()
+    return evicted
+
+  def stats(self):
+    with self._lock:
+      return {
+        "replays": [
+          {
+            **replay.key_dict(),
+            "event_name": replay.event_name,
+            "total_frames": replay.total_frames,
+            "bytes": replay.nbytes,
+            "viewers": len(self.viewers(key)),
+            "idle_s": round(time.time() - replay.last_access, 1),
+          }
+          for key, replay in self._replays.items()
+        ],
+        "total_bytes": self.total_bytes(),
+        "memory_budget_bytes": self.memory_budget_bytes,
+        "rss_bytes": self.rss(),
+        "process_budget_bytes": self.process_budget_bytes,
+        "evictions": self.evictions,
+        "clients": len(self._cursors),
+      }
+
+  def _over_limits(self):
+    if self.max_replays is not None and len(self._replays) > self.max_replays:
+      return True
+    return self.memory_budget_bytes is not None and self.total_bytes() > self.memory_budget_bytes
+
+  def _enforce_limits(self, protect=None):
+    # LRU order, but prefer replays nobody is watching; the one just loaded is never evicted
+    evicted = False
+    while self._over_limits():
+      candidates = [key for key in self._replays if key != protect]
+      unwatched = [key for key in candidates if not self.viewers(key)]
+      victim = (unwatched or candidates or [None])[0]
+      if victim is None:
+        break
+      print(f"🧹 Evicting replay {victim} to stay within limits "
+            f"({len(self._replays)} loaded, {self.total_bytes() / 1e6:.0f} MB)")
+      self._evict(victim, "limits")
+      evicted = True
+    if evicted:
+      gc.collect()
+
+  def _evict(self, key, reason):
+    if self._replays.pop(key, None) is not None:
+      self.evictions += 1
+      REPLAY_EVICTIONS.inc(reason=reason)
+    for cursor in self.viewers(key):
+      cursor.is_playing = False
+    if self._latest_key == key:
+      self._latest_key = None
@@ -1,6 +1,7 @@
 import arcade
 from typing import List, Literal, Tuple, Optional
 from typing import Sequence, Optional, Tuple
+from src.lib import race_events
 from src.lib.time import format_time
 import numpy as np
 import pandas as pd
@@ -1225,13 +1226,15 @@ class RaceProgressBarComponent(BaseComponent):
     - Clear separation of concerns for event detection
     """
     
-    # Event type constants for clear identification
-    EVENT_DNF = "dnf"
-    EVENT_LAP = "lap"
-    EVENT_YELLOW_FLAG = "yellow_flag"
-    EVENT_RED_FLAG = "red_flag"
-    EVENT_SAFETY_CAR = "safety_car"
-    EVENT_VSC = "vsc"
+    # Event type constants for clear identification (shared with the web viewer)
+    EVENT_DNF = race_events.EVENT_DNF
+    EVENT_LEADER = race_events.EVENT_LEADER
+    EVENT_PIT = race_events.EVENT_PIT
+    EVENT_FASTEST_LAP = race_events.EVENT_FASTEST_LAP
+    EVENT_YELLOW_FLAG = race_events.EVENT_YELLOW_FLAG
+    EVENT_RED_FLAG = race_events.EVENT_RED_FLAG
+    EVENT_SAFETY_CAR = race_events.EVENT_SAFETY_CAR
+    EVENT_VSC = race_events.EVENT_VSC
     
     # Color palette following F1 conventions
     COLORS = {
@@ -1239,6 +1242,9 @@ class RaceProgressBarComponent(BaseComponent):
         "progress_fill": (0, 180, 0),
         "progress_border": (100, 100, 100),
         "dnf": (220, 50, 50),
+        "leader": (255, 255, 255),
+        "pit": (0, 170, 255),
+        "fastest_lap": (170, 70, 255),
         "lap_marker": (80, 80, 80),
         "yellow_flag": (255, 220, 0),
         "red_flag": (220, 30, 30),
@@ -1449,6 +1455,10 @@ class RaceProgressBarComponent(BaseComponent):
             arcade.draw_line(x - size, y - size, x + size, y + size, color, 2)
             arcade.draw_line(x - size, y + size, x + size, y - size, color, 2)
             
+        elif event_type in (self.EVENT_LEADER, self.EVENT_PIT, self.EVENT_FASTEST_LAP):
+            # Draw a short tick above the bar, flags keep the space right on top of it
+            arcade.draw_line(x, marker_bottom + 8, x, marker_top, self.COLORS[event_type], 2)
+            
         elif event_type == self.EVENT_YELLOW_FLAG:
             # Draw yellow flag indicator on the bar
             self._draw_flag_segment(event, self.COLORS["yellow_flag"])
@@ -1515,6 +1525,9 @@ class RaceProgressBarComponent(BaseComponent):
         # Build tooltip text
         type_names = {
             self.EVENT_DNF: "DNF",
+            self.EVENT_LEADER: "New Leader",
+            self.EVENT_PIT: "Pit Stop",
+            self.EVENT_FASTEST_LAP: "Fastest Lap",
             self.EVENT_YELLOW_FLAG: "Yellow Flag",
             self.EVENT_RED_FLAG: "Red Flag",
             self.EVENT_SAFETY_CAR: "Safety Car",
@@ -2102,164 +2115,37 @@ class QualifyingLapTimeComponent(BaseComponent):
                 self._last_completed_sector = sector_idx
         return text, text_color
 
-def extract_race_events(frames: List[dict], track_statuses: List[dict], total_laps: int) -> List[dict]:
-    """
-    Extract race events from frame data for the progress bar.
-    
-    This function analyzes the telemetry frames to identify:
-    - DNF events (when a driver stops appearing)
-    - Leader changes (when the P1 position changes hands)
-    - Flag events (from track_statuses)
-    
-    Args:
-        frames: List of frame dictionaries from telemetry
-        track_statuses: List of track status events
-        total_laps: Total number of laps in the race
-        
-    Returns:
-        List of event dictionaries for the progress bar
-    """
-    events = []
-    
-    if not frames:
-        return events
-        
-    n_frames = len(frames)
-    
-    # Track drivers present in each frame
-    prev_drivers = set()
-    
-    # Sample frames at regular intervals for performance (every 25 frames = 1 second)
-    sample_rate = 25
-    
-    for i in range(0, n_frames, sample_rate):
-        frame = frames[i]
-        drivers_data = frame.get("drivers", {})
-        current_drivers = set(drivers_data.keys())
-        
-        # Detect DNFs (drivers who disappeared)
-        if prev_drivers:
-            dnf_drivers = prev_drivers - current_drivers
-            for driver_code in dnf_drivers:
-                # Get the lap from previous frame if available
-                prev_frame = frames[max(0, i - sample_rate)]
-                driver_info = prev_frame.get("drivers", {}).get(driver_code, {})
-                lap = driver_info.get("lap", "?")
-                
-                events.append({
-                    "type": RaceProgressBarComponent.EVENT_DNF,
-                    "frame": i,
-                    "label": driver_code,
-                    "lap": lap,
-                })
-        
-        prev_drivers = current_drivers
-    
-    # Add flag events from track_statuses
-    for status in track_statuses:
-        status_code = str(status.get("status", ""))
-        start_time = status.get("start_time", 0)
-        end_time = status.get("end_time")
-        
-        # Convert time to frame (assuming 25 FPS)
-        fps = 25
-        start_frame = int(start_time * fps)
-        end_frame = int(end_time * fps) if end_time else start_frame + 250  # Default 10 seconds
-        
-        # This prevents rendering artifacts from pre-race track status events
-        # that shouldn't appear on the timeline... Events that span frame 0
-        # (start < 0 but end > 0) are kept; the drawing code will clamp them
-        if end_frame <= 0:
-            continue
-        
-        # Note: The drawing code also clamps, but normalizing here improves data quality
-        if n_frames > 0:
-            end_frame = min(end_frame, n_frames)
-        
-        event_type = None
-        if status_code == "2":  # Yellow flag
-            event_type = RaceProgressBarComponent.EVENT_YELLOW_FLAG
-        elif status_code == "4":  # Safety Car
-            event_type = RaceProgressBarComponent.EVENT_SAFETY_CAR
-        elif status_code == "5":  # Red flag
-            event_type = RaceProgressBarComponent.EVENT_RED_FLAG
-        elif status_code in ("6", "7"):  # VSC
-            event_type = RaceProgressBarComponent.EVENT_VSC
-            
-        if event_type:
-            events.append({
-                "type": event_type,
-                "frame": start_frame,
-                "end_frame": end_frame,
-                "label": "",
-                "lap": None,
-            })
-    
-    return events
-
-# Build track geometry from example lap telemetry
-def build_track_from_example_lap(example_lap, track_width=200):
-    drs_zones = plotDRSzones(example_lap)
-    plot_x_ref = example_lap["X"]
-    plot_y_ref = example_lap["Y"]
-
-    # compute tangents
-    dx = np.gradient(plot_x_ref)
-    dy = np.gradient(plot_y_ref)
-
-    norm = np.sqrt(dx**2 + dy**2)
-    norm[norm == 0] = 1.0
-    dx /= norm
-    dy /= norm
-
-    nx = -dy
-    ny = dx
-
-    x_outer = plot_x_ref + nx * (track_width / 2)
-    y_outer = plot_y_ref + ny * (track_width / 2)
-    x_inner = plot_x_ref - nx * (track_width / 2)
-    y_inner = plot_y_ref - ny * (track_width / 2)
-
-    # world bounds
-    x_min = min(plot_x_ref.min(), x_inner.min(), x_outer.min())
-    x_max = max(plot_x_ref.max(), x_inner.max(), x_outer.max())
-    y_min = min(plot_y_ref.min(), y_inner.min(), y_outer.min())
-    y_max = max(plot_y_ref.max(), y_inner.max(), y_outer.max())
-
-    return (plot_x_ref, plot_y_ref, x_inner, y_inner, x_outer, y_outer,
-            x_min, x_max, y_min, y_max, drs_zones)
-
-# Plot DRS Zones along the track sides to show DRS Zones on the track
-def plotDRSzones(example_lap):
-   x_val = example_lap["X"]
-   y_val = example_lap["Y"]
-   drs_zones = []
-   drs_start = None
-
-   for i, val in enumerate(example_lap["DRS"]):
-       if val in [10, 12, 14]:
-           if drs_start is None:
-               drs_start = i
-       else:
-           if drs_start is not None:
-               drs_end = i - 1
-               zone = {
-                   "start": {"x": x_val.iloc[drs_start], "y": y_val.iloc[drs_start], "index": drs_start},
-                   "end": {"x": x_val.iloc[drs_end], "y": y_val.iloc[drs_end], "index": drs_end}
-               }
-               drs_zones.append(zone)
-               drs_start = None
-   
-   # Handle case where DRS zone extends to end of lap
-   if drs_start is not None:
-       drs_end = len(example_lap["DRS"]) - 1
-       zone = {
-           "start": {"x": x_val.iloc[drs_start], "y": y_val.iloc[drs_start], "index": drs_start},
-           "end": {"x": x_val.iloc[drs_end], "y": y_val.iloc[drs_end], "index": drs_end}
-       }
-       drs_zones.append(zone)
-   
-   return drs_zones
+def finish_line_segments(start_inner, start_outer, num_squares=20, extension=20):
+    """(x1, y1, x2, y2, color) of each square of the checkered line across the start, extended past both edges."""
+    dx = start_outer[0] - start_inner[0]
+    dy = start_outer[1] - start_inner[1]
+    length = np.sqrt(dx**2 + dy**2)
+    if length <= 0:
+        return []
+
+    # Normalize direction (unit vector)
+    dx_norm = dx / length
+    dy_norm = dy / length
+
+    # Extend line beyond track limits
+    extended_inner = (start_inner[0] - extension * dx_norm,
+                     start_inner[1] - extension * dy_norm)
+    extended_outer = (start_outer[0] + extension * dx_norm,
+                     start_outer[1] + extension * dy_norm)
+
+    segments = []
+    for i in range(num_squares):
+        t1 = i / num_squares # start of segment
+        t2 = (i + 1) / num_squares # end of segment
+
+        x1 = extended_inner[0] + t1 * (extended_outer[0] - extended_inner[0])
+        y1 = extended_inner[1] + t1 * (extended_outer[1] - extended_inner[1])
+        x2 = extended_inner[0] + t2 * (extended_outer[0] - extended_inner[0])
+        y2 = extended_inner[1] + t2 * (extended_outer[1] - extended_inner[1])
+
+        color = arcade.color.WHITE if i % 2 == 0 else arcade.color.BLACK
+        segments.append((x1, y1, x2, y2, color))
+    return segments
 
 def draw_finish_line(self, session_type = 'R'):
     if(session_type not in ['R', 'Q']):
@@ -2280,34 +2166,5 @@ def draw_finish_line(self, session_type = 'R'):
     
     # Draw checkered finish line
     if start_inner and start_outer:
-        num_squares = 20
-        extension = 20
-            
-        # Calculate direction vector and normalize
-        dx = start_outer[0] - start_inner[0]
-        dy = start_outer[1] - start_inner[1]
-        length = np.sqrt(dx**2 + dy**2)
-            
-        if length > 0:
-            # Normalize direction (unit vector)
-            dx_norm = dx / length
-            dy_norm = dy / length
-                
-            # Extend line beyond track limits
-            extended_inner = (start_inner[0] - extension * dx_norm, 
-                             start_inner[1] - extension * dy_norm)
-            extended_outer = (start_outer[0] + extension * dx_norm, 
-                             start_outer[1] + extension * dy_norm)
-            
-            # Draw checkered pattern across extended line
-            for i in range(num_squares):
-                t1 = i / num_squares # start of segment
-                t2 = (i + 1) / num_squares # end of segment
-                
-                x1 = extended_inner[0] + t1 * (extended_outer[0] - extended_inner[0])
-                y1 = extended_inner[1] + t1 * (extended_outer[1] - extended_inner[1])
-                x2 = extended_inner[0] + t2 * (extended_outer[0] - extended_inner[0])
-                y2 = extended_inner[1] + t2 * (extended_outer[1] - extended_inner[1])
-                
-                color = arcade.color.WHITE if i % 2 == 0 else arcade.color.BLACK
-                arcade.draw_line(x1, y1, x2, y2, color, 6)
+        for x1, y1, x2, y2, color in finish_line_segments(start_inner, start_outer):
+            arcade.draw_line(x1, y1, x2, y2, color, 6)
@@ -1,7 +1,13 @@
 // F1 Race Replay Viewer - JavaScript
 const canvas = document.getElementById('track');
 const ctx = canvas.getContext('2d');
-const socket = io();
+// Join the race named in the URL (year/round/session_type); without them the server picks the latest load.
+// By default the viewer plays back locally from /api/frames chunks (see localTick); ?protocol=delta, binary
+// or json switch back to server-pushed frames
+const socketQuery = Object.fromEntries(new URLSearchParams(window.location.search));
+socketQuery.protocol = socketQuery.protocol || 'local';
+const localPlayback = socketQuery.protocol === 'local';
+const socket = io({ query: socketQuery });
 
 // State
 let isPlaying = false;
@@ -18,11 +24,25 @@ let weatherData = null;
 let trackData = null;
 let drsZones = [];
 let raceEvents = [];
+let trackStatus = '1';  // FastF1 track status code of the current frame
+let driverMeta = [];  // [{code, color}] in binary record order, sent once per session
+let replayFps = 25;  // frames per second of replay time, from initial_load_complete
 
-// Frame rate control (5 FPS target)
+// Frame rate control: leaderboard/progress DOM updates are capped at 5 FPS, the canvas is redrawn
+// on every animation frame with cars interpolated between the two most recent frames
 let lastRenderTime = 0;
 const FRAME_INTERVAL = 200; // ms between renders (5 FPS)
 let pendingFrameData = null;
+const INTERP_FIELDS = ['x', 'y', 'speed', 'throttle'];
+const TELEMETRY_REFRESH_MS = 100;
+const interp = {
+    prev: null,
+    next: null,
+    receivedAt: 0,  // performance.now() when next arrived
+    snap: true,     // next frame replaces both (after a seek), cars don't glide to it
+    settled: false  // last draw was at next's position, nothing left to animate
+};
+let lastTelemetryRefresh = 0;
 
 // Resize canvas to match display size
 function resizeCanvas() {
@@ -67,6 +87,11 @@ if (isQualifyingMode) {
             body: JSON.stringify(data)
         }).then(r => r.json()).then(result => {
             console.log('✅ Qualifying lap loaded:', result);
+            if (result.replay) {
+                deltaRecords = null;
+                socket.emit('join_replay', { ...result.replay, protocol: socketQuery.protocol });
+                socket.emit('seek', { frame: 0 });
+            }
         });
     }
 }
@@ -87,7 +112,371 @@ socket.on('disconnect', (reason) => {
     console.warn('⚠️ Disconnected:', reason);
 });
 
-socket.on('frame_update', (data) => {
+socket.on('frame_update', (data) => handleFrame(data));
+socket.on('frame_bin', (buffer) => handleFrame(decodeBinaryFrame(buffer)));
+socket.on('frame_delta', (buffer, ack) => {
+    const frame = decodeDeltaFrame(buffer);
+    if (ack) ack();
+    if (frame) handleFrame(frame);
+});
+
+// Binary frame layout, mirrors src/lib/frame_codec.py
+const BIN_HEADER_SIZE = 16;
+const BIN_DRIVER_SIZE = 24;
+const BIN_FLAG_WEATHER = 0x01;
+const BIN_FLAG_KEYFRAME = 0x02;
+const BIN_DRIVER_OUT = 0x01;
+const BIN_DRIVER_ABSENT = 0x02;
+const BIN_TYRE_UNKNOWN = 255;
+
+// Unknown compounds travel as 255, JSON frames carry them as -1 like f1_data
+function decodeTyre(value) {
+    return value === BIN_TYRE_UNKNOWN ? -1 : value;
+}
+
+function readFrameHeader(view) {
+    return {
+        frame: view.getUint32(0, true),
+        total_frames: view.getUint32(4, true),
+        time: view.getFloat32(8, true),
+        nDrivers: view.getUint8(12),
+        flags: view.getUint8(13),
+        trackStatus: view.getUint8(15)  // FastF1 code, 0 if the server didn't know it
+    };
+}
+
+function readDriverRecord(view, o, i) {
+    const meta = driverMeta[i] || { code: `#${i}`, color: '#808080' };
+    const flags = view.getUint8(o + 23);
+    return {
+        code: meta.code,
+        color: meta.color,
+        x: view.getFloat32(o, true),
+        y: view.getFloat32(o + 4, true),
+        speed: view.getFloat32(o + 8, true),
+        tyre_life: view.getFloat32(o + 12, true),
+        throttle: view.getUint8(o + 16),
+        brake: view.getUint8(o + 17) / 100,
+        gear: view.getUint8(o + 18),
+        drs: view.getUint8(o + 19),
+        position: view.getUint8(o + 20),
+        tyre: decodeTyre(view.getUint8(o + 21)),
+        lap: view.getUint8(o + 22),
+        flags: flags,
+        is_out: (flags & BIN_DRIVER_OUT) !== 0
+    };
+}
+
+function readWeather(view, o) {
+    const value = (offset) => {
+        const v = view.getFloat32(o + offset, true);
+        return Number.isNaN(v) || v === 0 ? null : v;
+    };
+    return {
+        track_temp: value(0),
+        air_temp: value(4),
+        humidity: value(8),
+        wind_speed: value(12),
+        rain_state: view.getUint8(o + 16) ? 'RAINING' : 'DRY'
+    };
+}
+
+function frameFromRecords(header, records, weather) {
+    const drivers = records
+        .filter(d => !(d.flags & BIN_DRIVER_ABSENT))
+        .map(d => ({ ...d }))
+        .sort((a, b) => a.position - b.position);
+    const frame = { frame: header.frame, total_frames: header.total_frames, time: header.time, drivers };
+    if (weather) frame.weather = weather;
+    if (header.trackStatus) frame.track_status = String(header.trackStatus);
+    return frame;
+}
+
+function decodeBinaryFrame(buffer, byteOffset = 0) {
+    const view = new DataView(buffer, byteOffset);
+    const header = readFrameHeader(view);
+    const records = [];
+    for (let i = 0; i < header.nDrivers; i++) {
+        records.push(readDriverRecord(view, BIN_HEADER_SIZE + i * BIN_DRIVER_SIZE, i));
+    }
+    const weather = (header.flags & BIN_FLAG_WEATHER)
+        ? readWeather(view, BIN_HEADER_SIZE + header.nDrivers * BIN_DRIVER_SIZE)
+        : null;
+    return frameFromRecords(header, records, weather);
+}
+
+// Delta stream state (mirrors DeltaEncoder in src/lib/frame_codec.py)
+const XY_QUANTUM = 0.1;
+let deltaRecords = null;
+let deltaWeather = null;
+
+function decodeDeltaFrame(buffer) {
+    const view = new DataView(buffer);
+    const header = readFrameHeader(view);
+    
+    if (header.flags & BIN_FLAG_KEYFRAME) {
+        deltaRecords = [];
+        for (let i = 0; i < header.nDrivers; i++) {
+            deltaRecords.push(readDriverRecord(view, BIN_HEADER_SIZE + i * BIN_DRIVER_SIZE, i));
+        }
+        deltaWeather = (header.flags & BIN_FLAG_WEATHER)
+            ? readWeather(view, BIN_HEADER_SIZE + header.nDrivers * BIN_DRIVER_SIZE)
+            : null;
+        return frameFromRecords(header, deltaRecords, deltaWeather);
+    }
+    
+    if (!deltaRecords || deltaRecords.length !== header.nDrivers) {
+        return null;  // no keyframe yet, wait for the next one
+    }
+    
+    let o = BIN_HEADER_SIZE;
+    for (let i = 0; i < header.nDrivers; i++) {
+        const d = deltaRecords[i];
+        const mask = view.getUint16(o, true); o += 2;
+        if (mask & 0x0001) {
+            d.x += view.getInt16(o, true) * XY_QUANTUM;
+            d.y += view.getInt16(o + 2, true) * XY_QUANTUM;
+            o += 4;
+        }
+        if (mask & 0x0002) { d.speed = view.getFloat32(o, true); o += 4; }
+        if (mask & 0x0004) { d.tyre_life = view.getFloat32(o, true); o += 4; }
+        if (mask & 0x0008) { d.throttle = view.getUint8(o++); }
+        if (mask & 0x0010) { d.brake = view.getUint8(o++) / 100; }
+        if (mask & 0x0020) { d.gear = view.getUint8(o++); }
+        if (mask & 0x0040) { d.drs = view.getUint8(o++); }
+        if (mask & 0x0080) { d.position = view.getUint8(o++); }
+        if (mask & 0x0100) { d.tyre = decodeTyre(view.getUint8(o++)); }
+        if (mask & 0x0200) { d.lap = view.getUint8(o++); }
+        if (mask & 0x0400) {
+            d.flags = view.getUint8(o++);
+            d.is_out = (d.flags & BIN_DRIVER_OUT) !== 0;
+        }
+    }
+    if (header.flags & BIN_FLAG_WEATHER) {
+        deltaWeather = readWeather(view, o);
+    }
+    return frameFromRecords(header, deltaRecords, deltaWeather);
+}
+
+// Client-side playback: the playhead runs on a local clock and frames are fetched in chunks
+// ahead of it, so the server is only told about play/pause/seek/speed
+const CHUNK_FRAMES = 250;
+const PREFETCH_CHUNKS = 3;
+const CHUNK_HEADER_SIZE = 16;
+const local = {
+    framesUrl: null,
+    chunks: new Map(),
+    pending: new Set(),
+    playing: false,
+    anchorTime: 0,
+    anchorFrame: 0,
+    lastRendered: -1
+};
+
+function localResetReplay(framesUrl) {
+    local.framesUrl = framesUrl;
+    local.chunks.clear();
+    local.pending.clear();
+    local.playing = false;
+    local.anchorFrame = 0;
+    local.lastRendered = -1;
+}
+
+function localClockFrame(now) {
+    if (!local.playing) return local.anchorFrame;
+    return local.anchorFrame + (now - local.anchorTime) / 1000 * currentSpeed * replayFps;
+}
+
+function localRebase(frame) {
+    local.anchorFrame = frame;
+    local.anchorTime = performance.now();
+}
+
+function fetchChunk(index) {
+    if (!local.framesUrl || index < 0 || index * CHUNK_FRAMES >= totalFrames) return;
+    if (local.chunks.has(index) || local.pending.has(index)) return;
+    const url = local.framesUrl;
+    local.pending.add(index);
+    fetch(`${url}&start=${index * CHUNK_FRAMES}&count=${CHUNK_FRAMES}`)
+        .then(r => {
+            if (!r.ok) throw new Error(`HTTP ${r.status}`);
+            return r.arrayBuffer();
+        })
+        .then(buffer => {
+            if (url !== local.framesUrl) return;  // replay changed while fetching
+            const view = new DataView(buffer);
+            local.chunks.set(index, {
+                buffer,
+                start: view.getUint32(0, true),
+                count: view.getUint32(4, true),
+                stride: view.getUint32(8, true),
+                frameSize: view.getUint32(12, true)
+            });
+        })
+        .catch(error => console.error(`❌ Failed to fetch frames chunk ${index}:`, error))
+        .finally(() => local.pending.delete(index));
+}
+
+function localFrame(frame) {
+    const chunk = local.chunks.get(Math.floor(frame / CHUNK_FRAMES));
+    if (!chunk) return null;
+    const k = Math.floor((frame - chunk.start) / chunk.stride);
+    if (k < 0 || k >= chunk.count) return null;
+    return decodeBinaryFrame(chunk.buffer, CHUNK_HEADER_SIZE + k * chunk.frameSize);
+}
+
+function localTick(now) {
+    if (local.framesUrl && totalFrames > 0) {
+        const clock = localClockFrame(now);
+        let frame = Math.floor(clock);
+        if (frame >= totalFrames - 1) {
+            frame = totalFrames - 1;
+            if (local.playing) {
+                local.playing = false;
+                localRebase(frame);
+                // The server cursor's clock runs on past the end; stop it on the last frame too
+                socket.emit('pause');
+                socket.emit('seek', { frame });
+                onReplayEnded();
+            }
+        }
+        
+        // Prefetch ahead of the playhead and drop chunks we've played past
+        const chunkIndex = Math.floor(frame / CHUNK_FRAMES);
+        for (let k = 0; k <= PREFETCH_CHUNKS; k++) fetchChunk(chunkIndex + k);
+        for (const index of local.chunks.keys()) {
+            if (index < chunkIndex - 1) local.chunks.delete(index);
+        }
+        
+        if (frame !== local.lastRendered) {
+            const data = localFrame(frame);
+            if (data) {
+                // Cars are interpolated below every tick; the DOM only follows at the throttled rate
+                // (immediately when paused, so seeks and the final frame always show)
+                throttledRender(data, !local.playing);
+                local.lastRendered = frame;
+                interp.prev = interp.next = data;
+                interp.settled = false;
+            } else if (local.playing) {
+                localRebase(local.lastRendered >= 0 ? local.lastRendered : frame);  // buffering: hold the clock
+            }
+        }
+        
+        // Between frames, blend towards the next one (decoded once per frame)
+        if (local.playing && local.lastRendered === frame && frame + 1 < totalFrames) {
+            if (interp.next === interp.prev || interp.next.frame !== frame + 1) {
+                interp.next = localFrame(frame + 1) || interp.prev;
+            }
+            drawInterpolated(interp.prev, interp.next, clock - frame);
+        } else if (!interp.settled && interp.next) {
+            drawInterpolated(interp.next, interp.next, 1);
+        }
+    }
+}
+
+// Controls go through these so local playback and the server cursor stay in step
+function sendPlay() {
+    if (localPlayback) {
+        localRebase(local.anchorFrame);
+        local.playing = true;
+    }
+    socket.emit('play');
+}
+
+function sendPause() {
+    if (localPlayback) {
+        localRebase(Math.floor(localClockFrame(performance.now())));
+        local.playing = false;
+        if (pendingFrameData) renderFrame(pendingFrameData);  // flush a throttled-out update
+    }
+    socket.emit('pause');
+}
+
+function seekTo(frame) {
+    frame = Math.max(0, Math.min(totalFrames - 1, frame));
+    interp.snap = true;
+    if (localPlayback) {
+        localRebase(frame);
+        local.lastRendered = -1;
+    }
+    socket.emit('seek', { frame });
+}
+
+function sendSpeed(speed) {
+    if (localPlayback) localRebase(localClockFrame(performance.now()));
+    currentSpeed = speed;
+    socket.emit('set_speed', { speed });
+}
+
+// Interpolation. Pushed frames arrive a few times a second; we draw one frame behind, moving each car
+// from prev towards next at the replay clock rate so it reaches next just as the following frame is due
+function bufferFrame(data) {
+    const last = interp.next;
+    // A seek (or anything else that moves the playhead backwards/far ahead) snaps instead of gliding
+    const jump = !last || data.frame < last.frame ||
+        data.frame - last.frame > replayFps * Math.max(currentSpeed, 1) * 2;
+    interp.prev = interp.snap || jump ? data : last;
+    interp.next = data;
+    interp.receivedAt = performance.now();
+    interp.snap = false;
+    interp.settled = false;
+}
+
+function interpolateDrivers(a, b, t) {
+    if (t >= 1 || a === b) return b.drivers;
+    if (t <= 0) return a.drivers;
+    const from = new Map(a.drivers.map(d => [d.code, d]));
+    return b.drivers.map(d => {
+        const p = from.get(d.code);
+        if (!p) return d;
+        // Discrete fields (gear, position, lap...) come from whichever frame is nearer
+        const out = { ...(t < 0.5 ? p : d) };
+        for (const field of INTERP_FIELDS) {
+            out[field] = p[field] + (d[field] - p[field]) * t;
+        }
+        return out;
+    });
+}
+
+function drawInterpolated(a, b, t, now = performance.now()) {
+    t = Math.max(0, Math.min(1, t));
+    drivers = interpolateDrivers(a, b, t);
+    drawFrame();
+    interp.settled = t >= 1;
+    if (selectedDriver && now - lastTelemetryRefresh >= TELEMETRY_REFRESH_MS) {
+        updateDriverTelemetry();
+        lastTelemetryRefresh = now;
+    }
+}
+
+function drawBuffered(now) {
+    const { prev, next } = interp;
+    if (!next || interp.settled) return;
+    let t = 1;
+    if (isPlaying && next.frame > prev.frame) {
+        const played = (now - interp.receivedAt) / 1000 * currentSpeed * replayFps;
+        t = played / (next.frame - prev.frame);
+    }
+    drawInterpolated(prev, next, t, now);
+}
+
+function animate(now) {
+    if (localPlayback) {
+        localTick(now);
+    } else {
+        drawBuffered(now);
+    }
+    requestAnimationFrame(animate);
+}
+
+requestAnimationFrame(animate);
+
+function handleFrame(data) {
+    bufferFrame(data);
+    throttledRender(data);
+}
+
+function throttledRender(data, force = false) {
     // Store frame data
     pendingFrameData = data;
     
@@ -97,11 +486,11 @@ socket.on('frame_update', (data) => {
     const targetInterval = FRAME_INTERVAL / currentSpeed;
     
     // Always render first frame immediately, then throttle
-    if (lastRenderTime === 0 || timeSinceLastRender >= targetInterval) {
+    if (force || lastRenderTime === 0 || timeSinceLastRender >= targetInterval) {
         renderFrame(data);
         lastRenderTime = now;
     }
-});
+}
 
 function renderFrame(data) {
     if (currentFrame % 100 === 0 || currentFrame === 0) {
@@ -116,6 +505,10 @@ function renderFrame(data) {
         updateWeather();
     }
     
+    if (data.track_status) {
+        trackStatus = data.track_status;
+    }
+    
     // Update track bounds dynamically
     if (drivers.length > 0 && !trackData) {
         const xs = drivers.map(d => d.x).filter(x => x !== 0 && !isNaN(x));
@@ -135,7 +528,8 @@ function renderFrame(data) {
         }
     }
     
-    drawFrame();
+    // The canvas itself is redrawn from the animation loop
+    interp.settled = false;
     updateLeaderboard();
     if (selectedDriver) {
         updateDriverTelemetry();
@@ -143,14 +537,17 @@ function renderFrame(data) {
     updateProgress();
 }
 
-socket.on('replay_ended', () => {
+function onReplayEnded() {
     isPlaying = false;
     document.getElementById('playBtn').innerHTML = '▶ Play';
-});
+}
+
+socket.on('replay_ended', onReplayEnded);
 
 socket.on('initial_load_complete', (data) => {
     console.log('Race loaded:', data.total_frames, 'frames');
     totalFrames = data.total_frames;
+    trackStatus = '1';
     
     if (data.event_name) {
         eventName = data.event_name;
@@ -170,6 +567,15 @@ socket.on('initial_load_complete', (data) => {
     if (data.total_laps) {
         totalLaps = data.total_laps;
     }
+    if (data.drivers) {
+        driverMeta = data.drivers;
+    }
+    if (data.fps) {
+        replayFps = data.fps;
+    }
+    if (localPlayback) {
+        localResetReplay(data.frames_url);
+    }
     
     // Load race events
     if (data.race_events) {
@@ -178,65 +584,105 @@ socket.on('initial_load_complete', (data) => {
         drawEventMarkers();
     }
     
-    if (data.track_data) {
-        trackData = data.track_data;
-        console.log('✅ Track data:', trackData.x.length, 'points');
-        
-        // Calculate tight bounds from actual track data
-        const xs = trackData.x.filter(x => !isNaN(x) && x !== 0);
-        const ys = trackData.y.filter(y => !isNaN(y) && y !== 0);
-        
-        if (xs.length > 0 && ys.length > 0) {
-            const minX = Math.min(...xs);
-            const maxX = Math.max(...xs);
-            const minY = Math.min(...ys);
-            const maxY = Math.max(...ys);
-            
-            // Add minimal 5% padding
-            const padX = (maxX - minX) * 0.05;
-            const padY = (maxY - minY) * 0.05;
-            
-            trackBounds = {
-                minX: minX - padX,
-                maxX: maxX + padX,
-                minY: minY - padY,
-                maxY: maxY + padY
-            };
-            
-            console.log('✅ Track bounds:', 
-                `X: ${minX.toFixed(0)} to ${maxX.toFixed(0)} (${(maxX-minX).toFixed(0)})`,
-                `Y: ${minY.toFixed(0)} to ${maxY.toFixed(0)} (${(maxY-minY).toFixed(0)})`);
-        }
-        
-        extractDRSZones();
+    if (data.track_url) {
+        loadTrack(data.track_url);
+    } else {
+        trackData = null;
+        drsZones = [];
     }
     
-    socket.emit('seek', { frame: 0 });
+    seekTo(0);
 });
 
-function extractDRSZones() {
-    if (!trackData || !trackData.drs) return;
-    
-    drsZones = [];
-    let drsStart = null;
+// Track layout (see src/lib/track_codec.py): simplified int16 centreline plus DRS zone indices.
+// The URL names the content, so the browser cache answers repeat connects for the same circuit.
+const TRACK_HEADER_SIZE = 24;
+
+// Boundary colour per track status code, matching the desktop window
+const TRACK_STATUS_COLORS = {
+    '2': '#dcb400',  // yellow
+    '4': '#b4641e',  // safety car
+    '5': '#c81e1e',  // red flag
+    '6': '#c88232',  // VSC
+    '7': '#c88232'   // VSC ending
+};
+
+function loadTrack(url) {
+    fetch(url)
+        .then(r => {
+            if (!r.ok) throw new Error(`HTTP ${r.status}`);
+            return r.arrayBuffer();
+        })
+        .then(buffer => setTrackData(decodeTrack(buffer)))
+        .catch(err => console.error('❌ Track layout failed:', err));
+}
+
+function decodeTrack(buffer) {
+    const view = new DataView(buffer);
+    const n = view.getUint16(2, true);
+    const nZones = view.getUint16(4, true);
+    const centreX = view.getFloat32(8, true);
+    const centreY = view.getFloat32(12, true);
+    const scale = view.getFloat32(16, true);
+    const width = view.getFloat32(20, true);
     
-    for (let i = 0; i < trackData.drs.length; i++) {
-        const drs = trackData.drs[i];
-        if (drs === 10 || drs === 12 || drs === 14) {
-            if (drsStart === null) drsStart = i;
-        } else {
-            if (drsStart !== null) {
-                drsZones.push({ start: drsStart, end: i - 1 });
-                drsStart = null;
-            }
-        }
+    const x = new Array(n);
+    const y = new Array(n);
+    for (let i = 0; i < n; i++) {
+        x[i] = centreX + view.getInt16(TRACK_HEADER_SIZE + i * 2, true) * scale;
+        y[i] = centreY + view.getInt16(TRACK_HEADER_SIZE + (n + i) * 2, true) * scale;
+    }
+    const zones = [];
+    const zoneOffset = TRACK_HEADER_SIZE + n * 4;
+    for (let z = 0; z < nZones; z++) {
+        zones.push({
+            start: view.getUint16(zoneOffset + z * 4, true),
+            end: view.getUint16(zoneOffset + z * 4 + 2, true)
+        });
     }
     
-    if (drsStart !== null) {
-        drsZones.push({ start: drsStart, end: trackData.drs.length - 1 });
+    // Boundaries offset along the centreline normals, as TrackGeometry computes them (np.gradient tangents)
+    const half = width / 2;
+    const track = { x, y, x_inner: new Array(n), y_inner: new Array(n), x_outer: new Array(n), y_outer: new Array(n), zones };
+    for (let i = 0; i < n; i++) {
+        const a = Math.max(i - 1, 0);
+        const b = Math.min(i + 1, n - 1);
+        const dx = x[b] - x[a];
+        const dy = y[b] - y[a];
+        const norm = Math.sqrt(dx * dx + dy * dy) || 1;
+        const nx = -dy / norm;
+        const ny = dx / norm;
+        track.x_inner[i] = x[i] - nx * half;
+        track.y_inner[i] = y[i] - ny * half;
+        track.x_outer[i] = x[i] + nx * half;
+        track.y_outer[i] = y[i] + ny * half;
     }
+    return track;
+}
+
+function setTrackData(track) {
+    trackData = track;
+    drsZones = track.zones;
+    console.log('✅ Track data:', trackData.x.length, 'points,', drsZones.length, 'DRS zones');
+    if (trackData.x.length === 0) return;
     
-    console.log('✅ DRS zones:', drsZones.length);
+    // Tight bounds from the centreline plus minimal 5% padding
+    let minX = Infinity, maxX = -Infinity, minY = Infinity, maxY = -Infinity;
+    for (let i = 0; i < trackData.x.length; i++) {
+        minX = Math.min(minX, trackData.x[i]);
+        maxX = Math.max(maxX, trackData.x[i]);
+        minY = Math.min(minY, trackData.y[i]);
+        maxY = Math.max(maxY, trackData.y[i]);
+    }
+    const padX = (maxX - minX) * 0.05;
+    const padY = (maxY - minY) * 0.05;
+    trackBounds = {
+        minX: minX - padX,
+        maxX: maxX + padX,
+        minY: minY - padY,
+        maxY: maxY + padY
+    };
+    interp.settled = false;
 }
 
 // Drawing
@@ -263,8 +709,6 @@ function drawFrame() {
     const scaleY = availableHeight / trackHeight;
     const scale = Math.min(scaleX, scaleY);
     
-    console.log(`📐 Canvas: ${canvas.width}x${canvas.height}, Track: ${trackWidth.toFixed(0)}x${trackHeight.toFixed(0)}, Scale: ${scale.toFixed(4)}`);
-    
     // Center the track
     const scaledWidth = trackWidth * scale;
     const scaledHeight = trackHeight * scale;
@@ -283,8 +727,8 @@ function drawFrame() {
     if (trackData && trackData.x.length > 0) {
         // Draw track boundaries (inner/outer)
         if (trackData.x_inner && trackData.x_outer) {
-            // Outer boundary
-            ctx.strokeStyle = '#666';
+            // Outer boundary, coloured by the current track status
+            ctx.strokeStyle = TRACK_STATUS_COLORS[trackStatus] || '#666';
             ctx.lineWidth = 3;
             ctx.lineCap = 'round';
             ctx.lineJoin = 'round';
@@ -557,6 +1001,17 @@ function createTyreHealthBar(tyreLife, tyreType) {
     `;
 }
 
+const EVENT_NAMES = {
+    dnf: 'DNF',
+    leader: 'New Leader',
+    pit: 'Pit Stop',
+    fastest_lap: 'Fastest Lap',
+    yellow: 'Yellow Flag',
+    sc: 'Safety Car',
+    red: 'Red Flag',
+    vsc: 'Virtual SC'
+};
+
 function drawEventMarkers() {
     const container = document.getElementById('progressContainer');
     // Clear existing markers
@@ -569,7 +1024,10 @@ function drawEventMarkers() {
         const marker = document.createElement('div');
         marker.className = `event-marker ${event.type}`;
         marker.style.left = `${percent}%`;
-        marker.title = event.label || event.type.toUpperCase();
+        let title = EVENT_NAMES[event.type] || event.type.toUpperCase();
+        if (event.label) title += `: ${event.label}`;
+        if (event.lap) title += ` (Lap ${event.lap})`;
+        marker.title = title;
         container.appendChild(marker);
     });
 }
@@ -594,8 +1052,8 @@ function updateProgress() {
     const percent = totalFrames > 0 ? (currentFrame / totalFrames) * 100 : 0;
     document.getElementById('progressBar').style.width = percent + '%';
     
-    const currentTime = Math.floor(currentFrame / 25);
-    const totalTime = Math.floor(totalFrames / 25);
+    const currentTime = Math.floor(currentFrame / replayFps);
+    const totalTime = Math.floor(totalFrames / replayFps);
     document.getElementById('timeDisplay').textContent = 
         `${formatTime(currentTime)} / ${formatTime(totalTime)}`;
 }
@@ -614,7 +1072,7 @@ function togglePlay() {
     if (isPlaying) {
         btn.innerHTML = '⏳ Starting...';
         btn.disabled = true;
-        socket.emit('play');
+        sendPlay();
         // Re-enable after first frame arrives
         setTimeout(() => {
             btn.innerHTML = '⏸ Pause';
@@ -622,18 +1080,17 @@ function togglePlay() {
         }, 500);
     } else {
         btn.innerHTML = '▶ Play';
-        socket.emit('pause');
+        sendPause();
     }
 }
 
 function restart() {
-    socket.emit('seek', { frame: 0 });
+    seekTo(0);
     if (!isPlaying) togglePlay();
 }
 
 function changeSpeed(speed) {
-    currentSpeed = speed;
-    socket.emit('set_speed', { speed });
+    sendSpeed(speed);
     
     document.querySelectorAll('.speed-btn').forEach(btn => {
         btn.classList.remove('active');
@@ -646,7 +1103,7 @@ function seek(event) {
     const x = event.clientX - rect.left;
     const percent = x / rect.width;
     const frame = Math.floor(percent * totalFrames);
-    socket.emit('seek', { frame });
+    seekTo(frame);
 }
 
 // Keyboard controls
@@ -665,9 +1122,9 @@ document.addEventListener('keydown', (e) => {
     } else if (e.key === '4') {
         changeSpeed(4.0);
     } else if (e.key === 'ArrowLeft') {
-        socket.emit('seek', { frame: Math.max(0, currentFrame - 25) });
+        seekTo(currentFrame - Math.round(replayFps));  // 1 second
     } else if (e.key === 'ArrowRight') {
-        socket.emit('seek', { frame: Math.min(totalFrames - 1, currentFrame + 25) });
+        seekTo(currentFrame + Math.round(replayFps));
     }
 });
 
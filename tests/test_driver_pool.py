@@ -0,0 +1,32 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from src import f1_data
+
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                                reason="session sharing only applies to fork() pools")
+
+
+def _session_name(args):
+    session, _driver_no = args
+    time.sleep(0.05)
+    return f1_data._worker_session_or(session)["name"]
+
+
+def test_concurrent_builds_each_see_their_own_session():
+    results = {}
+
+    def build(name):
+        results[name] = f1_data._map_drivers(_session_name, {"name": name}, [(n,) for n in range(4)])
+
+    threads = [threading.Thread(target=build, args=(name,)) for name in ("a", "b", "c")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {name: [name] * 4 for name in ("a", "b", "c")}
+    assert f1_data._worker_session is None  # the parent never holds a pool's session
@@ -0,0 +1,39 @@
+import numpy as np
+
+from src.lib.frame_codec import (
+    CHUNK_HEADER, DRIVER_RECORD, HEADER, TYRE_UNKNOWN, encode_chunk, encode_frame,
+)
+from src.lib.frame_store import FRAME_FIELDS, FrameStore
+
+CODES = ["VER", "HAM", "LEC"]
+
+
+def _store(tyres):
+    n = len(tyres)
+    data = np.zeros((n, len(CODES), len(FRAME_FIELDS)), dtype=np.float32)
+    data[..., FRAME_FIELDS.index("tyre")] = np.asarray(tyres, dtype=np.float32)
+    return FrameStore(np.arange(n, dtype=np.float64), data, CODES)
+
+
+def _records(payload):
+    return np.frombuffer(payload, dtype=DRIVER_RECORD, count=len(CODES), offset=HEADER.size)
+
+
+def test_unknown_tyre_is_not_encoded_as_soft():
+    frames = _store([[-1, 0, 2]])
+    rec = _records(encode_frame(frames, 0, CODES))
+    assert rec["tyre"].tolist() == [TYRE_UNKNOWN, 0, 2]
+
+
+def test_unknown_tyre_round_trips_through_dict_frames_and_chunks():
+    legacy = [{"t": 0.0, "drivers": {code: {"tyre": tyre} for code, tyre in zip(CODES, (-1, 0, 4))}}]
+    assert _records(encode_frame(legacy, 0, CODES))["tyre"].tolist() == [TYRE_UNKNOWN, 0, 4]
+
+    frames = _store([[-1, 1, 2], [0, -1, 2]])
+    chunk = encode_chunk(frames, 0, 2, 1, CODES)
+    _, count, _, frame_size = CHUNK_HEADER.unpack_from(chunk)
+    for k in range(count):
+        body = chunk[CHUNK_HEADER.size + k * frame_size:CHUNK_HEADER.size + (k + 1) * frame_size]
+        assert body == encode_frame(frames, k, CODES)
+    assert _records(chunk[CHUNK_HEADER.size + frame_size:])["tyre"].tolist() == [0, TYRE_UNKNOWN, 2]
+
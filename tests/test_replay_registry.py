@@ -0,0 +1,55 @@
+import numpy as np
+
+from src.lib.frame_store import FRAME_FIELDS, FrameStore
+from src.services.replay_registry import LoadedReplay, ReplayRegistry
+
+MB = 1024 * 1024
+
+
+def _replay(round_number, frames=1000):
+    store = FrameStore(np.arange(frames, dtype=np.float64), np.zeros((frames, 20, len(FRAME_FIELDS)), np.float32),
+                       [f"D{j:02d}" for j in range(20)])
+    return LoadedReplay((2024, round_number, "R"), store, {}, 25)
+
+
+def _registry(rss):
+    return ReplayRegistry(max_replays=10, process_budget_bytes=100 * MB, rss=lambda: rss)
+
+
+def test_process_budget_only_frees_the_overage_even_if_rss_stays_high():
+    # RSS the allocator doesn't give back: it never drops however many replays go
+    replays = [_replay(r) for r in range(1, 6)]
+    nbytes = replays[0].nbytes
+    registry = _registry(100 * MB + nbytes + 1)
+    for replay in replays:
+        registry.put(replay)
+    registry.put(_replay(6))
+    assert registry.evictions == 2
+
+    # Two replays' worth covers the overage; the rest stay loaded on every later check too
+    assert registry.enforce_process_budget() == []
+    remaining = [r["round"] for r in registry.stats()["replays"]]
+    assert len(remaining) == 4 and 6 in remaining
+
+
+def test_process_budget_is_off_when_rss_is_unknown():
+    registry = _registry(None)
+    for r in range(1, 4):
+        registry.put(_replay(r))
+    assert registry.enforce_process_budget() == []
+    assert len(registry.stats()["replays"]) == 3
+
+
+def test_process_budget_evicts_again_for_new_growth():
+    registry = _registry(0)
+    registry.put(_replay(1))
+    registry.put(_replay(2))
+    nbytes = registry.stats()["replays"][0]["bytes"]
+
+    registry.rss = lambda: 100 * MB + 1
+    assert [key[1] for key in registry.enforce_process_budget()] == [1]
+    registry.put(_replay(3))  # RSS unchanged: replay 1's telemetry still covers the overage
+    assert registry.evictions == 1
+
+    registry.rss = lambda: 100 * MB + nbytes + 2  # a load grew the process past what we already released
+    assert [key[1] for key in registry.enforce_process_budget()] == [2]